@@ -9,10 +9,13 @@ from alembic import context
 # Import your models' metadata object
 from app.db.database import (
     Base,
+    URL_DATABASE,
 )
+from app.model import base_model  # noqa: F401  registers the tables on Base.metadata
 
 # This is the Alembic Config object, which provides access to the values within the .ini file in use.
 config = context.config
+config.set_main_option("sqlalchemy.url", URL_DATABASE.replace("%", "%%"))
 
 # Interpret the config file for Python logging.
 # This line sets up loggers basically.
@@ -0,0 +1,53 @@
+"""task updated_at and tombstones for the changes feed
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-19 00:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "0001"
+down_revision: Union[str, None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Databases created by create_all() before this revision already have the
+    # tables, so everything here is written to be safe to re-apply.
+    op.execute(
+        "ALTER TABLE tasks ADD COLUMN IF NOT EXISTS updated_at "
+        "TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT now()"
+    )
+    op.execute(
+        "CREATE INDEX IF NOT EXISTS ix_tasks_owner_id_updated_at ON tasks (owner_id, updated_at)"
+    )
+    op.execute("CREATE INDEX IF NOT EXISTS ix_tasks_updated_at ON tasks (updated_at)")
+    op.execute(
+        """
+        CREATE TABLE IF NOT EXISTS task_tombstones (
+            task_id INTEGER NOT NULL,
+            owner_id INTEGER NOT NULL,
+            deleted_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT now(),
+            PRIMARY KEY (task_id, owner_id)
+        )
+        """
+    )
+    op.execute(
+        "CREATE INDEX IF NOT EXISTS ix_task_tombstones_owner_id_deleted_at "
+        "ON task_tombstones (owner_id, deleted_at)"
+    )
+    op.execute(
+        "CREATE INDEX IF NOT EXISTS ix_task_tombstones_deleted_at ON task_tombstones (deleted_at)"
+    )
+
+
+def downgrade() -> None:
+    op.execute("DROP TABLE IF EXISTS task_tombstones")
+    op.execute("DROP INDEX IF EXISTS ix_tasks_updated_at")
+    op.execute("DROP INDEX IF EXISTS ix_tasks_owner_id_updated_at")
+    op.execute("ALTER TABLE tasks DROP COLUMN IF EXISTS updated_at")
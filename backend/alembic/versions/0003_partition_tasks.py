@@ -0,0 +1,74 @@
+"""partition tasks according to TASK_PARTITIONING
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-19 00:00:00
+
+Rewrites the whole table under an exclusive lock, so run it in a
+maintenance window. With TASK_PARTITIONING=none it does nothing.
+
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+from app.core.config import settings
+from app.db.partitions import (
+    NONE,
+    RANGE,
+    add_months,
+    create_tasks_ddl,
+    month_start,
+    replace_tasks_ddl,
+)
+
+# revision identifiers, used by Alembic.
+revision: str = "0003"
+down_revision: Union[str, None] = "0002"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _is_partitioned() -> bool:
+    return op.get_bind().scalar(
+        sa.text("SELECT 1 FROM pg_partitioned_table WHERE partrelid = to_regclass('tasks')")
+    ) is not None
+
+
+def upgrade() -> None:
+    strategy = settings.TASK_PARTITIONING
+    if strategy == NONE or _is_partitioned():
+        return
+
+    first_month = last_month = None
+    if strategy == RANGE:
+        oldest, now = op.get_bind().execute(
+            sa.text("SELECT min(created_at), localtimestamp FROM tasks")
+        ).one()
+        this_month = month_start(now.date())
+        first_month = month_start(oldest.date()) if oldest else this_month
+        last_month = add_months(this_month, settings.TASK_PARTITION_MONTHS_AHEAD)
+
+    op.execute("ALTER TABLE tasks RENAME TO tasks_unpartitioned")
+    for statement in create_tasks_ddl(
+        strategy,
+        "tasks_unpartitioned",
+        first_month=first_month,
+        last_month=last_month,
+        modulus=settings.TASK_PARTITION_HASH_MODULUS,
+    ):
+        op.execute(statement)
+    for statement in replace_tasks_ddl(strategy, "tasks_unpartitioned"):
+        op.execute(statement)
+
+
+def downgrade() -> None:
+    if not _is_partitioned():
+        return
+    op.execute("ALTER TABLE tasks RENAME TO tasks_partitioned")
+    for statement in create_tasks_ddl(NONE, "tasks_partitioned"):
+        op.execute(statement)
+    # Dropping the parent drops its partitions with it.
+    for statement in replace_tasks_ddl(NONE, "tasks_partitioned"):
+        op.execute(statement)
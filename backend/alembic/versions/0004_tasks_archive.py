@@ -0,0 +1,58 @@
+"""tasks_archive table for completed tasks
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-19 00:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "0004"
+down_revision: Union[str, None] = "0003"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.execute(
+        """
+        CREATE TABLE IF NOT EXISTS tasks_archive (
+            id INTEGER NOT NULL PRIMARY KEY,
+            title VARCHAR,
+            description VARCHAR,
+            status BOOLEAN,
+            due_date TIMESTAMP WITHOUT TIME ZONE,
+            delete_request BOOLEAN,
+            reminder_sent BOOLEAN,
+            owner_id INTEGER REFERENCES users (id),
+            created_at TIMESTAMP WITHOUT TIME ZONE NOT NULL,
+            category category NOT NULL,
+            completed_at TIMESTAMP WITHOUT TIME ZONE,
+            updated_at TIMESTAMP WITH TIME ZONE NOT NULL,
+            version INTEGER NOT NULL,
+            archived_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT now()
+        )
+        """
+    )
+    op.execute(
+        "CREATE INDEX IF NOT EXISTS ix_tasks_archive_owner_id_id ON tasks_archive (owner_id, id)"
+    )
+    op.execute(
+        "CREATE INDEX IF NOT EXISTS ix_tasks_completed_at_done ON tasks (completed_at) WHERE status"
+    )
+
+
+COLUMNS = (
+    "id, title, description, status, due_date, delete_request, reminder_sent, "
+    "owner_id, created_at, category, completed_at, updated_at, version"
+)
+
+
+def downgrade() -> None:
+    # Put archived tasks back rather than dropping them with the table.
+    op.execute(f"INSERT INTO tasks ({COLUMNS}) SELECT {COLUMNS} FROM tasks_archive")
+    op.execute("DROP TABLE tasks_archive")
+    op.execute("DROP INDEX IF EXISTS ix_tasks_completed_at_done")
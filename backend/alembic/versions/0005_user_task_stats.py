@@ -0,0 +1,49 @@
+"""user_task_stats table kept current by triggers
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-19 00:00:00
+
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+from app.db.task_stats import create_stats_ddl, drop_stats_ddl, reconcile_sql
+
+# revision identifiers, used by Alembic.
+revision: str = "0005"
+down_revision: Union[str, None] = "0004"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.execute(
+        """
+        CREATE TABLE IF NOT EXISTS user_task_stats (
+            owner_id INTEGER NOT NULL PRIMARY KEY REFERENCES users (id) ON DELETE CASCADE,
+            total INTEGER NOT NULL DEFAULT 0,
+            done INTEGER NOT NULL DEFAULT 0,
+            low INTEGER NOT NULL DEFAULT 0,
+            medium INTEGER NOT NULL DEFAULT 0,
+            high INTEGER NOT NULL DEFAULT 0,
+            overdue INTEGER NOT NULL DEFAULT 0,
+            delete_requested INTEGER NOT NULL DEFAULT 0,
+            archived INTEGER NOT NULL DEFAULT 0
+        )
+        """
+    )
+    # Writes block on the table lock until the backfill commits, so no
+    # change falls between the counts and the triggers.
+    op.execute("LOCK TABLE tasks, tasks_archive IN SHARE ROW EXCLUSIVE MODE")
+    for statement in create_stats_ddl():
+        op.execute(statement)
+    op.execute(sa.text(reconcile_sql()).bindparams(first=0, last=2**31 - 1))
+
+
+def downgrade() -> None:
+    for statement in drop_stats_ddl():
+        op.execute(statement)
+    op.execute("DROP TABLE user_task_stats")
@@ -0,0 +1,31 @@
+"""title prefix indexes for /task/suggest
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-19 00:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "0006"
+down_revision: Union[str, None] = "0005"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.execute(
+        'CREATE INDEX IF NOT EXISTS ix_tasks_owner_id_title_prefix '
+        'ON tasks (owner_id, (lower(title) COLLATE "C"), id)'
+    )
+    op.execute(
+        'CREATE INDEX IF NOT EXISTS ix_tasks_title_prefix ON tasks ((lower(title) COLLATE "C"), id)'
+    )
+
+
+def downgrade() -> None:
+    op.execute("DROP INDEX IF EXISTS ix_tasks_title_prefix")
+    op.execute("DROP INDEX IF EXISTS ix_tasks_owner_id_title_prefix")
@@ -0,0 +1,38 @@
+"""count overdue tasks at read time instead of in user_task_stats
+
+Revision ID: 0007
+Revises: 0006
+Create Date: 2026-10-19 00:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+from app.db.task_stats import create_stats_ddl
+
+# revision identifiers, used by Alembic.
+revision: str = "0007"
+down_revision: Union[str, None] = "0006"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.execute(
+        "CREATE INDEX IF NOT EXISTS ix_tasks_owner_id_due_date_open "
+        "ON tasks (owner_id, due_date) WHERE status IS NOT TRUE"
+    )
+    # Replaces the trigger functions with ones that no longer touch overdue.
+    for statement in create_stats_ddl():
+        op.execute(statement)
+    op.execute("ALTER TABLE user_task_stats DROP COLUMN IF EXISTS overdue")
+
+
+def downgrade() -> None:
+    # The previous triggers only kept overdue roughly right between
+    # recounts; the column comes back at zero until the next one.
+    op.execute(
+        "ALTER TABLE user_task_stats ADD COLUMN IF NOT EXISTS overdue INTEGER NOT NULL DEFAULT 0"
+    )
+    op.execute("DROP INDEX IF EXISTS ix_tasks_owner_id_due_date_open")
@@ -0,0 +1,32 @@
+"""user_task_stats.writes, the version of an owner's cached task reads
+
+Revision ID: 0008
+Revises: 0007
+Create Date: 2026-10-19 00:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+from app.db.task_stats import create_stats_ddl
+
+# revision identifiers, used by Alembic.
+revision: str = "0008"
+down_revision: Union[str, None] = "0007"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.execute(
+        "ALTER TABLE user_task_stats ADD COLUMN IF NOT EXISTS writes BIGINT NOT NULL DEFAULT 0"
+    )
+    for statement in create_stats_ddl():
+        op.execute(statement)
+
+
+def downgrade() -> None:
+    # The trigger functions write the column and there is no older version
+    # of them to go back to, so it stays; extra writes are harmless.
+    pass
@@ -0,0 +1,37 @@
+"""task_writes, the table-wide version of cached task reads
+
+Revision ID: 0010
+Revises: 0009
+Create Date: 2026-10-19 00:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+from app.db.task_stats import create_stats_ddl
+
+# revision identifiers, used by Alembic.
+revision: str = "0010"
+down_revision: Union[str, None] = "0009"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.execute(
+        """
+        CREATE TABLE IF NOT EXISTS task_writes (
+            slot SMALLINT NOT NULL PRIMARY KEY,
+            writes BIGINT NOT NULL DEFAULT 0
+        )
+        """
+    )
+    for statement in create_stats_ddl():
+        op.execute(statement)
+
+
+def downgrade() -> None:
+    # The trigger functions write the table and there is no older version
+    # of them to go back to, so it stays; extra writes are harmless.
+    pass
@@ -1,17 +1,22 @@
-import json
+from datetime import timedelta
 
-from fastapi import APIRouter, Depends, Form, HTTPException, Request, Response, status
+from fastapi import APIRouter, BackgroundTasks, Depends, Form, HTTPException, Request, Response, status
 from fastapi.templating import Jinja2Templates
+from jose import JWTError
 from sqlalchemy.exc import NoResultFound
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.admission import hashing_admission, hashing_gate
 from app.core.constants import SystemMessages
 from app.core.dependency import (
     check_user_active,
 )
+from app.core.revocation import revocation_store
 from app.core.security import (
+    ACCESS_TOKEN_EXPIRE_MINUTES,
     create_access_token,
+    decode_access_token,
     generate_reset_token,
     get_token_data,
     verify_old_password,
@@ -20,9 +25,10 @@ from app.core.security import (
 )
 from app.core.service import send_reset_email, send_verification_email
 from app.db.crud.crud_auth import user_crud
-from app.db.database import get_db
+from app.db.database import SessionLocal, get_db
 from app.schema.auth_schema import ForgetPassword, ForgetPasswordMessage, LogInMessage, LogOutMessage, PasswordChangeMessage, ResetPasswordMessage, TokenData, UserChangePassword, UserCreate, UserInResponse, UserLogin, UserPassReset, VerifyMessage
-from app.util.hash import async_hash_password, verify_password
+from app.util.hash import async_hash_password, needs_rehash, verify_password
+from app.util.serializer import FastJSONResponse
 from logger import log
 
 router = APIRouter(prefix="/auth", tags=["Authentication:"])
@@ -30,11 +36,30 @@ router = APIRouter(prefix="/auth", tags=["Authentication:"])
 templates = Jinja2Templates(directory="app/templates")
 
 
+async def upgrade_password_hash(user_id: int, old_hash: str, password: str) -> None:
+    """Re-hash a verified password at the current bcrypt cost, after the response is sent.
+
+    Goes through the hashing gate like the login that triggered it, so
+    upgrades never add bcrypt work beyond its limit.
+    """
+    try:
+        new_hash = await hashing_gate.run(async_hash_password, password)
+        async with SessionLocal() as db:
+            upgraded = await user_crud.replace_password_hash(
+                db, user_id=user_id, old_hash=old_hash, new_hash=new_hash
+            )
+        if upgraded:
+            log.info(f"Upgraded password hash cost for user_id: {user_id}")
+    except Exception as e:
+        log.error(f"Failed to upgrade password hash for user_id {user_id}: {e}")
+
+
 @router.post(
     "/create-user",
     status_code=status.HTTP_201_CREATED,
     response_model=UserInResponse,
     description="Create a new user",
+    dependencies=[Depends(hashing_admission("username"))],
 )
 async def create_user(
     user_in: UserCreate,
@@ -110,9 +135,11 @@ async def verify_email(
     status_code=status.HTTP_200_OK,
     response_model=LogInMessage,
     description="User login",
+    dependencies=[Depends(hashing_admission("username"))],
 )
 async def login(
     user_in: UserLogin,
+    background_tasks: BackgroundTasks,
     db: AsyncSession = Depends(get_db),
 ):
     username = user_in.username
@@ -131,7 +158,7 @@ async def login(
 
         log.success(f"{SystemMessages.LOG_USER_FOUND} {user.username}")
 
-        if not verify_password(password, user.password):
+        if not await hashing_gate.run(verify_password, password, user.password):
             log.error(f"{SystemMessages.LOG_INVALID_PASSWORD} {username}")
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
@@ -145,13 +172,16 @@ async def login(
                 detail=SystemMessages.ERROR_USER_NOT_ACTIVE,
             )
 
+        if needs_rehash(user.password):
+            background_tasks.add_task(
+                upgrade_password_hash, user.id, user.password, password
+            )
+
         access_token = create_access_token(data={"user_id": user.id, "role": user.role})
         is_admin = 1 if user.role == "admin" else 0
 
         response_content = {"id": user.id, "is_admin": is_admin}
-        response = Response(
-            content=json.dumps(response_content), media_type="application/json"
-        )
+        response = FastJSONResponse(content=response_content)
         response.set_cookie(
             key="token",
             value=access_token,
@@ -188,8 +218,18 @@ async def login(
     response_model=LogOutMessage,
     description="User logout",
 )
-async def logout(response: Response):
+async def logout(
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(get_db),
+):
     log.info(SystemMessages.LOG_LOGGING_OUT_USER)
+    token = request.cookies.get("token")
+    if token:
+        try:
+            await revocation_store.revoke_token(db, decode_access_token(token))
+        except JWTError:
+            pass
     response.delete_cookie("token")
     return {"message": SystemMessages.SUCCESS_LOGGED_OUT}
 
@@ -237,6 +277,7 @@ async def forget_password(
     status_code=status.HTTP_200_OK,
     response_model=ResetPasswordMessage,
     description="Reset password",
+    dependencies=[Depends(hashing_admission("email"))],
 )
 async def reset_password(
     input: UserPassReset,
@@ -259,10 +300,13 @@ async def reset_password(
 
         user = await user_crud.get_by_email(db, email=email)
 
-        hashed_password = async_hash_password(password)
+        hashed_password = await hashing_gate.run(async_hash_password, password)
         user.password = hashed_password
 
         await db.commit()
+        await revocation_store.revoke_user_tokens(
+            db, user.id, timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
+        )
         log.info(f"{SystemMessages.SUCCESS_PASSWORD_RESETFUL} {email}")
 
         return {"message": f"{SystemMessages.SUCCESS_PASSWORD_RESETFUL} {email}"}
@@ -287,6 +331,7 @@ async def reset_password(
     status_code=status.HTTP_200_OK,
     response_model=PasswordChangeMessage,
     description="Change password",
+    dependencies=[Depends(hashing_admission())],
 )
 async def change_password(
     response: Response,
@@ -301,11 +346,14 @@ async def change_password(
         user_id = int(token_data.id)
         user = await user_crud.get(db, int(user_id))
 
-        verify_old_password(user, old_password)
+        await hashing_gate.run(verify_old_password, user, old_password)
         check_user_active(user)
 
-        hashed_password = async_hash_password(new_password)
+        hashed_password = await hashing_gate.run(async_hash_password, new_password)
         await user_crud.update(db=db, db_obj=user, obj_in={"password": hashed_password})
+        await revocation_store.revoke_user_tokens(
+            db, user_id, timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
+        )
 
         response.delete_cookie("token")
         log.info(f"{SystemMessages.SUCCESS_PASSWORD_CHANGED} {user_id}")
@@ -0,0 +1,73 @@
+from fastapi import APIRouter, Depends, status
+
+from app.core.admission import hashing_gate
+from app.core.coalesce import read_flights
+from app.core.cache import analytics_cache, search_cache, suggest_cache
+from app.core.dependency import require_admin
+from app.core.events import event_broker
+from app.core.revocation import revocation_store
+from app.db.database import pool_status, replica_status, statement_status
+
+router = APIRouter(
+    prefix="/metrics",
+    tags=["Metrics:"],
+    dependencies=[Depends(require_admin)],
+)
+
+
+@router.get("/pool", status_code=status.HTTP_200_OK, description="Connection pool usage")
+async def read_pool_metrics():
+    return pool_status()
+
+
+@router.get("/replicas", status_code=status.HTTP_200_OK, description="Read replica routing")
+async def read_replica_metrics():
+    return replica_status()
+
+
+@router.get(
+    "/statements",
+    status_code=status.HTTP_200_OK,
+    description="Statement shape reuse and compiled cache hit rates",
+)
+async def read_statement_metrics():
+    return statement_status()
+
+
+@router.get("/admission", status_code=status.HTTP_200_OK, description="Auth admission control")
+async def read_admission_metrics():
+    return hashing_gate.snapshot()
+
+
+@router.get("/revocation", status_code=status.HTTP_200_OK, description="Token revocation filter")
+async def read_revocation_metrics():
+    return revocation_store.snapshot()
+
+
+@router.get("/events", status_code=status.HTTP_200_OK, description="Task event streams")
+async def read_event_metrics():
+    return event_broker.snapshot()
+
+
+@router.get("/analytics-cache", status_code=status.HTTP_200_OK, description="Task analytics cache")
+async def read_analytics_cache_metrics():
+    return analytics_cache.snapshot()
+
+
+@router.get("/suggest-cache", status_code=status.HTTP_200_OK, description="Title suggestion cache")
+async def read_suggest_cache_metrics():
+    return suggest_cache.snapshot()
+
+
+@router.get("/search-cache", status_code=status.HTTP_200_OK, description="Search result cache")
+async def read_search_cache_metrics():
+    return search_cache.snapshot()
+
+
+@router.get(
+    "/read-coalescing",
+    status_code=status.HTTP_200_OK,
+    description="Identical concurrent reads served by another request's query",
+)
+async def read_coalescing_metrics():
+    return read_flights.snapshot()
@@ -1,21 +1,56 @@
-from datetime import datetime
-from typing import Optional
+from datetime import datetime, timedelta, timezone
+from typing import Hashable, List, Optional, Tuple
 
-from fastapi import APIRouter, Depends, Form, HTTPException, status
+from fastapi import APIRouter, Depends, Form, HTTPException, Query, Response, status
+from fastapi.responses import StreamingResponse
 from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.cache import (
+    analytics_cache,
+    normalize_query,
+    search_cache,
+    suggest_cache,
+    task_versions,
+)
+from app.core.coalesce import read_flights
+from app.core.config import settings
 from app.core.constants import SystemMessages
 from app.core.dependency import (
     admin_role_check,
+    if_match_versions,
+    require_admin,
+    task_etag,
+    task_fields,
+    task_list_format,
     validate_and_convert_enum_value,
 )
+from app.core.events import (
+    TASK_CREATED,
+    TASK_DELETE_REQUESTED,
+    TASK_DELETED,
+    TASK_UPDATED,
+    event_broker,
+    publish_task_event,
+)
 from app.core.security import get_token_data
+from app.db import fast_read
 from app.db.crud.crud_task import task_crud
-from app.db.database import get_db
+from app.db.crud.crud_task_analytics import task_analytics_crud
+from app.db.crud.crud_task_stats import task_stats_crud
+from app.db.database import ReadSessions, get_db, get_read_db, get_read_sessions
 from app.model.base_model import Category
 from app.schema.auth_schema import TokenData
-from app.schema.task_schema import Message, TaskBase, TaskCreate, TaskInDB, TaskList
+from app.schema.task_schema import TASK_FIELDS, Message, TaskBase, TaskChanges, TaskCreate, TaskAnalytics, TaskInDB, TaskList, TaskStats
+from app.util.serializer import (
+    TASK_LIST_COLUMNAR,
+    TASK_LIST_MSGPACK,
+    FastJSONResponse,
+    task_list_response,
+    task_payload,
+    task_payloads,
+)
+from app.util.sync_token import SyncToken
 from logger import log
 
 router = APIRouter(
@@ -24,6 +59,25 @@ router = APIRouter(
 )
 
 
+# Alternatives to the JSON TaskList, picked through Accept. Both are a
+# ``columns`` map of field -> values with categories as indexes into
+# ``categories``.
+TASK_LIST_FORMATS = {
+    200: {"content": {TASK_LIST_COLUMNAR: {}, TASK_LIST_MSGPACK: {}}},
+}
+
+
+async def _shared_read(name: str, key: Hashable, user_id: Optional[int], load):
+    """Run ``load`` once for identical concurrent reads by callers who see the same tasks.
+
+    ``user_id`` is the caller's scope, None for admins. Its write version is
+    part of the key, so a read sent after this worker saved a change never
+    joins a query that started before it. ``load`` opens its own session
+    (``get_read_sessions``), so callers waiting on it hold no connection.
+    """
+    return await read_flights.run(name, (key, user_id, task_versions.of(user_id)), load)
+
+
 @router.post(
     "/tasks/",
     response_model=TaskInDB,
@@ -47,6 +101,8 @@ async def create_task(
         )
 
         db_task = await task_crud.create(db, obj_in=task_data)
+        task_versions.bump(db_task.owner_id)
+        publish_task_event(TASK_CREATED, db_task)
 
         log.info(f"{SystemMessages.LOG_TASK_CREATED_SUCCESSFULLY} {db_task.id}")
         return db_task
@@ -58,30 +114,182 @@ async def create_task(
         )
 
 
-@router.get("/tasks/", response_model=TaskList, status_code=status.HTTP_200_OK)
+@router.get("/events", description="Server-sent events for changes to the caller's tasks")
+async def task_events(token_data: TokenData = Depends(get_token_data)):
+    return StreamingResponse(
+        event_broker.stream(
+            int(token_data.id),
+            token_data.role == "admin",
+            settings.EVENTS_HEARTBEAT_SECONDS,
+        ),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@router.get(
+    "/changes",
+    response_model=TaskChanges,
+    status_code=status.HTTP_200_OK,
+    description="Tasks changed and deleted since a sync token; call without one to get a starting token",
+)
+async def read_task_changes(
+    since: Optional[str] = None,
+    limit: int = 500,
+    db: AsyncSession = Depends(get_db),
+    token_data: TokenData = Depends(get_token_data),
+):
+    # Served by the primary: a lagging replica could let the watermark pass
+    # rows it has not received yet, and they would never be reported.
+    try:
+        token = SyncToken.decode(since) if since else None
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=SystemMessages.ERROR_INVALID_SYNC_TOKEN,
+        )
+    retention = timedelta(days=settings.TASK_TOMBSTONE_RETENTION_DAYS)
+    if token is not None and token.deleted_at < datetime.now(timezone.utc) - retention:
+        # Tombstones this old may already be purged.
+        raise HTTPException(
+            status_code=status.HTTP_410_GONE,
+            detail=SystemMessages.ERROR_SYNC_TOKEN_EXPIRED,
+        )
+    limit = max(1, min(limit, settings.TASK_CHANGES_MAX_LIMIT))
+    try:
+        admin = token_data.role == "admin"
+        tasks, deleted, next_token, has_more = await task_crud.get_changes(
+            db,
+            user_id=int(token_data.id) if not admin else None,
+            since=token,
+            limit=limit,
+            lag=timedelta(seconds=settings.TASK_CHANGES_LAG_SECONDS),
+        )
+    except Exception as e:
+        log.error(f"{SystemMessages.ERROR_FAILED_TO_FETCH_CHANGES} {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"{SystemMessages.ERROR_FAILED_TO_FETCH_CHANGES} {str(e)}",
+        )
+
+    return FastJSONResponse(
+        content={
+            "changed": [task_payload(task) for task in tasks],
+            "deleted": deleted,
+            "next": next_token.encode(),
+            "has_more": has_more,
+        }
+    )
+
+
+@router.get(
+    "/stats",
+    response_model=TaskStats,
+    status_code=status.HTTP_200_OK,
+    description="Task counts of the caller, or for admins of every user or of user_id",
+)
+async def read_task_stats(
+    user_id: Optional[int] = None,
+    db: AsyncSession = Depends(get_read_db),
+    token_data: TokenData = Depends(get_token_data),
+):
+    admin = token_data.role == "admin"
+    if user_id is not None and user_id != int(token_data.id) and not admin:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail=SystemMessages.ERROR_PERMISSION_DENIED,
+        )
+    try:
+        if admin and user_id is None:
+            counts = await task_stats_crud.get_totals(db)
+        else:
+            counts = await task_stats_crud.get(
+                db, owner_id=user_id if user_id is not None else int(token_data.id)
+            )
+    except Exception as e:
+        log.error(f"{SystemMessages.ERROR_FAILED_TO_FETCH_STATS} {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"{SystemMessages.ERROR_FAILED_TO_FETCH_STATS} {str(e)}",
+        )
+    return {**counts, "open": counts["total"] - counts["done"]}
+
+
+@router.get(
+    "/analytics",
+    response_model=TaskAnalytics,
+    status_code=status.HTTP_200_OK,
+    description="Completion lead times, daily throughput and category breakdown over the last days",
+)
+async def read_task_analytics(
+    days: int = 30,
+    db: AsyncSession = Depends(get_read_db),
+    token_data: TokenData = Depends(require_admin),
+):
+    days = max(1, min(days, settings.TASK_ANALYTICS_MAX_DAYS))
+    analytics = analytics_cache.get(days)
+    if analytics is None:
+        try:
+            analytics = await task_analytics_crud.summary(db, days=days)
+        except Exception as e:
+            log.error(f"{SystemMessages.ERROR_FAILED_TO_FETCH_ANALYTICS} {e}")
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail=f"{SystemMessages.ERROR_FAILED_TO_FETCH_ANALYTICS} {str(e)}",
+            )
+        analytics_cache.put(days, analytics)
+    return analytics
+
+
+@router.get(
+    "/tasks/",
+    response_model=TaskList,
+    status_code=status.HTTP_200_OK,
+    responses=TASK_LIST_FORMATS,
+)
 async def read_tasks(
     skip: int = 0,
     limit: int = 8,
     query: Optional[str] = None,
-    db: AsyncSession = Depends(get_db),
+    include_archived: bool = False,
+    fields: Optional[Tuple[str, ...]] = Depends(task_fields),
+    media_type: str = Depends(task_list_format),
+    read_sessions: ReadSessions = Depends(get_read_sessions),
     token_data: TokenData = Depends(get_token_data),
 ):
     log.info(
         f"{SystemMessages.LOG_ATTEMPT_FETCH_TASKS.format(query=query, skip=skip, limit=limit)}"
     )
     try:
-        admin = token_data.role == "admin"
-        tasks, total = await task_crud.get_multi_with_query(
-            db=db,
-            user_id=int(token_data.id) if not admin else None,
-            query=query,
-            skip=skip,
-            limit=limit,
+        user_id = None if token_data.role == "admin" else int(token_data.id)
+
+        async def load():
+            async with read_sessions() as db:
+                if settings.DB_FAST_READ_PATH and not fields and not include_archived:
+                    tasks, total = await fast_read.owner_page(
+                        db, user_id=user_id, query=query, skip=skip, limit=limit
+                    )
+                    return task_payloads(tasks, TASK_FIELDS), total
+                tasks, total = await task_crud.get_multi_with_query(
+                    db=db,
+                    user_id=user_id,
+                    query=query,
+                    skip=skip,
+                    limit=limit,
+                    fields=fields,
+                    include_archived=include_archived,
+                )
+                return task_payloads(tasks, fields or (TASK_FIELDS if include_archived else None)), total
+
+        tasks, total = await _shared_read(
+            "task.tasks", (query, skip, limit, fields, include_archived), user_id, load
         )
 
         log.info(f"{SystemMessages.LOG_FETCHED_TASKS}: {total}")
 
-        return {"tasks": tasks, "total": total, "skip": skip, "limit": limit}
+        return task_list_response(
+            tasks, total, skip, limit, fields or TASK_FIELDS, media_type=media_type
+        )
     except Exception as e:
         log.error(f"Error occurred while fetching tasks: {e}")
         raise HTTPException(
@@ -94,12 +302,15 @@ async def read_tasks(
     "/delete-requested-tasks/",
     response_model=TaskList,
     status_code=status.HTTP_200_OK,
+    responses=TASK_LIST_FORMATS,
 )
 async def read_delete_request_tasks(
     skip: int = 0,
     limit: int = 8,
     query: Optional[str] = None,
-    db: AsyncSession = Depends(get_db),
+    fields: Optional[Tuple[str, ...]] = Depends(task_fields),
+    media_type: str = Depends(task_list_format),
+    read_sessions: ReadSessions = Depends(get_read_sessions),
     token_data: TokenData = Depends(get_token_data),
 ):
     log.info(
@@ -107,12 +318,22 @@ async def read_delete_request_tasks(
     )
     try:
         if token_data.role == "admin":
-            tasks, total = await task_crud.get_delete_requested_tasks(
-                db, skip=skip, limit=limit
+
+            async def load():
+                async with read_sessions() as db:
+                    tasks, total = await task_crud.get_delete_requested_tasks(
+                        db, skip=skip, limit=limit, fields=fields
+                    )
+                    return task_payloads(tasks, fields), total
+
+            tasks, total = await _shared_read(
+                "task.delete_requested", (skip, limit, fields), None, load
             )
 
             log.info(f"{SystemMessages.LOG_FETCHED_TASKS.format(len(tasks))}")
-            return {"tasks": tasks, "total": total, "skip": skip, "limit": limit}
+            return task_list_response(
+                tasks, total, skip, limit, fields or TASK_FIELDS, media_type=media_type
+            )
     except Exception as e:
         log.error(f"{SystemMessages.ERROR_FAILED_TO_FETCH_TASKS} {e}")
         raise HTTPException(
@@ -121,12 +342,20 @@ async def read_delete_request_tasks(
         )
 
 
-@router.get("/search/", response_model=TaskList, status_code=status.HTTP_200_OK)
+@router.get(
+    "/search/",
+    response_model=TaskList,
+    status_code=status.HTTP_200_OK,
+    responses=TASK_LIST_FORMATS,
+)
 async def search_tasks(
     query: str,
     skip: int = 0,
     limit: int = 8,
-    db: AsyncSession = Depends(get_db),
+    include_archived: bool = False,
+    fields: Optional[Tuple[str, ...]] = Depends(task_fields),
+    media_type: str = Depends(task_list_format),
+    read_sessions: ReadSessions = Depends(get_read_sessions),
     token_data: TokenData = Depends(get_token_data),
 ):
     log.info(
@@ -134,13 +363,42 @@ async def search_tasks(
     )
     try:
         admin = admin_role_check(token_data.role)
-
-        tasks, total = await task_crud.search(
-            db, query, token_data.id, admin, skip, limit
+        owner_id = None if admin else int(token_data.id)
+        async def read_version():
+            async with read_sessions() as db:
+                return await task_stats_crud.write_version(db, owner_id=owner_id)
+
+        async def load():
+            async with read_sessions() as db:
+                # Read first: a write committed in between only retires the page early.
+                stored_version = await task_stats_crud.write_version(db, owner_id=owner_id)
+                tasks, total = await task_crud.search(
+                    db,
+                    query,
+                    token_data.id,
+                    admin,
+                    skip,
+                    limit,
+                    fields=fields,
+                    include_archived=include_archived,
+                )
+                payloads = task_payloads(
+                    tasks, fields or (TASK_FIELDS if include_archived else None)
+                )
+                return stored_version, (payloads, total)
+
+        tasks, total = await search_cache.get_or_load(
+            "task.search",
+            (normalize_query(query), skip, limit, fields, include_archived),
+            owner_id,
+            read_version,
+            load,
         )
 
         log.info(f"{SystemMessages.LOG_FETCHED_TASKS}: {total}")
-        return {"tasks": tasks, "total": int(total), "skip": skip, "limit": limit}
+        return task_list_response(
+            tasks, total, skip, limit, fields or TASK_FIELDS, media_type=media_type
+        )
     except Exception as e:
         log.error(f"{SystemMessages.ERROR_FAILED_TO_SEARCH_TASKS} {e}")
         raise HTTPException(
@@ -149,12 +407,62 @@ async def search_tasks(
         )
         
         
-@router.get("/search-delete-requested-tasks/", response_model=TaskList, status_code=status.HTTP_200_OK)
+@router.get(
+    "/suggest",
+    response_model=List[str],
+    status_code=status.HTTP_200_OK,
+    description="Distinct task titles starting with prefix, for search-as-you-type",
+)
+async def suggest_task_titles(
+    prefix: str = Query(..., max_length=100),
+    limit: int = 8,
+    db: AsyncSession = Depends(get_read_db),
+    token_data: TokenData = Depends(get_token_data),
+):
+    prefix = prefix.lstrip()
+    if not prefix:
+        return []
+    limit = max(1, min(limit, settings.TASK_SUGGEST_MAX_LIMIT))
+    user_id = None if token_data.role == "admin" else int(token_data.id)
+    try:
+        # Writes to the caller's tasks move the versions, retiring older lists.
+        stored_version = await task_stats_crud.write_version(db, owner_id=user_id)
+    except Exception as e:
+        log.error(f"{SystemMessages.ERROR_FAILED_TO_SEARCH_TASKS} {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"{SystemMessages.ERROR_FAILED_TO_SEARCH_TASKS} {str(e)}",
+        )
+    scope = (user_id, stored_version, task_versions.of(user_id))
+    titles = suggest_cache.get(scope, prefix)
+    if titles is None:
+        try:
+            titles = await task_crud.suggest_titles(
+                db, user_id=user_id, prefix=prefix, limit=settings.TASK_SUGGEST_MAX_LIMIT
+            )
+        except Exception as e:
+            log.error(f"{SystemMessages.ERROR_FAILED_TO_SEARCH_TASKS} {e}")
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail=f"{SystemMessages.ERROR_FAILED_TO_SEARCH_TASKS} {str(e)}",
+            )
+        suggest_cache.put(scope, prefix, titles)
+    return titles[:limit]
+
+
+@router.get(
+    "/search-delete-requested-tasks/",
+    response_model=TaskList,
+    status_code=status.HTTP_200_OK,
+    responses=TASK_LIST_FORMATS,
+)
 async def search_delete_requested_tasks(
     query: str,
     skip: int = 0,
     limit: int = 8,
-    db: AsyncSession = Depends(get_db),
+    fields: Optional[Tuple[str, ...]] = Depends(task_fields),
+    media_type: str = Depends(task_list_format),
+    read_sessions: ReadSessions = Depends(get_read_sessions),
     token_data: TokenData = Depends(get_token_data),
 ):
     log.info(
@@ -162,13 +470,31 @@ async def search_delete_requested_tasks(
     )
     try:
         admin = admin_role_check(token_data.role)
-
-        tasks, total = await task_crud.search_delete_requests(
-            db, query, token_data.id, admin, skip, limit
+        owner_id = None if admin else int(token_data.id)
+        async def read_version():
+            async with read_sessions() as db:
+                return await task_stats_crud.write_version(db, owner_id=owner_id)
+
+        async def load():
+            async with read_sessions() as db:
+                stored_version = await task_stats_crud.write_version(db, owner_id=owner_id)
+                tasks, total = await task_crud.search_delete_requests(
+                    db, query, token_data.id, admin, skip, limit, fields=fields
+                )
+                return stored_version, (task_payloads(tasks, fields), total)
+
+        tasks, total = await search_cache.get_or_load(
+            "task.search_delete_requests",
+            (normalize_query(query), skip, limit, fields),
+            owner_id,
+            read_version,
+            load,
         )
 
         log.info(f"{SystemMessages.LOG_FETCHED_TASKS}: {total}")
-        return {"tasks": tasks, "total": int(total), "skip": skip, "limit": limit}
+        return task_list_response(
+            tasks, total, skip, limit, fields or TASK_FIELDS, media_type=media_type
+        )
     except Exception as e:
         log.error(f"{SystemMessages.ERROR_FAILED_TO_SEARCH_TASKS} {e}")
         raise HTTPException(
@@ -177,14 +503,23 @@ async def search_delete_requested_tasks(
         )
 
 
-@router.get("/filter/", response_model=TaskList, status_code=status.HTTP_200_OK)
+@router.get(
+    "/filter/",
+    response_model=TaskList,
+    status_code=status.HTTP_200_OK,
+    responses=TASK_LIST_FORMATS,
+)
 async def filter_tasks(
     task_status: Optional[str] = None,
     category: Optional[str] = None,
     due_date: Optional[str] = None,
     skip: int = 0,
     limit: int = 8,
-    db: AsyncSession = Depends(get_db),
+    include_archived: bool = False,
+    facets: bool = False,
+    fields: Optional[Tuple[str, ...]] = Depends(task_fields),
+    media_type: str = Depends(task_list_format),
+    read_sessions: ReadSessions = Depends(get_read_sessions),
     token_data: TokenData = Depends(get_token_data),
 ):
     try:
@@ -195,19 +530,62 @@ async def filter_tasks(
             f"{SystemMessages.LOG_FETCH_FILTER_TASKS.format(task_status=task_status, category=category, due_date=due_date, skip=skip, limit=limit, user_id=token_data.id, user_role=token_data.role)}"
         )
 
-        tasks, total = await task_crud.filter_tasks(
-            db=db,
-            user_id=token_data.id,
-            user_role=token_data.role,
-            admin=admin,
-            task_status=task_status,
-            category=category,
-            due_date=due_date,
-            skip=skip,
-            limit=limit,
+        async def load():
+            async with read_sessions() as db:
+                if facets:
+                    tasks, total, facet_counts = await task_crud.filter_tasks_with_facets(
+                        db=db,
+                        user_id=token_data.id,
+                        admin=admin,
+                        task_status=task_status,
+                        category=category,
+                        due_date=due_date,
+                        skip=skip,
+                        limit=limit,
+                        fields=fields,
+                        include_archived=include_archived,
+                    )
+                    return task_payloads(tasks, fields or TASK_FIELDS), total, facet_counts
+
+                if settings.DB_FAST_READ_PATH and not fields and not include_archived:
+                    tasks, total = await fast_read.filtered_page(
+                        db,
+                        user_id=token_data.id,
+                        admin=admin,
+                        task_status=task_status,
+                        category=category,
+                        due_date=due_date,
+                        skip=skip,
+                        limit=limit,
+                    )
+                    return task_payloads(tasks, TASK_FIELDS), total, None
+
+                tasks, total = await task_crud.filter_tasks(
+                    db=db,
+                    user_id=token_data.id,
+                    user_role=token_data.role,
+                    admin=admin,
+                    task_status=task_status,
+                    category=category,
+                    due_date=due_date,
+                    skip=skip,
+                    limit=limit,
+                    fields=fields,
+                    include_archived=include_archived,
+                )
+                page_fields = fields or (TASK_FIELDS if include_archived else None)
+                return task_payloads(tasks, page_fields), total, None
+
+        tasks, total, facet_counts = await _shared_read(
+            "task.filter",
+            (task_status, category, due_date, skip, limit, include_archived, facets, fields),
+            None if admin else int(token_data.id),
+            load,
         )
         log.info(f"{SystemMessages.LOG_FETCH_TOTAL_TASKS.format(total=total)}")
-        return {"tasks": tasks, "total": total, "skip": skip, "limit": limit}
+        return task_list_response(
+            tasks, total, skip, limit, fields or TASK_FIELDS, facet_counts, media_type
+        )
     except HTTPException as http_err:
         log.error(f"HTTP Exception: {http_err}")
         raise http_err
@@ -222,12 +600,22 @@ async def filter_tasks(
 @router.get("/tasks/{task_id}", response_model=TaskInDB, status_code=status.HTTP_200_OK)
 async def read_task(
     task_id: int,
-    db: AsyncSession = Depends(get_db),
+    response: Response,
+    include_archived: bool = False,
+    fields: Optional[Tuple[str, ...]] = Depends(task_fields),
+    db: AsyncSession = Depends(get_read_db),
     token_data: TokenData = Depends(get_token_data),
 ):
     log.info(f"{SystemMessages.LOG_FETCH_TASK_BY_ID.format(task_id=task_id)}")
     try:
-        task = await task_crud.get_by_id(db=db, id=task_id)
+        if fields:
+            task = await task_crud.get_fields_by_id(db=db, id=task_id, fields=fields)
+        else:
+            task = await task_crud.get_by_id(db=db, id=task_id)
+        if not task and include_archived:
+            task = await task_crud.get_archived_by_id(db=db, id=task_id)
+            if task and fields:
+                task = {field: getattr(task, field) for field in fields}
         if not task:
             log.warning(
                 f"{SystemMessages.WARNING_TASK_NOT_FOUND.format(task_id=task_id)}"
@@ -236,7 +624,14 @@ async def read_task(
                 status_code=status.HTTP_404_NOT_FOUND, detail="Task not found"
             )
         log.info(f"{SystemMessages.LOG_FETCH_TASK_SUCCESS.format(task_id=task_id)}")
+        version = task.get("version") if fields else task.version
+        headers = {"ETag": task_etag(version)} if version is not None else {}
+        if fields:
+            return FastJSONResponse(content=task, headers=headers)
+        response.headers.update(headers)
         return task
+    except HTTPException:
+        raise
     except Exception as e:
         log.error(f"{SystemMessages.ERROR_FAILED_TO_FETCH_TASK} {e}")
         raise HTTPException(
@@ -245,9 +640,33 @@ async def read_task(
         )
 
 
+async def _update_rejected(
+    db: AsyncSession, task_id: int, token_data: TokenData
+) -> HTTPException:
+    """Explain why a conditional update matched no row. Only runs on failure."""
+    current = await task_crud.get_version(db=db, id=task_id)
+    if current is None:
+        log.warning(f"{SystemMessages.WARNING_TASK_NOT_FOUND.format(task_id=task_id)}")
+        return HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Task not found")
+    owner_id, version = current
+    if int(token_data.id) != owner_id and token_data.role != "admin":
+        log.warning(f"Unauthorized attempt to update instance with id: {token_data.id}")
+        return HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="You do not have permission to update this resource",
+        )
+    log.info(f"Version conflict updating task {task_id}, now at version {version}")
+    return HTTPException(
+        status_code=status.HTTP_412_PRECONDITION_FAILED,
+        detail=SystemMessages.ERROR_TASK_VERSION_CONFLICT,
+        headers={"ETag": task_etag(version)},
+    )
+
+
 @router.put("/tasks/{task_id}", status_code=status.HTTP_200_OK, response_model=TaskInDB)
 async def update_task(
     task_id: int,
+    response: Response,
     owner_id: int = Form(...),
     title: str = Form(...),
     description: str = Form(...),
@@ -255,51 +674,37 @@ async def update_task(
     due_date: datetime = Form(...),
     db: AsyncSession = Depends(get_db),
     token_data: TokenData = Depends(get_token_data),
+    versions: Optional[Tuple[int, ...]] = Depends(if_match_versions),
 ):
     log.info(f"{SystemMessages.LOG_UPDATE_TASK_BY_ID.format(task_id=task_id)}")
     try:
-        db_task = await task_crud.get_by_id(db=db, id=task_id)
-        if not db_task:
-            log.warning(
-                f"{SystemMessages.WARNING_TASK_NOT_FOUND.format(task_id=task_id)}"
-            )
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND, detail="Task not found"
-            )
-        else:
-            if (
-                int(token_data.id) == int(db_task.owner_id)
-                or token_data.role == "admin"
-            ):
-                category_enum = validate_and_convert_enum_value(category, Category)
-                task_data = {
-                    "title": title,
-                    "description": description,
-                    "due_date": due_date,
-                    "category": category_enum,
-                    "owner_id": owner_id,
-                }
-
-                updated_task = await task_crud.update(
-                    db=db,
-                    db_obj=db_task,
-                    obj_in=task_data,
-                )
-                log.info(
-                    f"{SystemMessages.LOG_TASK_UPDATED_SUCCESSFULLY.format(task_id=task_id)}"
-                )
-                return updated_task
-
-            else:
-                raise ValueError("Unauthorized attempt")
-
-    except ValueError:
-        log.warning(f"Unauthorized attempt to update instance with id: {token_data.id}")
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="You do not have permission to update this resource",
+        category_enum = validate_and_convert_enum_value(category, Category)
+        updated_task, previous_owner_id = await task_crud.update_if_match(
+            db=db,
+            id=task_id,
+            versions=versions,
+            values={
+                "title": title,
+                "description": description,
+                "due_date": due_date,
+                "category": category_enum,
+                "owner_id": owner_id,
+            },
+            owner_id=None if token_data.role == "admin" else int(token_data.id),
         )
-
+        if updated_task is None:
+            raise await _update_rejected(db, task_id, token_data)
+
+        task_versions.bump(updated_task.owner_id, previous_owner_id)
+        publish_task_event(TASK_UPDATED, updated_task)
+        if previous_owner_id != int(updated_task.owner_id):
+            event_broker.publish(TASK_DELETED, {"id": updated_task.id}, previous_owner_id)
+        log.info(f"{SystemMessages.LOG_TASK_UPDATED_SUCCESSFULLY.format(task_id=task_id)}")
+        response.headers["ETag"] = task_etag(updated_task.version)
+        return updated_task
+
+    except HTTPException:
+        raise
     except SQLAlchemyError as e:
         log.error(f"Database error: {e}")
         raise HTTPException(
@@ -319,34 +724,41 @@ async def update_task(
 )
 async def update_task_status(
     task_id: int,
-    status: bool = Form(...),
+    response: Response,
+    task_status: bool = Form(..., alias="status"),
     db: AsyncSession = Depends(get_db),
     token_data: TokenData = Depends(get_token_data),
+    versions: Optional[Tuple[int, ...]] = Depends(if_match_versions),
 ):
     log.info(
-        f"{SystemMessages.LOG_UPDATE_TASK_STATUS.format(task_id=task_id, status=status)}"
+        f"{SystemMessages.LOG_UPDATE_TASK_STATUS.format(task_id=task_id, status=task_status)}"
     )
     try:
-        db_task = await task_crud.get_by_id(db=db, id=task_id)
-
-        if int(token_data.id) == int(db_task.owner_id) or token_data.role == "admin":
-            updated_task = await task_crud.update(
-                db, db_obj=db_task, obj_in={"status": status}
-            )
-            log.info(
-                f"{SystemMessages.LOG_TASK_STATUS_UPDATED_SUCCESSFULLY.format(task_id=task_id)}"
-            )
-            return updated_task
-        else:
-            raise ValueError("Unauthorized attempt")
+        updated_task, _ = await task_crud.update_if_match(
+            db=db,
+            id=task_id,
+            versions=versions,
+            values={
+                "status": task_status,
+                "completed_at": datetime.now(timezone.utc).replace(tzinfo=None)
+                if task_status
+                else None,
+            },
+            owner_id=None if token_data.role == "admin" else int(token_data.id),
+        )
+        if updated_task is None:
+            raise await _update_rejected(db, task_id, token_data)
 
-    except ValueError:
-        log.warning(f"Unauthorized attempt to update instance with id: {token_data.id}")
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="You do not have permission to update this resource",
+        task_versions.bump(updated_task.owner_id)
+        publish_task_event(TASK_UPDATED, updated_task)
+        log.info(
+            f"{SystemMessages.LOG_TASK_STATUS_UPDATED_SUCCESSFULLY.format(task_id=task_id)}"
         )
+        response.headers["ETag"] = task_etag(updated_task.version)
+        return updated_task
 
+    except HTTPException:
+        raise
     except Exception as e:
         log.error(f"{SystemMessages.ERROR_FAILED_TO_UPDATE_TASK_STATUS} {e}")
         raise HTTPException(
@@ -366,7 +778,10 @@ async def delete_task(
     log.info(f"{SystemMessages.LOG_DELETING_TASK.format(task_id=task_id)}")
     try:
         if token_data.role == "admin":
-            await task_crud.remove(db, id=int(task_id))
+            deleted_task = await task_crud.remove(db, id=int(task_id))
+            if deleted_task:
+                task_versions.bump(deleted_task.owner_id)
+                publish_task_event(TASK_DELETED, deleted_task)
 
             return {"message": f"Task deleted successfully by {token_data.id}"}
         else:
@@ -402,6 +817,8 @@ async def request_delete_task(
             updated_task = await task_crud.update(
                 db, db_obj=db_task, obj_in={"delete_request": True}
             )
+            task_versions.bump(updated_task.owner_id)
+            publish_task_event(TASK_DELETE_REQUESTED, updated_task)
             log.info(
                 f"{SystemMessages.LOG_TASK_DELETE_REQUEST_SUCCESS.format(task_id=task_id)}"
             )
@@ -1,12 +1,13 @@
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.cache import task_versions
 from app.core.constants import SystemMessages
 from app.core.security import (
     get_token_data,
 )
 from app.db.crud.crud_auth import user_crud
-from app.db.database import get_db
+from app.db.database import get_db, get_read_db
 from app.schema.auth_schema import TokenData, UserInResponse, UserUpdate
 from logger import log
 
@@ -28,7 +29,7 @@ router = APIRouter(prefix="/user", tags=["User:"])
 )
 async def get_user(
     id: int,
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     token_data: TokenData = Depends(get_token_data),
 ):
     user = await user_crud.get(db, id)
@@ -89,6 +90,8 @@ async def update_user(
             
             user_update = input
             updated_user = await user_crud.update(db, db_obj=user, obj_in=user_update)
+            # Delete-request searches match owner names.
+            task_versions.bump(id)
             log.success(f"{SystemMessages.LOG_USER_UPDATED_SUCCESSFULLY}")
             return updated_user
         else:
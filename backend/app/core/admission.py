@@ -0,0 +1,214 @@
+import asyncio
+import math
+import time
+import zlib
+from array import array
+from dataclasses import asdict, dataclass
+from typing import Any, AsyncIterator, Callable, Dict, Optional, TypeVar
+
+from fastapi import HTTPException, Request, status
+from fastapi.concurrency import run_in_threadpool
+
+from app.core.config import settings
+from app.core.constants import SystemMessages
+from logger import log
+
+T = TypeVar("T")
+
+
+class TokenBucketTable:
+    """Token buckets for an unbounded key space in a fixed amount of memory.
+
+    Keys are hashed onto ``slots`` buckets; colliding keys share a bucket,
+    which can only make limiting stricter, never looser. Buckets start full
+    and refill at ``rate`` tokens per second up to ``burst``.
+    """
+
+    def __init__(
+        self,
+        slots: int,
+        rate: float,
+        burst: float,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.slots = slots
+        self.rate = rate
+        self.burst = burst
+        self.clock = clock
+        self._tokens = array("d", [burst]) * slots
+        self._updated = array("d", [clock()]) * slots
+
+    def _slot(self, key: str) -> int:
+        return zlib.crc32(key.encode("utf-8")) % self.slots
+
+    def take(self, key: str) -> float:
+        """Spend one token for ``key``; returns 0 when allowed, else seconds until one is available."""
+        slot = self._slot(key)
+        now = self.clock()
+        tokens = min(
+            self.burst, self._tokens[slot] + (now - self._updated[slot]) * self.rate
+        )
+        self._updated[slot] = now
+        if tokens >= 1:
+            self._tokens[slot] = tokens - 1
+            return 0.0
+        self._tokens[slot] = tokens
+        return (1 - tokens) / self.rate
+
+
+@dataclass
+class AdmissionStats:
+    admitted: int = 0
+    rate_limited: int = 0
+    overloaded: int = 0
+    peak_waiting: int = 0
+
+
+class HashingGate:
+    """Admission control for endpoints that spend CPU on bcrypt.
+
+    At most ``concurrency`` bcrypt calls run at once and at most
+    ``concurrency + max_waiting`` requests are admitted at a time; a request
+    arriving when those slots are taken, or over its per-client or
+    per-username rate, is rejected straight away with ``Retry-After``.
+    """
+
+    def __init__(
+        self,
+        concurrency: int,
+        max_waiting: int,
+        retry_after: float,
+        per_client: TokenBucketTable,
+        per_username: TokenBucketTable,
+    ):
+        self.concurrency = concurrency
+        self.max_waiting = max_waiting
+        self.retry_after = retry_after
+        self.per_client = per_client
+        self.per_username = per_username
+        self.stats = AdmissionStats()
+        self._semaphore = asyncio.Semaphore(concurrency)
+        self.active = 0
+        self.waiting = 0
+        self.pending = 0
+
+    def _reject(self, status_code: int, detail: str, retry_after: float) -> HTTPException:
+        return HTTPException(
+            status_code=status_code,
+            detail=detail,
+            headers={"Retry-After": str(max(1, math.ceil(retry_after)))},
+        )
+
+    def check_rate(self, client: str, username: Optional[str]) -> None:
+        wait = self.per_client.take(f"client:{client}")
+        if not wait and username:
+            wait = self.per_username.take(f"user:{username.lower()}")
+        if wait:
+            self.stats.rate_limited += 1
+            log.warning(f"Rate limited auth request from {client} for {username}")
+            raise self._reject(
+                status.HTTP_429_TOO_MANY_REQUESTS,
+                SystemMessages.ERROR_TOO_MANY_REQUESTS,
+                wait,
+            )
+
+    def admit(self) -> None:
+        """Reserve a slot for the request, or reject it when all are taken.
+
+        The slot is reserved up front rather than when the request reaches
+        ``run``, so a burst cannot slip past the limit before any of it has
+        started hashing. Pair every successful call with ``release``.
+        """
+        if self.pending >= self.concurrency + self.max_waiting:
+            self.stats.overloaded += 1
+            log.warning(
+                f"Shedding auth request: {self.pending} admitted, {self.active} hashing"
+            )
+            raise self._reject(
+                status.HTTP_503_SERVICE_UNAVAILABLE,
+                SystemMessages.ERROR_SERVER_BUSY,
+                self.retry_after,
+            )
+        self.pending += 1
+        self.stats.admitted += 1
+
+    def release(self) -> None:
+        self.pending -= 1
+
+    async def run(self, func: Callable[..., T], *args: Any) -> T:
+        """Run one bcrypt call in the threadpool, at most ``concurrency`` at a time.
+
+        Only the call itself holds a slot, so requests waiting on the
+        database or a mail server never keep others from hashing.
+        """
+        self.waiting += 1
+        self.stats.peak_waiting = max(self.stats.peak_waiting, self.waiting)
+        try:
+            await self._semaphore.acquire()
+        finally:
+            self.waiting -= 1
+        self.active += 1
+        try:
+            return await run_in_threadpool(func, *args)
+        finally:
+            self.active -= 1
+            self._semaphore.release()
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            **asdict(self.stats),
+            "pending": self.pending,
+            "active": self.active,
+            "waiting": self.waiting,
+            "concurrency": self.concurrency,
+            "max_waiting": self.max_waiting,
+        }
+
+
+hashing_gate = HashingGate(
+    concurrency=settings.auth_hash_concurrency(),
+    max_waiting=settings.AUTH_HASH_MAX_WAITING,
+    retry_after=settings.AUTH_RETRY_AFTER_SECONDS,
+    per_client=TokenBucketTable(
+        settings.AUTH_RATE_SLOTS,
+        rate=settings.AUTH_RATE_PER_CLIENT / 60,
+        burst=settings.AUTH_BURST_PER_CLIENT,
+    ),
+    per_username=TokenBucketTable(
+        settings.AUTH_RATE_SLOTS,
+        rate=settings.AUTH_RATE_PER_USERNAME / 60,
+        burst=settings.AUTH_BURST_PER_USERNAME,
+    ),
+)
+
+
+async def _username(request: Request, field: Optional[str]) -> Optional[str]:
+    if field is None:
+        return None
+    try:
+        body = await request.json()
+    except ValueError:
+        return None
+    value = body.get(field) if isinstance(body, dict) else None
+    return str(value) if value else None
+
+
+def hashing_admission(username_field: Optional[str] = None):
+    """Dependency applying the rate limits and the admission slots of the bcrypt gate.
+
+    Declare it in the route's ``dependencies`` so it runs before the DB
+    session dependency: rejected requests never check out a connection. The
+    slot is held until the request finishes; the hashing itself goes through
+    ``hashing_gate.run``.
+    """
+
+    async def admit(request: Request) -> AsyncIterator[None]:
+        client = request.client.host if request.client else "unknown"
+        hashing_gate.check_rate(client, await _username(request, username_field))
+        hashing_gate.admit()
+        try:
+            yield
+        finally:
+            hashing_gate.release()
+
+    return admit
@@ -0,0 +1,206 @@
+import time
+from collections import OrderedDict
+from dataclasses import asdict, dataclass
+from typing import Any, Awaitable, Callable, Dict, Hashable, List, Optional, Tuple
+
+from app.core.coalesce import SingleFlight, read_flights
+from app.core.config import settings
+
+
+@dataclass
+class CacheStats:
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+
+
+class TTLCache:
+    """Per-process cache whose entries expire ``ttl`` seconds after being stored.
+
+    Holds at most ``max_entries``; when full, the least recently stored entry
+    is evicted. Expired entries are dropped when they are next looked up.
+    """
+
+    def __init__(
+        self,
+        ttl: float,
+        max_entries: int = 128,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.clock = clock
+        self._entries: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+        self.stats = CacheStats()
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        entry = self._entries.get(key)
+        if entry is not None:
+            expires_at, value = entry
+            if expires_at > self.clock():
+                self.stats.hits += 1
+                return value
+            del self._entries[key]
+        self.stats.misses += 1
+        return None
+
+    def peek(self, key: Hashable) -> Optional[Any]:
+        """Like ``get`` but leaves the stats and the entry alone."""
+        entry = self._entries.get(key)
+        if entry is None or entry[0] <= self.clock():
+            return None
+        return entry[1]
+
+    def put(self, key: Hashable, value: Any) -> None:
+        self._entries[key] = (self.clock() + self.ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.stats.evictions += 1
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {**asdict(self.stats), "entries": len(self._entries), "ttl": self.ttl}
+
+
+def normalize_query(query: Optional[str]) -> str:
+    # Searches use ILIKE, so ASCII case never changes their result; other
+    # case mappings are left to the database.
+    query = query or ""
+    return query.lower() if query.isascii() else query
+
+
+class TaskVersions:
+    """Counters of the task writes made by this process, per owner and table-wide.
+
+    Only this process sees them, which is enough to keep a read sent after
+    one of its own writes from joining or storing a load that started
+    before it. Cached entries are also checked against the version stored
+    with the owner's task counts (``CRUDTaskStats.write_version``), which
+    moves with writes made by any worker.
+    """
+
+    def __init__(self):
+        self.table = 0
+        self._owners: Dict[int, int] = {}
+
+    def of(self, owner_id: Optional[int]) -> int:
+        if owner_id is None:
+            return self.table
+        return self._owners.get(owner_id, 0)
+
+    def bump(self, *owner_ids: Optional[int]) -> None:
+        self.table += 1
+        for owner_id in owner_ids:
+            if owner_id is not None:
+                owner_id = int(owner_id)
+                self._owners[owner_id] = self._owners.get(owner_id, 0) + 1
+
+
+class SearchCache:
+    """TTL cache of search pages keyed by owner version, loaded through a ``SingleFlight``.
+
+    Each entry keeps the owner's write version stored in the database, as
+    read by ``load`` before the page. A hit is only served while
+    ``read_version`` still returns it, so a write through any worker
+    retires the entries it affects; a miss reads nothing but the load.
+    Identical misses arriving while the first one is being loaded wait for
+    its result instead of querying too. A result is only stored if this
+    process wrote nothing to its owner while it was being loaded.
+    """
+
+    def __init__(self, cache: TTLCache, versions: TaskVersions, flights: SingleFlight):
+        self.cache = cache
+        self.versions = versions
+        self.flights = flights
+
+    async def get_or_load(
+        self,
+        name: str,
+        key: Hashable,
+        owner_id: Optional[int],
+        read_version: Callable[[], Awaitable[Hashable]],
+        load: Callable[[], Awaitable[Tuple[Hashable, Any]]],
+    ) -> Any:
+        version = self.versions.of(owner_id)
+        full_key = (name, key, owner_id, version)
+        entry = self.cache.get(full_key)
+        if entry is not None:
+            stored_version, value = entry
+            if await read_version() == stored_version:
+                return value
+
+        async def load_and_store():
+            stored_version, value = await load()
+            if self.versions.of(owner_id) == version:
+                self.cache.put(full_key, (stored_version, value))
+            return value
+
+        return await self.flights.run(name, full_key, load_and_store)
+
+    def snapshot(self) -> Dict[str, Any]:
+        return self.cache.snapshot()
+
+
+class PrefixCache:
+    """Autocomplete results per (scope, prefix) on top of a ``TTLCache``.
+
+    Lists are stored as fetched, up to ``complete_below`` entries. A shorter
+    list holds every match of its prefix, so a longer prefix extending it is
+    answered by filtering that list instead of querying again, which is what
+    happens while someone keeps typing.
+    """
+
+    def __init__(self, cache: TTLCache, complete_below: int):
+        self.cache = cache
+        self.complete_below = complete_below
+        self.narrowed = 0
+
+    @staticmethod
+    def _key(prefix: str) -> str:
+        # Only ASCII is folded here; other case mappings are left to the database.
+        return prefix.lower() if prefix.isascii() else prefix
+
+    def get(self, scope: Hashable, prefix: str) -> Optional[List[str]]:
+        key = self._key(prefix)
+        titles = self.cache.get((scope, key))
+        if titles is not None or not prefix.isascii():
+            return titles
+        for end in range(len(key) - 1, 0, -1):
+            shorter = self.cache.peek((scope, key[:end]))
+            if shorter is None:
+                continue
+            if len(shorter) >= self.complete_below:
+                return None
+            titles = [title for title in shorter if title.lower().startswith(key)]
+            self.narrowed += 1
+            self.cache.put((scope, key), titles)
+            return titles
+        return None
+
+    def put(self, scope: Hashable, prefix: str, titles: List[str]) -> None:
+        self.cache.put((scope, self._key(prefix)), titles)
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {**self.cache.snapshot(), "narrowed": self.narrowed}
+
+
+# /task/analytics results, keyed by window size.
+analytics_cache = TTLCache(settings.TASK_ANALYTICS_CACHE_SECONDS)
+
+task_versions = TaskVersions()
+
+# /task/search and /task/search-delete-requested-tasks pages.
+search_cache = SearchCache(
+    TTLCache(settings.TASK_SEARCH_CACHE_SECONDS, settings.TASK_SEARCH_CACHE_ENTRIES),
+    task_versions,
+    read_flights,
+)
+
+# /task/suggest title lists, per caller (None for admins), versions and prefix.
+suggest_cache = PrefixCache(
+    TTLCache(settings.TASK_SUGGEST_CACHE_SECONDS, settings.TASK_SUGGEST_CACHE_ENTRIES),
+    complete_below=settings.TASK_SUGGEST_MAX_LIMIT,
+)
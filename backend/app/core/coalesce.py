@@ -0,0 +1,67 @@
+import asyncio
+from dataclasses import asdict, dataclass
+from typing import Any, Awaitable, Callable, Dict, Hashable, Tuple
+
+
+@dataclass
+class FlightStats:
+    loads: int = 0
+    coalesced: int = 0
+    failures: int = 0
+
+
+class SingleFlight:
+    """Runs at most one load per key at a time; identical calls meanwhile share its result.
+
+    Only the first caller queries the database, so the others never check
+    out a pool connection. Keys must cover everything the result depends
+    on, including who may see it. Results are shared, not copied, so loads
+    should return values nobody mutates.
+    """
+
+    def __init__(self):
+        self._loading: Dict[Tuple[str, Hashable], asyncio.Future] = {}
+        self.stats: Dict[str, FlightStats] = {}
+
+    async def run(self, name: str, key: Hashable, load: Callable[[], Awaitable[Any]]) -> Any:
+        stats = self.stats.setdefault(name, FlightStats())
+        flight_key = (name, key)
+        loading = self._loading.get(flight_key)
+        if loading is not None:
+            stats.coalesced += 1
+            try:
+                return await asyncio.shield(loading)
+            except asyncio.CancelledError:
+                # The loading request went away; only give up if this one did too.
+                if loading.cancelled() and not asyncio.current_task().cancelling():
+                    return await self.run(name, key, load)
+                raise
+
+        stats.loads += 1
+        loading = self._loading[flight_key] = asyncio.get_running_loop().create_future()
+        try:
+            value = await load()
+        except asyncio.CancelledError:
+            loading.cancel()
+            raise
+        except Exception as e:
+            stats.failures += 1
+            loading.set_exception(e)
+            # Marks the exception retrieved when nobody else was waiting.
+            loading.exception()
+            raise
+        finally:
+            del self._loading[flight_key]
+        loading.set_result(value)
+        return value
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "in_flight": len(self._loading),
+            "saved": sum(stats.coalesced for stats in self.stats.values()),
+            "endpoints": {name: asdict(stats) for name, stats in self.stats.items()},
+        }
+
+
+# Identical concurrent reads of the task list endpoints.
+read_flights = SingleFlight()
@@ -1,5 +1,7 @@
+import math
 import os
 import traceback
+from typing import Any, Dict, List, Literal, Optional
 
 from dotenv import load_dotenv
 from fastapi.middleware.cors import CORSMiddleware
@@ -9,10 +11,47 @@ from starlette.middleware.base import BaseHTTPMiddleware
 from starlette.requests import Request
 from starlette.responses import Response
 
+from app.db.routing import LAST_WRITE_COOKIE
 from logger import log
 
 load_dotenv()
 
+# Named engine/pool presets, selected with DB_ENGINE_PROFILE. Any DB_POOL_*
+# setting overrides the matching key of the chosen profile.
+ENGINE_PROFILES: Dict[str, Dict[str, Any]] = {
+    "dev": {
+        "pool_size": 5,
+        "max_overflow": 5,
+        "pool_timeout": 30,
+        "pool_recycle": 1800,
+        "pool_pre_ping": True,
+        "prepared_statement_cache_size": 100,
+        "slow_checkout_ms": 250,
+        "echo": False,
+    },
+    "prod": {
+        "pool_size": 20,
+        "max_overflow": 10,
+        "pool_timeout": 10,
+        "pool_recycle": 1800,
+        "pool_pre_ping": True,
+        "prepared_statement_cache_size": 500,
+        "slow_checkout_ms": 100,
+        "echo": False,
+    },
+    "benchmark": {
+        "pool_size": 50,
+        "max_overflow": 0,
+        "pool_timeout": 5,
+        "pool_recycle": -1,
+        "pool_pre_ping": False,
+        "prepared_statement_cache_size": 1000,
+        "slow_checkout_ms": 50,
+        "echo": False,
+    },
+}
+
+
 class Settings(BaseSettings):
     model_config = ConfigDict(case_sensitive=True)
     
@@ -28,6 +67,126 @@ class Settings(BaseSettings):
     VERIFICATION_KEY: str = os.getenv("VERIFICATION_KEY")
     RESET_PASSWORD_KEY: str = os.getenv("RESET_PASSWORD_KEY")
 
+    DB_ENGINE_PROFILE: str = os.getenv("DB_ENGINE_PROFILE", "prod")
+    DB_POOL_SIZE: Optional[int] = None
+    DB_MAX_OVERFLOW: Optional[int] = None
+    DB_POOL_TIMEOUT: Optional[float] = None
+    DB_POOL_RECYCLE: Optional[int] = None
+    DB_POOL_PRE_PING: Optional[bool] = None
+    DB_STATEMENT_CACHE_SIZE: Optional[int] = None
+    DB_SLOW_CHECKOUT_MS: Optional[float] = None
+    DB_ECHO: Optional[bool] = None
+    DB_FAST_READ_PATH: bool = False
+
+    # Comma separated SQLAlchemy URLs of read replicas, empty to read from the primary.
+    DB_REPLICA_URLS: str = ""
+    DB_REPLICA_STICKY_SECONDS: float = 5.0
+    DB_REPLICA_RETRY_SECONDS: float = 30.0
+
+    SERVER_PROFILE: str = os.getenv("SERVER_PROFILE", "prod")
+    SERVER_HOST: str = "0.0.0.0"
+    SERVER_PORT: int = 8000
+    SERVER_WORKERS: Optional[int] = None
+    SERVER_GRACEFUL_TIMEOUT: int = 30
+
+    WARMUP_CONNECTIONS: int = 5
+    WARMUP_RETRY_SECONDS: float = 5.0
+
+    # Admission control for bcrypt-heavy auth endpoints. Rates are per minute.
+    AUTH_HASH_CONCURRENCY: Optional[int] = None
+    AUTH_HASH_MAX_WAITING: int = 32
+    AUTH_RETRY_AFTER_SECONDS: float = 2.0
+    AUTH_RATE_SLOTS: int = 4096
+    AUTH_RATE_PER_CLIENT: float = 60.0
+    AUTH_BURST_PER_CLIENT: float = 20.0
+    AUTH_RATE_PER_USERNAME: float = 10.0
+    AUTH_BURST_PER_USERNAME: float = 5.0
+
+    # bcrypt cost is calibrated by the first node to start, to the highest
+    # cost whose hash fits BCRYPT_TARGET_MS, and stored in cluster_settings
+    # for the others (delete the row to recalibrate); BCRYPT_ROUNDS pins it
+    # instead. Stored hashes are rehashed to that cost on login.
+    BCRYPT_ROUNDS: Optional[int] = None
+    BCRYPT_TARGET_MS: float = 250.0
+    BCRYPT_MIN_ROUNDS: int = 10
+    BCRYPT_MAX_ROUNDS: int = 14
+
+    REVOCATION_FILTER_CAPACITY: int = 100_000
+    REVOCATION_FILTER_ERROR_RATE: float = 0.001
+    REVOCATION_SYNC_SECONDS: float = 2.0
+    REVOCATION_REBUILD_SECONDS: float = 3600.0
+
+    # Events queued per open /task/events stream before it is told to resync.
+    EVENTS_MAX_PENDING: int = 256
+    EVENTS_HEARTBEAT_SECONDS: float = 15.0
+
+    # /task/changes only reports rows older than the lag, so transactions
+    # still committing are not skipped; tokens older than the tombstone
+    # retention must do a full re-sync.
+    TASK_CHANGES_LAG_SECONDS: float = 5.0
+    TASK_CHANGES_MAX_LIMIT: int = 1000
+    TASK_TOMBSTONE_RETENTION_DAYS: int = 30
+    TASK_TOMBSTONE_PURGE_SECONDS: float = 3600.0
+
+    # Layout the partitioning migration converts tasks to: "none", "range"
+    # (monthly on created_at) or "hash" (on owner_id). Range partitions are
+    # kept created this many months ahead.
+    TASK_PARTITIONING: Literal["none", "range", "hash"] = "none"
+    TASK_PARTITION_HASH_MODULUS: int = 16
+    TASK_PARTITION_MONTHS_AHEAD: int = 3
+    TASK_PARTITION_CHECK_SECONDS: float = 21600.0
+
+    # Completed tasks older than this move to tasks_archive, a batch at a
+    # time with a pause in between; 0 turns the archiver off.
+    TASK_ARCHIVE_AFTER_DAYS: int = 90
+    TASK_ARCHIVE_BATCH_SIZE: int = 1000
+    TASK_ARCHIVE_BATCH_PAUSE_SECONDS: float = 0.5
+    TASK_ARCHIVE_INTERVAL_SECONDS: float = 3600.0
+    # user_task_stats is recounted this often, TASK_STATS_RECONCILE_BATCH
+    # owners per transaction, to correct any drift.
+    TASK_STATS_RECONCILE_SECONDS: float = 900.0
+    TASK_STATS_RECONCILE_BATCH: int = 500
+    # /task/analytics results are reused this long per window size.
+    TASK_ANALYTICS_CACHE_SECONDS: float = 60.0
+    TASK_ANALYTICS_MAX_DAYS: int = 365
+    # /task/suggest always fetches this many titles, and answers longer
+    # prefixes from a cached shorter list that came back with fewer.
+    TASK_SUGGEST_MAX_LIMIT: int = 10
+    TASK_SUGGEST_CACHE_SECONDS: float = 30.0
+    TASK_SUGGEST_CACHE_ENTRIES: int = 4096
+    # Search pages are reused this long unless a worker writes to the
+    # owner's tasks first.
+    TASK_SEARCH_CACHE_SECONDS: float = 5.0
+    TASK_SEARCH_CACHE_ENTRIES: int = 2048
+
+    def engine_options(self) -> Dict[str, Any]:
+        if self.DB_ENGINE_PROFILE not in ENGINE_PROFILES:
+            raise ValueError(
+                f"Unknown DB_ENGINE_PROFILE '{self.DB_ENGINE_PROFILE}', "
+                f"expected one of {list(ENGINE_PROFILES)}"
+            )
+        options = dict(ENGINE_PROFILES[self.DB_ENGINE_PROFILE])
+        overrides = {
+            "pool_size": self.DB_POOL_SIZE,
+            "max_overflow": self.DB_MAX_OVERFLOW,
+            "pool_timeout": self.DB_POOL_TIMEOUT,
+            "pool_recycle": self.DB_POOL_RECYCLE,
+            "pool_pre_ping": self.DB_POOL_PRE_PING,
+            "prepared_statement_cache_size": self.DB_STATEMENT_CACHE_SIZE,
+            "slow_checkout_ms": self.DB_SLOW_CHECKOUT_MS,
+            "echo": self.DB_ECHO,
+        }
+        options.update({key: value for key, value in overrides.items() if value is not None})
+        return options
+
+    def auth_hash_concurrency(self) -> int:
+        # bcrypt releases the GIL, so hashes run in parallel on worker threads;
+        # keep half the cores free for everything else.
+        return self.AUTH_HASH_CONCURRENCY or max(1, (os.cpu_count() or 2) // 2)
+
+    def replica_urls(self) -> List[str]:
+        return [url.strip() for url in self.DB_REPLICA_URLS.split(",") if url.strip()]
+
 settings = Settings()
 
 
@@ -51,6 +210,28 @@ def cors_middleware(app):
     )
 
 
+class ReadYourWritesMiddleware(BaseHTTPMiddleware):
+    """Tells the client when its request committed a write.
+
+    The time comes back on the next requests in ``LAST_WRITE_COOKIE`` and
+    keeps them off the read replicas for ``DB_REPLICA_STICKY_SECONDS``,
+    whichever worker serves them.
+    """
+
+    async def dispatch(self, request: Request, call_next):
+        response = await call_next(request)
+        last_write = getattr(request.state, "last_write", None)
+        if last_write is not None and settings.replica_urls():
+            response.set_cookie(
+                LAST_WRITE_COOKIE,
+                f"{last_write:.3f}",
+                max_age=math.ceil(settings.DB_REPLICA_STICKY_SECONDS),
+                httponly=True,
+                samesite="lax",
+            )
+        return response
+
+
 class LogExceptionsMiddleware(BaseHTTPMiddleware):
     async def dispatch(self, request: Request, call_next):
         try:
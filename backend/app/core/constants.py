@@ -32,6 +32,15 @@ class SystemMessages:
     ERROR_FAILED_TO_UPDATE_TASK_STATUS = "Failed to update task status:"
     ERROR_FAILED_TO_DELETE_TASK = "Failed to delete task:"
     ERROR_FAILED_TO_REQUEST_DELETE_TASK = "Failed to request delete task:"
+    ERROR_TOO_MANY_REQUESTS = "Too many attempts, please try again later."
+    ERROR_SERVER_BUSY = "Server is busy, please try again shortly."
+    ERROR_INVALID_SYNC_TOKEN = "Invalid sync token."
+    ERROR_SYNC_TOKEN_EXPIRED = "Sync token has expired, a full re-sync is required."
+    ERROR_FAILED_TO_FETCH_CHANGES = "Failed to fetch task changes:"
+    ERROR_FAILED_TO_FETCH_STATS = "Failed to fetch task stats:"
+    ERROR_FAILED_TO_FETCH_ANALYTICS = "Failed to fetch task analytics:"
+    ERROR_IF_MATCH_REQUIRED = "If-Match header with the task's ETag is required."
+    ERROR_TASK_VERSION_CONFLICT = "Task was modified since it was read, fetch it again."
 
     # Success messages
     SUCCESS_USER_CREATED = "User created successfully."
@@ -1,9 +1,14 @@
 from enum import Enum
-from typing import Type
+from typing import Optional, Tuple, Type
 
-from fastapi import HTTPException, status
+from fastapi import Depends, Header, HTTPException, status
 
+from app.core.constants import SystemMessages
+from app.core.security import get_token_data
 from app.model.base_model import User
+from app.schema.auth_schema import TokenData
+from app.schema.task_schema import TASK_FIELDS
+from app.util.serializer import TASK_LIST_COLUMNAR, TASK_LIST_JSON, TASK_LIST_MSGPACK
 from logger import log
 
 
@@ -14,6 +19,15 @@ def admin_role_check(user_role: str):
         return True
 
 
+def require_admin(token_data: TokenData = Depends(get_token_data)) -> TokenData:
+    if not admin_role_check(token_data.role):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail=SystemMessages.ERROR_PERMISSION_DENIED,
+        )
+    return token_data
+
+
 def validate_and_convert_enum_value(value: str, enum_type: Type[Enum]) -> Enum:
     if value not in enum_type._value2member_map_:
         allowed_values = [e.value for e in enum_type]
@@ -24,6 +38,84 @@ def validate_and_convert_enum_value(value: str, enum_type: Type[Enum]) -> Enum:
     return enum_type(value)
 
 
+def task_fields(fields: Optional[str] = None) -> Optional[Tuple[str, ...]]:
+    """Parse a ``fields=id,title,...`` sparse fieldset, rejecting unknown names."""
+    if fields is None or not fields.strip():
+        return None
+    requested = {name.strip() for name in fields.split(",") if name.strip()}
+    unknown = sorted(requested.difference(TASK_FIELDS))
+    if unknown:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Unknown fields {unknown}. Allowed fields are: {list(TASK_FIELDS)}",
+        )
+    # In TASK_FIELDS order, so permutations of a fieldset share statements
+    # and cache entries.
+    return tuple(name for name in TASK_FIELDS if name in requested)
+
+
+_TASK_LIST_MEDIA_TYPES = {
+    "*/*": TASK_LIST_JSON,
+    "application/*": TASK_LIST_JSON,
+    TASK_LIST_JSON: TASK_LIST_JSON,
+    TASK_LIST_COLUMNAR: TASK_LIST_COLUMNAR,
+    TASK_LIST_MSGPACK: TASK_LIST_MSGPACK,
+    "application/x-msgpack": TASK_LIST_MSGPACK,
+    "application/vnd.msgpack": TASK_LIST_MSGPACK,
+}
+
+
+def task_list_format(accept: Optional[str] = Header(None)) -> str:
+    """Media type for task lists from ``Accept``: the preferred one we offer, else JSON."""
+    chosen, chosen_rank = TASK_LIST_JSON, (0.0, False)
+    for entry in (accept or "").split(","):
+        media_type, *params = (part.strip() for part in entry.split(";"))
+        offered = _TASK_LIST_MEDIA_TYPES.get(media_type.lower())
+        if offered is None:
+            continue
+        q = 1.0
+        for param in params:
+            name, _, value = param.partition("=")
+            if name.strip() == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        # Named types beat wildcards of the same weight; other ties go to
+        # the type listed first.
+        rank = (q, "*" not in media_type)
+        if q > 0 and rank > chosen_rank:
+            chosen, chosen_rank = offered, rank
+    return chosen
+
+
+def task_etag(version: int) -> str:
+    return f'"{version}"'
+
+
+def if_match_versions(if_match: Optional[str] = Header(None)) -> Optional[Tuple[int, ...]]:
+    """Versions a write is conditional on, from ``If-Match``; ``None`` means ``*``."""
+    if if_match is None:
+        raise HTTPException(
+            status_code=status.HTTP_428_PRECONDITION_REQUIRED,
+            detail=SystemMessages.ERROR_IF_MATCH_REQUIRED,
+        )
+    if if_match.strip() == "*":
+        return None
+    # If-Match uses strong comparison, so weak (W/) tags can never match.
+    versions = tuple(
+        int(tag[1:-1])
+        for tag in (part.strip() for part in if_match.split(","))
+        if len(tag) > 2 and tag[0] == tag[-1] == '"' and tag[1:-1].isdigit()
+    )
+    if not versions:
+        raise HTTPException(
+            status_code=status.HTTP_412_PRECONDITION_FAILED,
+            detail=SystemMessages.ERROR_TASK_VERSION_CONFLICT,
+        )
+    return versions
+
+
 async def check_user_active(user: User) -> None:
     if not user.is_active:
         log.warning(f"Inactive user attempted password change for user_id: {user.id}")
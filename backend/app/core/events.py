@@ -0,0 +1,156 @@
+import asyncio
+from collections import defaultdict, deque
+from dataclasses import asdict, dataclass
+from typing import Any, AsyncIterator, Deque, Dict, Optional, Set
+
+import orjson
+
+from app.core.config import settings
+from app.util.serializer import ORJSON_OPTIONS, task_payload
+
+TASK_CREATED = "task.created"
+TASK_UPDATED = "task.updated"
+TASK_DELETED = "task.deleted"
+TASK_DELETE_REQUESTED = "task.delete_requested"
+
+# Sent instead of the dropped events when a client falls too far behind.
+RESYNC = b"event: resync\ndata: {}\n\n"
+HEARTBEAT = b": ping\n\n"
+
+
+def encode_event(kind: str, data: Dict[str, Any]) -> bytes:
+    return b"event: %s\ndata: %s\n\n" % (
+        kind.encode(),
+        orjson.dumps(data, option=ORJSON_OPTIONS),
+    )
+
+
+class Subscription:
+    """One open stream. Holds nothing but a few references while idle."""
+
+    __slots__ = ("user_id", "admin", "max_pending", "overflowed", "_pending", "_waiter")
+
+    def __init__(self, user_id: int, admin: bool, max_pending: int):
+        self.user_id = user_id
+        self.admin = admin
+        self.max_pending = max_pending
+        self.overflowed = False
+        self._pending: Optional[Deque[bytes]] = None
+        self._waiter: Optional[asyncio.Future] = None
+
+    def push(self, event: bytes) -> bool:
+        """Queue an event without ever blocking the publisher; False if it was dropped."""
+        if self.overflowed:
+            return False
+        if self._pending is None:
+            self._pending = deque()
+        if len(self._pending) >= self.max_pending:
+            # A slow reader loses its backlog and is told to re-fetch instead.
+            self._pending = None
+            self.overflowed = True
+        else:
+            self._pending.append(event)
+        if self._waiter is not None and not self._waiter.done():
+            self._waiter.set_result(None)
+        return not self.overflowed
+
+    async def next_chunk(self, timeout: float) -> bytes:
+        """Everything queued since the last call, or a heartbeat after ``timeout``."""
+        if not self._pending and not self.overflowed:
+            self._waiter = asyncio.get_running_loop().create_future()
+            try:
+                await asyncio.wait_for(self._waiter, timeout)
+            except asyncio.TimeoutError:
+                return HEARTBEAT
+            finally:
+                self._waiter = None
+        if self.overflowed:
+            self.overflowed = False
+            return RESYNC
+        if not self._pending:
+            return HEARTBEAT
+        chunk = b"".join(self._pending)
+        self._pending = None
+        return chunk
+
+
+@dataclass
+class BrokerStats:
+    published: int = 0
+    delivered: int = 0
+    dropped: int = 0
+
+
+class EventBroker:
+    """In-process fan-out of task change events to this worker's open streams."""
+
+    def __init__(self, max_pending: int):
+        self.max_pending = max_pending
+        self._by_user: Dict[int, Set[Subscription]] = defaultdict(set)
+        self._admins: Set[Subscription] = set()
+        self.stats = BrokerStats()
+
+    def subscribe(self, user_id: int, admin: bool) -> Subscription:
+        subscription = Subscription(user_id, admin, self.max_pending)
+        self._by_user[user_id].add(subscription)
+        if admin:
+            self._admins.add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        subscribers = self._by_user.get(subscription.user_id)
+        if subscribers is not None:
+            subscribers.discard(subscription)
+            if not subscribers:
+                del self._by_user[subscription.user_id]
+        self._admins.discard(subscription)
+
+    def publish(self, kind: str, data: Dict[str, Any], owner_id: int, to_admins: bool = False) -> None:
+        subscribers = set(self._by_user.get(owner_id, ()))
+        if to_admins:
+            subscribers |= self._admins
+        if not subscribers:
+            return
+        event = encode_event(kind, data)
+        self.stats.published += 1
+        for subscription in subscribers:
+            if subscription.push(event):
+                self.stats.delivered += 1
+            else:
+                self.stats.dropped += 1
+
+    async def stream(self, user_id: int, admin: bool, heartbeat: float) -> AsyncIterator[bytes]:
+        # Subscribing inside the generator ties the subscription's lifetime to
+        # the response: it is released however the stream ends.
+        subscription = self.subscribe(user_id, admin)
+        try:
+            yield b"retry: 3000\n\n"
+            while True:
+                yield await subscription.next_chunk(heartbeat)
+        finally:
+            self.unsubscribe(subscription)
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            **asdict(self.stats),
+            "users": len(self._by_user),
+            "streams": sum(len(subscribers) for subscribers in self._by_user.values()),
+            "admin_streams": len(self._admins),
+        }
+
+
+event_broker = EventBroker(settings.EVENTS_MAX_PENDING)
+
+
+def publish_task_event(kind: str, task: Any) -> None:
+    """Push a committed task change to its owner's streams, and to admins for deletions."""
+    if kind == TASK_DELETED:
+        data = {"id": task.id}
+    else:
+        data = task_payload(task)
+    event_broker.publish(
+        kind,
+        data,
+        int(task.owner_id),
+        to_admins=kind in (TASK_DELETED, TASK_DELETE_REQUESTED),
+    )
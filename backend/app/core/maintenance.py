@@ -0,0 +1,123 @@
+"""Background maintenance jobs, registered in every worker by ``app.core.startup``.
+
+Each round of a job runs under a Postgres advisory lock named after it, so
+however many workers and hosts share the database, one of them does the
+work and the others skip that round.
+"""
+
+import asyncio
+import zlib
+from contextlib import asynccontextmanager
+from datetime import timedelta
+from typing import AsyncIterator
+
+from sqlalchemy import text
+
+from app.core.config import settings
+from app.db.crud.crud_task import task_crud
+from app.db.crud.crud_task_stats import task_stats_crud
+from app.db.database import SessionLocal, engine
+from app.db.partitions import ensure_task_partitions
+from logger import log
+
+
+@asynccontextmanager
+async def exclusive_round(job: str) -> AsyncIterator[bool]:
+    """Whether this process runs this round of ``job``.
+
+    The lock is held on a connection of its own for the whole round, since
+    the job's sessions commit (and may switch connections) as they go.
+    """
+    key = zlib.crc32(job.encode("utf-8"))
+    async with engine.connect() as conn:
+        acquired = await conn.scalar(text("SELECT pg_try_advisory_lock(:key)"), {"key": key})
+        # The lock belongs to the connection, not the transaction; ending the
+        # transaction keeps the connection from idling in one all round.
+        await conn.commit()
+        try:
+            yield acquired
+        finally:
+            if acquired:
+                await conn.execute(text("SELECT pg_advisory_unlock(:key)"), {"key": key})
+
+
+async def purge_task_tombstones() -> None:
+    """Background worker dropping tombstones older than any usable sync token."""
+    retention = timedelta(days=settings.TASK_TOMBSTONE_RETENTION_DAYS)
+    while True:
+        await asyncio.sleep(settings.TASK_TOMBSTONE_PURGE_SECONDS)
+        try:
+            async with exclusive_round("tombstone-purge") as leader:
+                purged = 0
+                if leader:
+                    async with SessionLocal() as db:
+                        purged = await task_crud.purge_tombstones(db, older_than=retention)
+            if purged:
+                log.info(f"Purged {purged} task tombstones")
+        except Exception as e:
+            log.warning(f"Tombstone purge failed: {e}")
+
+
+async def create_task_partitions() -> None:
+    """Background worker keeping monthly task partitions created ahead of time."""
+    while True:
+        try:
+            async with exclusive_round("task-partitions") as leader:
+                created = []
+                if leader:
+                    async with SessionLocal() as db:
+                        created = await ensure_task_partitions(
+                            db, settings.TASK_PARTITION_MONTHS_AHEAD
+                        )
+            if created:
+                log.info(f"Created task partitions {created}")
+        except Exception as e:
+            log.warning(f"Task partition maintenance failed: {e}")
+        await asyncio.sleep(settings.TASK_PARTITION_CHECK_SECONDS)
+
+
+async def archive_completed_tasks() -> None:
+    """Background worker moving long-completed tasks to the archive table."""
+    if settings.TASK_ARCHIVE_AFTER_DAYS <= 0:
+        return
+    older_than = timedelta(days=settings.TASK_ARCHIVE_AFTER_DAYS)
+    while True:
+        await asyncio.sleep(settings.TASK_ARCHIVE_INTERVAL_SECONDS)
+        archived = 0
+        try:
+            async with exclusive_round("task-archiver") as leader:
+                while leader:
+                    async with SessionLocal() as db:
+                        moved = await task_crud.archive_completed(
+                            db, older_than=older_than, batch_size=settings.TASK_ARCHIVE_BATCH_SIZE
+                        )
+                    archived += moved
+                    if moved < settings.TASK_ARCHIVE_BATCH_SIZE:
+                        break
+                    # Leaves room for regular traffic between batches.
+                    await asyncio.sleep(settings.TASK_ARCHIVE_BATCH_PAUSE_SECONDS)
+        except Exception as e:
+            log.warning(f"Task archiving failed: {e}")
+        if archived:
+            log.info(f"Archived {archived} completed tasks")
+
+
+async def reconcile_task_stats() -> None:
+    """Background worker recounting user_task_stats to correct drift."""
+    batch = settings.TASK_STATS_RECONCILE_BATCH
+    while True:
+        await asyncio.sleep(settings.TASK_STATS_RECONCILE_SECONDS)
+        corrected = 0
+        try:
+            async with exclusive_round("task-stats-reconcile") as leader:
+                if leader:
+                    async with SessionLocal() as db:
+                        last_id = await task_stats_crud.max_owner_id(db)
+                        for first in range(0, last_id + 1, batch):
+                            corrected += await task_stats_crud.reconcile(
+                                db, first=first, last=first + batch - 1
+                            )
+        except Exception as e:
+            log.warning(f"Task stats reconciliation failed: {e}")
+        if corrected:
+            log.info(f"Corrected task stats of {corrected} users")
@@ -0,0 +1,216 @@
+import asyncio
+import math
+from dataclasses import asdict, dataclass
+from datetime import datetime, timedelta, timezone
+from hashlib import blake2b
+from typing import Any, Dict, Iterable, Optional
+
+from app.core.config import settings
+from app.db.crud.crud_revocation import revoked_token_crud
+from app.db.database import SessionLocal
+from logger import log
+
+# Rows are re-read this far back on every sync, so revocations committed out
+# of order by other workers are still picked up.
+SYNC_OVERLAP = timedelta(seconds=60)
+EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+
+class BloomFilter:
+    """Fixed-size set membership test with false positives but no false negatives."""
+
+    def __init__(self, capacity: int, error_rate: float):
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.size = max(8, int(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.hashes = max(1, round(self.size / capacity * math.log(2)))
+        self._bits = bytearray((self.size + 7) // 8)
+        self.count = 0
+
+    def _positions(self, key: str) -> Iterable[int]:
+        digest = blake2b(key.encode("utf-8"), digest_size=16).digest()
+        first = int.from_bytes(digest[:8], "little")
+        second = int.from_bytes(digest[8:], "little") | 1
+        return ((first + i * second) % self.size for i in range(self.hashes))
+
+    def add(self, key: str) -> None:
+        for position in self._positions(key):
+            self._bits[position >> 3] |= 1 << (position & 7)
+        self.count += 1
+
+    def __contains__(self, key: str) -> bool:
+        return all(
+            self._bits[position >> 3] & (1 << (position & 7))
+            for position in self._positions(key)
+        )
+
+
+def token_key(jti: str) -> str:
+    return f"jti:{jti}"
+
+
+def user_key(user_id: Any) -> str:
+    return f"user:{user_id}"
+
+
+@dataclass
+class RevocationStats:
+    checks: int = 0
+    filter_hits: int = 0
+    lookups: int = 0
+    revoked: int = 0
+    syncs: int = 0
+    rebuilds: int = 0
+
+
+class RevocationStore:
+    """Per-worker view of the ``revoked_tokens`` denylist.
+
+    Every key in the table is added to a Bloom filter, so a token that was
+    never revoked (nearly all of them) is accepted without touching the
+    database; only filter hits are confirmed against the table. The
+    ``revoked_at`` of every per-user entry is kept too, so a user's tokens
+    issued after a "log out everywhere" stay off the database as well. Other
+    workers' revocations arrive through ``sync()``, and ``rebuild()`` starts
+    a fresh filter from the unexpired rows since a Bloom filter cannot forget.
+    """
+
+    def __init__(self, capacity: int, error_rate: float):
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.filter = BloomFilter(capacity, error_rate)
+        self.stats = RevocationStats()
+        self._cursor: Optional[datetime] = None
+        # user:<id> -> revoked_at timestamp, as stored in the table.
+        self._user_revoked_at: Dict[str, float] = {}
+
+    def _candidates(self, payload: Dict[str, Any]):
+        keys = []
+        jti = payload.get("jti")
+        if jti and token_key(jti) in self.filter:
+            keys.append(token_key(jti))
+        user_id = payload.get("user_id")
+        if user_id is not None and user_key(user_id) in self.filter:
+            keys.append(user_key(user_id))
+        return keys
+
+    def _remember(self, key: str, revoked_at: datetime) -> None:
+        if not key.startswith("jti:"):
+            self._user_revoked_at[key] = revoked_at.timestamp()
+
+    async def is_revoked(self, payload: Dict[str, Any]) -> bool:
+        self.stats.checks += 1
+        keys = self._candidates(payload)
+        if not keys:
+            return False
+
+        self.stats.filter_hits += 1
+        issued_at = payload.get("iat")
+        unconfirmed = []
+        for key in keys:
+            revoked_at = self._user_revoked_at.get(key)
+            if revoked_at is None:
+                unconfirmed.append(key)
+            elif self._covers(issued_at, revoked_at):
+                self.stats.revoked += 1
+                return True
+        if not unconfirmed:
+            return False
+
+        self.stats.lookups += 1
+        async with SessionLocal() as db:
+            rows = await revoked_token_crud.get_active(db, keys=unconfirmed)
+        for row in rows:
+            self._remember(row.key, row.revoked_at)
+            if row.key.startswith("jti:") or self._covers(
+                issued_at, row.revoked_at.timestamp()
+            ):
+                self.stats.revoked += 1
+                return True
+        return False
+
+    @staticmethod
+    def _covers(issued_at: Optional[float], revoked_at: float) -> bool:
+        # Tokens without an issue time predate revocation support.
+        return issued_at is None or issued_at < revoked_at
+
+    async def _revoke(self, db, key: str, user_id: int, expires_at: datetime) -> None:
+        revoked_at = datetime.now(timezone.utc)
+        await revoked_token_crud.revoke(
+            db,
+            key=key,
+            user_id=user_id,
+            revoked_at=revoked_at,
+            expires_at=expires_at,
+        )
+        self.filter.add(key)
+        self._remember(key, revoked_at)
+
+    async def revoke_token(self, db, payload: Dict[str, Any]) -> None:
+        """Revoke one token until it would have expired anyway."""
+        jti = payload.get("jti")
+        if not jti:
+            return
+        expires_at = datetime.fromtimestamp(payload["exp"], timezone.utc)
+        await self._revoke(db, token_key(jti), int(payload["user_id"]), expires_at)
+
+    async def revoke_user_tokens(self, db, user_id: int, lifetime: timedelta) -> None:
+        """Revoke every token of ``user_id`` issued before now."""
+        expires_at = datetime.now(timezone.utc) + lifetime
+        await self._revoke(db, user_key(user_id), user_id, expires_at)
+
+    async def sync(self, db) -> None:
+        since = self._cursor - SYNC_OVERLAP if self._cursor else EPOCH
+        started = datetime.now(timezone.utc)
+        for key, revoked_at in await revoked_token_crud.get_since(db, since=since):
+            if key not in self.filter:
+                self.filter.add(key)
+            self._remember(key, revoked_at)
+        self._cursor = started
+        self.stats.syncs += 1
+
+    async def rebuild(self, db) -> None:
+        await revoked_token_crud.delete_expired(db)
+        started = datetime.now(timezone.utc)
+        rows = await revoked_token_crud.get_since(db, since=EPOCH)
+        fresh = BloomFilter(max(self.capacity, 2 * len(rows)), self.error_rate)
+        for key, _ in rows:
+            fresh.add(key)
+        self.filter = fresh
+        self._user_revoked_at = {}
+        for key, revoked_at in rows:
+            self._remember(key, revoked_at)
+        self._cursor = started
+        self.stats.rebuilds += 1
+        log.info(f"Revocation filter rebuilt with {len(rows)} entries")
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            **asdict(self.stats),
+            "entries": self.filter.count,
+            "user_entries": len(self._user_revoked_at),
+            "filter_bits": self.filter.size,
+            "filter_hashes": self.filter.hashes,
+        }
+
+
+revocation_store = RevocationStore(
+    settings.REVOCATION_FILTER_CAPACITY, settings.REVOCATION_FILTER_ERROR_RATE
+)
+
+
+async def sync_revocations() -> None:
+    """Background worker keeping this process's filter in step with the table."""
+    elapsed = 0.0
+    while True:
+        await asyncio.sleep(settings.REVOCATION_SYNC_SECONDS)
+        elapsed += settings.REVOCATION_SYNC_SECONDS
+        try:
+            async with SessionLocal() as db:
+                if elapsed >= settings.REVOCATION_REBUILD_SECONDS:
+                    await revocation_store.rebuild(db)
+                    elapsed = 0.0
+                else:
+                    await revocation_store.sync(db)
+        except Exception as e:
+            log.warning(f"Revocation sync failed: {e}")
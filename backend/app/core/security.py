@@ -1,11 +1,14 @@
+import time
 from datetime import datetime, timedelta, timezone
 from typing import Optional
+from uuid import uuid4
 
 from fastapi import Cookie, Depends, FastAPI, HTTPException, Response, status
 from fastapi.security import HTTPBearer
 from jose import jwt
 
 from app.core.config import settings
+from app.core.revocation import revocation_store
 from app.model.base_model import User
 from app.schema.auth_schema import TokenData
 from app.util.hash import async_hash_password, verify_password
@@ -28,10 +31,16 @@ def hash_password(password: str) -> str:
 
 def create_access_token(data: dict, secret_key: str = settings.SECRET_KEY) -> str:
     expire = datetime.now(timezone.utc) + timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
-    to_encode = {**data, "exp": expire}
+    # Fractional iat so a token issued right after a user-wide revocation
+    # is not mistaken for one issued before it.
+    to_encode = {**data, "exp": expire, "iat": time.time(), "jti": uuid4().hex}
     return jwt.encode(to_encode, secret_key, algorithm=ALGORITHM)
 
 
+def decode_access_token(token: str) -> dict:
+    return jwt.decode(token, settings.SECRET_KEY, algorithms=[ALGORITHM])
+
+
 def generate_verification_token(email: str) -> str:
     expiration_time = datetime.now(timezone.utc) + timedelta(minutes=TOKEN_EXPIRE_MINUTES)
     payload = {"email": email, "exp": expiration_time}
@@ -47,7 +56,7 @@ def verify_old_password(user: User, old_password: str) -> None:
         )
 
 
-def get_token_data(
+async def get_token_data(
     token: Optional[str] = Cookie("token", secure=True, httponly=True),
     response: Response = None,
 ) -> TokenData:
@@ -64,7 +73,6 @@ def get_token_data(
 
     try:
         payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[ALGORITHM])
-        return TokenData(id=str(payload.get("user_id")), role=str(payload.get("role")))
     except jwt.ExpiredSignatureError:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -78,6 +86,14 @@ def get_token_data(
             headers={"WWW-Authenticate": "Bearer"},
         )
 
+    if await revocation_store.is_revoked(payload):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Token has been revoked",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    return TokenData(id=str(payload.get("user_id")), role=str(payload.get("role")))
+
 
 def generate_reset_token(email: str) -> str:
     expiration_time = datetime.now(timezone.utc) + timedelta(minutes=TOKEN_EXPIRE_MINUTES)
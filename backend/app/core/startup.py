@@ -0,0 +1,198 @@
+import asyncio
+from contextlib import asynccontextmanager
+from typing import Awaitable, Callable, Dict, List
+
+from fastapi import FastAPI
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
+
+from app.core.config import settings
+from app.core.maintenance import (
+    archive_completed_tasks,
+    create_task_partitions,
+    purge_task_tombstones,
+    reconcile_task_stats,
+)
+from app.core.revocation import revocation_store, sync_revocations
+from app.db.crud.crud_auth import user_crud
+from app.db.crud.crud_task import task_crud
+from app.db import fast_read
+from app.db.database import SessionLocal, create_all_tables, engine, replica_engines
+from app.db.crud.crud_cluster_setting import cluster_setting_crud
+from app.util.hash import (
+    calibrate_rounds,
+    current_rounds,
+    is_calibrated,
+    set_target_rounds,
+)
+from logger import log
+
+
+class Readiness:
+    def __init__(self):
+        self.ready = False
+        self.detail = "warming up"
+
+    def mark_ready(self) -> None:
+        self.ready = True
+        self.detail = "ready"
+
+    def mark_failed(self, detail: str) -> None:
+        self.ready = False
+        self.detail = detail
+
+
+readiness = Readiness()
+
+_worker_factories: Dict[str, Callable[[], Awaitable[None]]] = {}
+_running_workers: List[asyncio.Task] = []
+
+
+def register_worker(name: str, factory: Callable[[], Awaitable[None]]) -> None:
+    """Register a long-running coroutine started with the app and cancelled on shutdown."""
+    _worker_factories[name] = factory
+
+
+def start_workers() -> None:
+    for name, factory in _worker_factories.items():
+        log.info(f"Starting background worker: {name}")
+        _running_workers.append(asyncio.create_task(factory(), name=name))
+
+
+async def stop_workers() -> None:
+    for task in _running_workers:
+        task.cancel()
+    await asyncio.gather(*_running_workers, return_exceptions=True)
+    _running_workers.clear()
+
+
+register_worker("revocation-sync", sync_revocations)
+register_worker("tombstone-purge", purge_task_tombstones)
+register_worker("task-partitions", create_task_partitions)
+register_worker("task-archiver", archive_completed_tasks)
+register_worker("task-stats-reconcile", reconcile_task_stats)
+
+
+async def prepare_hot_statements(session: AsyncSession) -> None:
+    # Run the hottest queries with arguments that match nothing so both the
+    # SQLAlchemy compiled cache and the connection's prepared statements are
+    # populated before real traffic arrives.
+    await task_crud.get_multi_with_query(session, user_id=0, query=None, skip=0, limit=1)
+    await task_crud.get_multi_with_query(session, user_id=None, query=None, skip=0, limit=1)
+    await task_crud.filter_tasks(session, user_id=0, user_role="user", admin=False, limit=1)
+    await task_crud.get_delete_requested_tasks(session, skip=0, limit=1)
+    await user_crud.get_by_username(session, username="")
+    if settings.DB_FAST_READ_PATH:
+        await fast_read.owner_page(session, user_id=0, query=None, limit=1)
+        await fast_read.owner_page(session, user_id=None, query=None, limit=1)
+        await fast_read.filtered_page(session, user_id=0, admin=False, limit=1)
+
+
+async def warm_pool(target: AsyncEngine, connections: int) -> None:
+    connections = min(connections, target.pool.size())
+    opened = await asyncio.gather(*(target.connect() for _ in range(connections)))
+    try:
+        for conn in opened:
+            async with AsyncSession(bind=conn) as session:
+                await prepare_hot_statements(session)
+    finally:
+        for conn in opened:
+            await conn.close()
+
+
+async def warm_statements() -> None:
+    """Build and compile the hot statements once, in a process about to fork workers.
+
+    The pools are disposed afterwards: the workers inherit the compiled
+    statements but open connections of their own.
+    """
+    try:
+        async with SessionLocal() as session:
+            await prepare_hot_statements(session)
+    finally:
+        for target in (engine, *replica_engines):
+            await target.dispose()
+
+
+def calibrate_password_hashing() -> None:
+    if is_calibrated():
+        return
+    if settings.BCRYPT_ROUNDS:
+        set_target_rounds(settings.BCRYPT_ROUNDS)
+        log.info(f"bcrypt cost pinned to {settings.BCRYPT_ROUNDS}")
+        return
+    rounds, estimated_ms = calibrate_rounds(
+        settings.BCRYPT_TARGET_MS,
+        min_rounds=settings.BCRYPT_MIN_ROUNDS,
+        max_rounds=settings.BCRYPT_MAX_ROUNDS,
+    )
+    log.info(
+        f"bcrypt cost calibrated to {rounds} "
+        f"(~{estimated_ms:.0f}ms, target {settings.BCRYPT_TARGET_MS}ms)"
+    )
+
+
+async def adopt_cluster_hash_cost(db: AsyncSession) -> None:
+    """Switch to the bcrypt cost the first node to start calibrated.
+
+    Stored hashes are only rehashed once this has run, so every node moves
+    them toward the same cost.
+    """
+    if settings.BCRYPT_ROUNDS:
+        return
+    rounds = await cluster_setting_crud.claim(db, name="bcrypt_rounds", value=current_rounds())
+    if rounds != current_rounds():
+        log.info(f"bcrypt cost {rounds} adopted from the cluster")
+    set_target_rounds(rounds)
+
+
+def preload_templates() -> None:
+    from app.api.v1.endpoints.auth import templates as auth_templates
+    from app.core.service import templates as mail_templates
+
+    for templates in (auth_templates, mail_templates):
+        for name in templates.env.list_templates():
+            templates.get_template(name)
+
+
+async def warm_up() -> None:
+    preload_templates()
+    await run_in_threadpool(calibrate_password_hashing)
+    while True:
+        try:
+            await create_all_tables()
+            async with SessionLocal() as session:
+                await adopt_cluster_hash_cost(session)
+                await revocation_store.rebuild(session)
+            if settings.WARMUP_CONNECTIONS:
+                await warm_pool(engine, settings.WARMUP_CONNECTIONS)
+            break
+        except Exception as e:
+            readiness.mark_failed(f"database unavailable: {e}")
+            log.error(
+                f"Warm-up failed, retrying in {settings.WARMUP_RETRY_SECONDS}s: {e}"
+            )
+            await asyncio.sleep(settings.WARMUP_RETRY_SECONDS)
+
+    for index, replica in enumerate(replica_engines):
+        try:
+            await warm_pool(replica, settings.WARMUP_CONNECTIONS)
+        except Exception as e:
+            log.warning(f"Could not warm read replica {index}: {e}")
+
+    readiness.mark_ready()
+    log.info("Warm-up complete, accepting traffic")
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    warm_up_task = asyncio.create_task(warm_up(), name="warm-up")
+    start_workers()
+    try:
+        yield
+    finally:
+        warm_up_task.cancel()
+        await asyncio.gather(warm_up_task, return_exceptions=True)
+        await stop_workers()
+        for target in (engine, *replica_engines):
+            await target.dispose()
@@ -1,8 +1,9 @@
 from typing import Any, Dict, Optional, Union
 
-from sqlalchemy import select
+from sqlalchemy import select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.admission import hashing_gate
 from app.db.crud.crud_base import CRUDBase
 from app.model.base_model import User
 from app.schema.auth_schema import UserCreate, UserUpdate
@@ -18,11 +19,24 @@ class CRUDUser(CRUDBase[User, UserCreate, UserUpdate]):
         result = await db.execute(select(User).filter(User.username == username))
         return result.scalars().first()
 
+    async def replace_password_hash(
+        self, db: AsyncSession, *, user_id: int, old_hash: str, new_hash: str
+    ) -> bool:
+        # Only replaces the hash that was verified, so a password changed in
+        # the meantime is never overwritten.
+        result = await db.execute(
+            update(User)
+            .where(User.id == user_id, User.password == old_hash)
+            .values(password=new_hash)
+        )
+        await db.commit()
+        return result.rowcount == 1
+
     async def create(self, db: AsyncSession, *, obj_in: UserCreate) -> User:
         create_data = dict(obj_in)
         create_data.pop("password")
         db_obj = User(**create_data)
-        db_obj.password = async_hash_password(obj_in.password)
+        db_obj.password = await hashing_gate.run(async_hash_password, obj_in.password)
         db.add(db_obj)
         await db.commit()
         await db.refresh(db_obj)
@@ -0,0 +1,20 @@
+from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.model.base_model import ClusterSetting
+
+
+class CRUDClusterSetting:
+    async def claim(self, db: AsyncSession, *, name: str, value: int) -> int:
+        """Store ``value`` under ``name`` unless a node already did; returns the stored value."""
+        await db.execute(
+            insert(ClusterSetting)
+            .values(name=name, value=value)
+            .on_conflict_do_nothing(index_elements=[ClusterSetting.name])
+        )
+        await db.commit()
+        return await db.scalar(select(ClusterSetting.value).where(ClusterSetting.name == name))
+
+
+cluster_setting_crud = CRUDClusterSetting()
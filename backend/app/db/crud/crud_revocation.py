@@ -0,0 +1,69 @@
+from datetime import datetime, timezone
+from typing import List, Sequence, Tuple
+
+from sqlalchemy import delete, func, select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.model.base_model import RevokedToken
+
+
+class CRUDRevokedToken:
+    async def revoke(
+        self,
+        db: AsyncSession,
+        *,
+        key: str,
+        user_id: int,
+        revoked_at: datetime,
+        expires_at: datetime,
+    ) -> None:
+        statement = insert(RevokedToken).values(
+            key=key, user_id=user_id, revoked_at=revoked_at, expires_at=expires_at
+        )
+        statement = statement.on_conflict_do_update(
+            index_elements=[RevokedToken.key],
+            set_={
+                "revoked_at": statement.excluded.revoked_at,
+                "expires_at": func.greatest(
+                    RevokedToken.expires_at, statement.excluded.expires_at
+                ),
+            },
+        )
+        await db.execute(statement)
+        await db.commit()
+
+    async def get_active(
+        self, db: AsyncSession, *, keys: Sequence[str]
+    ) -> List[RevokedToken]:
+        result = await db.execute(
+            select(RevokedToken).where(
+                RevokedToken.key.in_(keys),
+                RevokedToken.expires_at > datetime.now(timezone.utc),
+            )
+        )
+        return list(result.scalars().all())
+
+    async def get_since(
+        self, db: AsyncSession, *, since: datetime
+    ) -> List[Tuple[str, datetime]]:
+        """``(key, revoked_at)`` of the unexpired entries revoked after ``since``."""
+        result = await db.execute(
+            select(RevokedToken.key, RevokedToken.revoked_at).where(
+                RevokedToken.revoked_at > since,
+                RevokedToken.expires_at > datetime.now(timezone.utc),
+            )
+        )
+        return [tuple(row) for row in result.all()]
+
+    async def delete_expired(self, db: AsyncSession) -> int:
+        result = await db.execute(
+            delete(RevokedToken).where(
+                RevokedToken.expires_at <= datetime.now(timezone.utc)
+            )
+        )
+        await db.commit()
+        return result.rowcount
+
+
+revoked_token_crud = CRUDRevokedToken()
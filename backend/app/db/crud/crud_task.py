@@ -1,28 +1,186 @@
-from datetime import datetime
-from typing import Any, Dict, List, Optional, Tuple, Union
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple, Union
 
 from fastapi import HTTPException, status
-from sqlalchemy import String, cast, desc, func, or_, select
+from sqlalchemy import (
+    DateTime,
+    Integer,
+    Interval,
+    String,
+    and_,
+    bindparam,
+    cast,
+    delete,
+    desc,
+    func,
+    or_,
+    select,
+    true,
+    tuple_,
+    union_all,
+    update,
+)
+from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.db.crud.crud_base import CRUDBase
-from app.model.base_model import Category, Task, User
-from app.schema.task_schema import TaskCreate, TaskUpdate
+from app.db.statements import STATEMENT_NAME, statement_registry
+from app.model.base_model import Category, Task, TaskArchive, TaskTombstone, User
+from app.schema.task_schema import TASK_FIELDS, TaskCreate, TaskUpdate
+from app.util.sync_token import SyncToken
 from logger import log
 
 
+def parse_task_filters(
+    task_status: Optional[str] = None,
+    category: Optional[str] = None,
+    due_date: Optional[str] = None,
+) -> Tuple[Optional[bool], Optional[Category], Optional[datetime]]:
+    task_status_bool = None
+    if task_status is not None:
+        task_status_bool = task_status.lower() == "true"
+
+    category_enum = None
+    if category:
+        category_upper = category.strip().upper()
+        if category_upper:
+            try:
+                category_enum = Category[category_upper]
+            except KeyError:
+                log.error(f"Invalid category value: {category}")
+                raise HTTPException(
+                    status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+                    detail=f"Invalid category value: {category}",
+                )
+
+    parsed_due_date = None
+    if due_date is not None and due_date.strip():
+        parsed_due_date = datetime.fromisoformat(due_date)
+
+    return task_status_bool, category_enum, parsed_due_date
+
+
+# Every column of tasks; tasks_archive has the same ones plus archived_at.
+ARCHIVED_COLUMNS = tuple(column.name for column in Task.__table__.columns)
+
+# Facet -> value -> condition on the task columns ``c``. The status filter
+# uses the same conditions, so a NULL status counts as open everywhere.
+TASK_FACETS: Dict[str, Dict[str, Callable[[Any], Any]]] = {
+    "status": {
+        "done": lambda c: c.status == True,
+        "open": lambda c: c.status.isnot(True),
+    },
+    "category": {
+        category.value: (lambda c, category=category: c.category == category)
+        for category in Category
+    },
+}
+
+
 class CRUDTask(CRUDBase[Task, TaskCreate, TaskUpdate]):
+    def _select(self, fields: Optional[Sequence[str]] = None, model=Task):
+        """Select whole entities, or only the requested columns when ``fields`` is given."""
+        if not fields:
+            return select(model)
+        return select(*(getattr(model, field) for field in fields))
+
+    def _rows(self, result, fields: Optional[Sequence[str]] = None) -> List[Any]:
+        rows = result.fetchall()
+        if not fields:
+            return [row[0] for row in rows]
+        return [row._asdict() for row in rows]
+
+    def _page_statements(
+        self,
+        name: str,
+        key: Tuple,
+        fields: Optional[Sequence[str]],
+        criteria: Callable[[Any], List[Any]],
+        order_by: Optional[Callable[[Any], Any]] = None,
+        join_owner: bool = False,
+        include_archived: bool = False,
+    ):
+        """Registered (count, page) statements for one filter shape; values are bound at execution.
+
+        ``criteria`` and ``order_by`` are given the table to filter, so the
+        same shape can be applied to ``tasks_archive`` when it is included.
+        """
+
+        def build():
+            if include_archived:
+                count, page = self._archived_page(fields, criteria, order_by, join_owner)
+            else:
+                where = criteria(Task)
+                count = select(func.count()).select_from(Task)
+                page = self._select(fields)
+                if join_owner:
+                    count = count.join(User, Task.owner_id == User.id)
+                    page = page.join(User, Task.owner_id == User.id)
+                count = count.where(*where)
+                page = page.where(*where)
+                if order_by is not None:
+                    page = page.order_by(order_by(Task))
+            page = page.offset(bindparam("skip")).limit(bindparam("limit"))
+            return (
+                count.execution_options(**{STATEMENT_NAME: f"{name}.count"}),
+                page.execution_options(**{STATEMENT_NAME: name}),
+            )
+
+        return statement_registry.get(
+            name, (key, tuple(fields) if fields else None, include_archived), build
+        )
+
+    def _archived_page(self, fields, criteria, order_by, join_owner):
+        """Count and page over ``tasks`` UNION ALL ``tasks_archive``."""
+        parts = []
+        for model in (Task, TaskArchive):
+            part = select(*(getattr(model, field) for field in TASK_FIELDS))
+            if join_owner:
+                part = part.join(User, model.owner_id == User.id)
+            parts.append(part.where(*criteria(model)))
+        rows = union_all(*parts).subquery("all_tasks")
+        count = select(func.count()).select_from(rows)
+        page = select(*(rows.c[field] for field in fields or TASK_FIELDS))
+        if order_by is not None:
+            page = page.order_by(order_by(rows.c))
+        return count, page
+
+    def _page_fields(
+        self, fields: Optional[Sequence[str]], include_archived: bool
+    ) -> Optional[Sequence[str]]:
+        # Archived rows are not Task entities, so unions always return column dicts.
+        return fields or (TASK_FIELDS if include_archived else None)
+
+    async def _fetch_page(
+        self,
+        db: AsyncSession,
+        statements,
+        params: Dict[str, Any],
+        skip: int,
+        limit: int,
+        fields: Optional[Sequence[str]] = None,
+    ) -> Tuple[List[Any], int]:
+        count, page = statements
+        total = await db.scalar(count, params)
+        result = await db.execute(page, {**params, "skip": skip, "limit": limit})
+        return self._rows(result, fields), total
+
     async def get_by_owner(self, db: AsyncSession, *, owner_id: int) -> List[Task]:
         result = await db.execute(select(Task).filter(Task.owner_id == owner_id))
         rows = result.fetchall()
         tasks = [row[0] for row in rows]
         return tasks
 
-    async def get_by_id(self, db: AsyncSession, *, id: int) -> Task:
+    async def get_by_id(self, db: AsyncSession, *, id: int) -> Optional[Task]:
         result = await db.execute(select(Task).where(Task.id == id))
-        rows = result.fetchall()
-        task = [row[0] for row in rows][0]
-        return task
+        return result.scalars().first()
+
+    async def get_fields_by_id(
+        self, db: AsyncSession, *, id: int, fields: Sequence[str]
+    ) -> Optional[Dict[str, Any]]:
+        result = await db.execute(self._select(fields).where(Task.id == id))
+        row = result.first()
+        return row._asdict() if row else None
 
     async def get_multi_with_query(
         self,
@@ -32,20 +190,33 @@ class CRUDTask(CRUDBase[Task, TaskCreate, TaskUpdate]):
         query: Optional[str],
         skip: int = 0,
         limit: int = 100,
+        fields: Optional[Sequence[str]] = None,
+        include_archived: bool = False,
     ) -> Tuple[List[Task], int]:
-        base_query = select(Task)
+        fields = self._page_fields(fields, include_archived)
+        params: Dict[str, Any] = {}
         if user_id is not None:
-            base_query = base_query.filter(Task.owner_id == user_id)
+            params["owner_id"] = user_id
         if query:
-            base_query = base_query.filter(Task.title.ilike(f"%{query}%"))
+            params["title_pattern"] = f"%{query}%"
 
-        total = await db.scalar(select(func.count()).select_from(base_query.subquery()))
-        result = await db.execute(
-            base_query.order_by(desc(Task.id)).offset(skip).limit(limit)
+        def criteria(model):
+            where = []
+            if "owner_id" in params:
+                where.append(model.owner_id == bindparam("owner_id"))
+            if "title_pattern" in params:
+                where.append(model.title.ilike(bindparam("title_pattern")))
+            return where
+
+        statements = self._page_statements(
+            "task.list",
+            tuple(params),
+            fields,
+            criteria,
+            order_by=lambda model: desc(model.id),
+            include_archived=include_archived,
         )
-        rows = result.fetchall()
-        tasks = [row[0] for row in rows]
-        return tasks, total
+        return await self._fetch_page(db, statements, params, skip, limit, fields)
 
     async def create(self, db: AsyncSession, *, obj_in: TaskCreate) -> Task:
         create_data = obj_in.dict()
@@ -67,25 +238,313 @@ class CRUDTask(CRUDBase[Task, TaskCreate, TaskUpdate]):
         else:
             update_data = obj_in.dict(exclude_unset=True)
 
+        new_owner_id = update_data.get("owner_id")
+        if new_owner_id is not None and int(new_owner_id) != db_obj.owner_id:
+            # The task leaves the old owner's list and (re)enters the new one's.
+            await self._tombstone(db, task_id=db_obj.id, owner_id=db_obj.owner_id)
+            await db.execute(
+                delete(TaskTombstone).where(
+                    TaskTombstone.task_id == db_obj.id,
+                    TaskTombstone.owner_id == int(new_owner_id),
+                )
+            )
+
         return await super().update(db, db_obj=db_obj, obj_in=update_data)
 
+    async def update_if_match(
+        self,
+        db: AsyncSession,
+        *,
+        id: int,
+        versions: Optional[Tuple[int, ...]],
+        values: Dict[str, Any],
+        owner_id: Optional[int] = None,
+    ) -> Tuple[Optional[Task], Optional[int]]:
+        """Apply ``values`` with a single UPDATE ... RETURNING guarded by ``versions``.
+
+        The version check and increment happen in the statement itself, so
+        no row is read or locked up front. Returns the updated task and its
+        owner before the update, or ``(None, None)`` if nothing matched:
+        the task is missing, is not owned by ``owner_id`` or has moved on
+        from ``versions``. ``versions=None`` writes unconditionally.
+        """
+        params: Dict[str, Any] = {"task_id": id}
+        params.update((f"new_{name}", value) for name, value in values.items())
+        if versions is not None:
+            params["versions"] = list(versions)
+        if owner_id is not None:
+            params["caller_id"] = owner_id
+        columns = Task.__table__.c
+
+        def build():
+            # Read in the same statement, so RETURNING can report the old owner.
+            previous = select(Task.id, Task.owner_id).where(Task.id == bindparam("task_id"))
+            statement = update(Task)
+            if "versions" in params:
+                statement = statement.where(
+                    Task.version.in_(bindparam("versions", expanding=True))
+                )
+            if "caller_id" in params:
+                # On both sides, so a table partitioned by owner is pruned for each.
+                previous = previous.where(Task.owner_id == bindparam("caller_id"))
+                statement = statement.where(Task.owner_id == bindparam("caller_id"))
+            previous = previous.subquery("previous")
+            statement = statement.where(Task.id == previous.c.id)
+            return (
+                statement.values(
+                    {
+                        **{
+                            name: bindparam(f"new_{name}", type_=columns[name].type)
+                            for name in sorted(values)
+                        },
+                        "version": Task.version + 1,
+                    }
+                )
+                .returning(Task, previous.c.owner_id)
+                .execution_options(
+                    synchronize_session=False,
+                    populate_existing=True,
+                    **{STATEMENT_NAME: "task.update"},
+                )
+            )
+
+        statement = statement_registry.get(
+            "task.update", (tuple(sorted(values)), tuple(sorted(params))), build
+        )
+        row = (await db.execute(statement, params)).first()
+        if row is None:
+            await db.rollback()
+            return None, None
+
+        task, previous_owner_id = row
+        if task.owner_id != previous_owner_id:
+            await self._tombstone(db, task_id=task.id, owner_id=previous_owner_id)
+            await db.execute(
+                delete(TaskTombstone).where(
+                    TaskTombstone.task_id == task.id,
+                    TaskTombstone.owner_id == task.owner_id,
+                )
+            )
+        await db.commit()
+        return task, previous_owner_id
+
+    async def get_version(self, db: AsyncSession, *, id: int) -> Optional[Tuple[int, int]]:
+        """``(owner_id, version)`` of a task, or ``None`` if it does not exist."""
+        row = (
+            await db.execute(select(Task.owner_id, Task.version).where(Task.id == id))
+        ).first()
+        return tuple(row) if row else None
+
+    async def _tombstone(self, db: AsyncSession, *, task_id: int, owner_id: int) -> None:
+        statement = insert(TaskTombstone).values(task_id=task_id, owner_id=owner_id)
+        await db.execute(
+            statement.on_conflict_do_update(
+                index_elements=[TaskTombstone.task_id, TaskTombstone.owner_id],
+                set_={"deleted_at": func.now()},
+            )
+        )
+
+    async def get_changes(
+        self,
+        db: AsyncSession,
+        *,
+        user_id: Optional[int],
+        since: Optional[SyncToken],
+        limit: int,
+        lag: timedelta,
+    ) -> Tuple[List[Task], List[int], SyncToken, bool]:
+        """Tasks changed and task ids deleted after ``since``, oldest first.
+
+        Only rows older than ``now() - lag`` are returned, so a transaction
+        that was still in flight when the horizon passed its timestamp is
+        picked up by the next call instead of being skipped.
+        """
+        horizon = await db.scalar(select(func.now() - lag))
+        if since is None:
+            return [], [], SyncToken.at(horizon), False
+
+        params: Dict[str, Any] = {
+            "horizon": horizon,
+            "changed_at": since.changed_at,
+            "changed_id": since.changed_id,
+            "deleted_at": since.deleted_at,
+            "deleted_id": since.deleted_id,
+            "limit": limit,
+        }
+        if user_id is not None:
+            params["owner_id"] = user_id
+
+        def build():
+            changed_at = bindparam("changed_at", type_=DateTime(timezone=True))
+            deleted_at = bindparam("deleted_at", type_=DateTime(timezone=True))
+            changed = select(Task).where(
+                Task.updated_at >= changed_at,
+                tuple_(Task.updated_at, Task.id)
+                > tuple_(changed_at, bindparam("changed_id", type_=Integer)),
+                Task.updated_at < bindparam("horizon"),
+            )
+            deleted = select(TaskTombstone.task_id, TaskTombstone.deleted_at).where(
+                TaskTombstone.deleted_at >= deleted_at,
+                tuple_(TaskTombstone.deleted_at, TaskTombstone.task_id)
+                > tuple_(deleted_at, bindparam("deleted_id", type_=Integer)),
+                TaskTombstone.deleted_at < bindparam("horizon"),
+            )
+            if "owner_id" in params:
+                changed = changed.where(Task.owner_id == bindparam("owner_id"))
+                deleted = deleted.where(TaskTombstone.owner_id == bindparam("owner_id"))
+            return (
+                changed.order_by(Task.updated_at, Task.id)
+                .limit(bindparam("limit"))
+                .execution_options(**{STATEMENT_NAME: "task.changes"}),
+                deleted.order_by(TaskTombstone.deleted_at, TaskTombstone.task_id)
+                .limit(bindparam("limit"))
+                .execution_options(**{STATEMENT_NAME: "task.changes.deleted"}),
+            )
+
+        changed_statement, deleted_statement = statement_registry.get(
+            "task.changes", "owner_id" in params, build
+        )
+        tasks = list((await db.execute(changed_statement, params)).scalars().all())
+        tombstones = (await db.execute(deleted_statement, params)).all()
+
+        changed_more = len(tasks) == limit
+        deleted_more = len(tombstones) == limit
+        next_token = SyncToken(
+            tasks[-1].updated_at if changed_more else horizon,
+            tasks[-1].id if changed_more else 0,
+            tombstones[-1].deleted_at if deleted_more else horizon,
+            tombstones[-1].task_id if deleted_more else 0,
+        )
+        deleted_ids = list(dict.fromkeys(row.task_id for row in tombstones))
+        return tasks, deleted_ids, next_token, changed_more or deleted_more
+
+    async def purge_tombstones(self, db: AsyncSession, *, older_than: timedelta) -> int:
+        result = await db.execute(
+            delete(TaskTombstone).where(TaskTombstone.deleted_at < func.now() - older_than)
+        )
+        await db.commit()
+        return result.rowcount
+
+    async def archive_completed(
+        self, db: AsyncSession, *, older_than: timedelta, batch_size: int
+    ) -> int:
+        """Move one batch of tasks completed more than ``older_than`` ago to ``tasks_archive``.
+
+        The rows are deleted and inserted by a single statement and picked
+        with SKIP LOCKED, so a batch never waits on, or half-moves, a task
+        that is being written. The same statement writes a tombstone per
+        task, so ``/task/changes`` clients drop archived tasks just as a
+        full refetch does. Returns how many tasks were moved.
+        """
+
+        def build():
+            candidates = (
+                select(Task.id)
+                .where(
+                    Task.status == True,
+                    # completed_at is naive UTC, whatever the session time zone.
+                    Task.completed_at
+                    < func.timezone("utc", func.now()) - bindparam("older_than", type_=Interval),
+                )
+                .order_by(Task.completed_at)
+                .limit(bindparam("batch_size"))
+                .with_for_update(skip_locked=True)
+            )
+            # Core tables: a parameter dict would turn ORM statements into bulk inserts.
+            tasks, archive, tombstones = (
+                Task.__table__,
+                TaskArchive.__table__,
+                TaskTombstone.__table__,
+            )
+            moved = (
+                delete(tasks)
+                .where(tasks.c.id.in_(candidates.scalar_subquery()))
+                .returning(*(tasks.c[name] for name in ARCHIVED_COLUMNS))
+                .cte("moved")
+            )
+            tombstoned = insert(tombstones).from_select(
+                ["task_id", "owner_id"],
+                select(moved.c.id, moved.c.owner_id).where(moved.c.owner_id.isnot(None)),
+            )
+            tombstoned = tombstoned.on_conflict_do_update(
+                index_elements=[tombstones.c.task_id, tombstones.c.owner_id],
+                set_={"deleted_at": func.now()},
+            ).cte("tombstoned")
+            return (
+                insert(archive)
+                .from_select(
+                    ARCHIVED_COLUMNS, select(*(moved.c[name] for name in ARCHIVED_COLUMNS))
+                )
+                .add_cte(tombstoned)
+                .execution_options(**{STATEMENT_NAME: "task.archive"})
+            )
+
+        statement = statement_registry.get("task.archive", (), build)
+        result = await db.execute(
+            statement, {"older_than": older_than, "batch_size": batch_size}
+        )
+        await db.commit()
+        return result.rowcount
+
+    async def get_archived_by_id(self, db: AsyncSession, *, id: int) -> Optional[TaskArchive]:
+        return await db.get(TaskArchive, id)
+
+    async def suggest_titles(
+        self, db: AsyncSession, *, user_id: Optional[int], prefix: str, limit: int
+    ) -> List[str]:
+        """Distinct titles starting with ``prefix``, ignoring case, in title order.
+
+        Reads a byte-ordered range of the title prefix index and stops once
+        ``limit`` distinct titles are found; nothing is counted. The range
+        bounds are derived from the parameter in SQL so generic plans of the
+        prepared statement can use them too.
+        """
+
+        def build():
+            key = func.lower(Task.title).collate("C")
+            low = func.lower(bindparam("prefix", type_=String))
+            high = func.concat(
+                func.left(low, -1), func.chr(func.ascii(func.right(low, 1)) + 1)
+            )
+            where = [key >= low, key < high]
+            if user_id is not None:
+                where.append(Task.owner_id == bindparam("owner_id"))
+            return (
+                select(Task.title)
+                .distinct(key)
+                .where(*where)
+                .order_by(key, Task.id)
+                .limit(bindparam("limit"))
+                .execution_options(**{STATEMENT_NAME: "task.suggest"})
+            )
+
+        statement = statement_registry.get("task.suggest", (user_id is not None,), build)
+        params: Dict[str, Any] = {"prefix": prefix, "limit": limit}
+        if user_id is not None:
+            params["owner_id"] = user_id
+        result = await db.execute(statement, params)
+        return list(result.scalars())
+
     async def get_delete_requested_tasks(
-        self, db: AsyncSession, skip: int = 0, limit: int = 100
+        self,
+        db: AsyncSession,
+        skip: int = 0,
+        limit: int = 100,
+        fields: Optional[Sequence[str]] = None,
     ) -> Tuple[List[Task], int]:
-        base_query = select(Task).filter(Task.delete_request == True)
-        total = await db.scalar(
-            select(func.count(Task.id)).filter(base_query.whereclause)
+        statements = self._page_statements(
+            "task.delete_requests",
+            (),
+            fields,
+            lambda model: [model.delete_request == True],
         )
-        result = await db.execute(base_query.offset(skip).limit(limit))
-
-        rows = result.fetchall()
-        tasks = [row[0] for row in rows]
-        return tasks, total
+        return await self._fetch_page(db, statements, {}, skip, limit, fields)
 
     async def remove(self, db: AsyncSession, *, id: int) -> Task:
         obj = await self.get(db, id)
         if obj:
             await db.delete(obj)
+            await self._tombstone(db, task_id=obj.id, owner_id=obj.owner_id)
             await db.commit()
         return obj
 
@@ -97,27 +556,41 @@ class CRUDTask(CRUDBase[Task, TaskCreate, TaskUpdate]):
         admin: bool,
         skip: int = 0,
         limit: int = 100,
+        fields: Optional[Sequence[str]] = None,
+        include_archived: bool = False,
     ) -> Tuple[List[Task], int]:
-        base_query = select(Task)
+        fields = self._page_fields(fields, include_archived)
+        params: Dict[str, Any] = {}
         if not admin:
-            base_query = base_query.filter(Task.owner_id == int(user_id))
+            params["owner_id"] = int(user_id)
         if query:
-            base_query = base_query.filter(
-                or_(
-                    Task.title.ilike(f"%{query}%"),
-                    Task.description.ilike(f"%{query}%"),
-                    cast(Task.due_date, String).ilike(f"%{query}%"),
+            params["pattern"] = f"%{query}%"
+
+        def criteria(model):
+            where = []
+            if "owner_id" in params:
+                where.append(model.owner_id == bindparam("owner_id"))
+            if "pattern" in params:
+                pattern = bindparam("pattern")
+                where.append(
+                    or_(
+                        model.title.ilike(pattern),
+                        model.description.ilike(pattern),
+                        cast(model.due_date, String).ilike(pattern),
+                    )
                 )
-            )
-        total = await db.scalar(
-            select(func.count(Task.id)).filter(base_query.whereclause)
+            return where
+
+        statements = self._page_statements(
+            "task.search",
+            tuple(params),
+            fields,
+            criteria,
+            order_by=lambda model: model.id,
+            include_archived=include_archived,
         )
-        paginated_query = base_query.order_by(Task.id).offset(skip).limit(limit)
-        result = await db.execute(paginated_query)
-        rows = result.fetchall()
-        tasks = [row[0] for row in rows]
-        return tasks, total
-    
+        return await self._fetch_page(db, statements, params, skip, limit, fields)
+
     async def search_delete_requests(
         self,
         db: AsyncSession,
@@ -126,28 +599,83 @@ class CRUDTask(CRUDBase[Task, TaskCreate, TaskUpdate]):
         admin: bool,
         skip: int = 0,
         limit: int = 100,
+        fields: Optional[Sequence[str]] = None,
     ) -> Tuple[List[Task], int]:
-        base_query = select(Task).join(User, Task.owner_id == User.id).filter(Task.delete_request == True)
-
+        params: Dict[str, Any] = {}
         if not admin:
-            base_query = base_query.filter(Task.owner_id == int(user_id))
-            
+            params["owner_id"] = int(user_id)
         if query:
-            user_filters = or_(
-                User.username.ilike(f"%{query}%"),
-                User.first_name.ilike(f"%{query}%"),
-                User.last_name.ilike(f"%{query}%")
-            )
-            base_query = base_query.filter(user_filters)
-        
-        total = await db.scalar(
-            select(func.count(Task.id)).filter(base_query.whereclause)
+            params["pattern"] = f"%{query}%"
+
+        def criteria(model):
+            where = [model.delete_request == True]
+            if "owner_id" in params:
+                where.append(model.owner_id == bindparam("owner_id"))
+            if "pattern" in params:
+                pattern = bindparam("pattern")
+                where.append(
+                    or_(
+                        User.username.ilike(pattern),
+                        User.first_name.ilike(pattern),
+                        User.last_name.ilike(pattern),
+                    )
+                )
+            return where
+
+        # The count joins users too; counting over the bare WHERE clause
+        # multiplied every match by the number of users.
+        statements = self._page_statements(
+            "task.search_delete_requests",
+            tuple(params),
+            fields,
+            criteria,
+            order_by=lambda model: model.id,
+            join_owner=True,
+        )
+        return await self._fetch_page(db, statements, params, skip, limit, fields)
+
+    def _filter_params(
+        self,
+        *,
+        user_id: int,
+        admin: bool,
+        task_status: Optional[str],
+        category: Optional[str],
+        due_date: Optional[str],
+    ) -> Dict[str, Any]:
+        task_status_bool, category_enum, parsed_due_date = parse_task_filters(
+            task_status, category, due_date
         )
-        paginated_query = base_query.order_by(Task.id).offset(skip).limit(limit)
-        result = await db.execute(paginated_query)
-        rows = result.fetchall()
-        tasks = [row[0] for row in rows]
-        return tasks, total
+
+        params: Dict[str, Any] = {}
+        if not admin:
+            params["owner_id"] = int(user_id)
+        if task_status_bool is not None:
+            params["status"] = task_status_bool
+            log.info(f"Applied task_status filter: {task_status_bool}")
+        if category_enum is not None:
+            params["category"] = category_enum
+            log.info(f"Applied category filter: {category_enum}")
+        if parsed_due_date is not None:
+            params["due_date"] = parsed_due_date
+            log.info(f"Applied due_date filter: {parsed_due_date}")
+        return params
+
+    def _filter_key(self, params: Dict[str, Any]) -> Tuple:
+        """Statement shape of ``params``: the status is part of the SQL, not a bound value."""
+        return tuple((name, params[name]) if name == "status" else name for name in params)
+
+    def _filter_conditions(self, params: Dict[str, Any], model) -> Dict[str, Any]:
+        """The active filters other than the owner, keyed by parameter name."""
+        conditions = {}
+        if "status" in params:
+            status_value = "done" if params["status"] else "open"
+            conditions["status"] = TASK_FACETS["status"][status_value](model)
+        if "category" in params:
+            conditions["category"] = model.category == bindparam("category")
+        if "due_date" in params:
+            conditions["due_date"] = model.due_date <= bindparam("due_date")
+        return conditions
 
     async def filter_tasks(
         self,
@@ -161,51 +689,43 @@ class CRUDTask(CRUDBase[Task, TaskCreate, TaskUpdate]):
         admin: bool,
         skip: int = 0,
         limit: int = 8,
+        fields: Optional[Sequence[str]] = None,
+        include_archived: bool = False,
     ) -> Tuple[List[Task], int]:
+        fields = self._page_fields(fields, include_archived)
         try:
-            base_query = select(Task)
-            if not admin:
-                base_query = base_query.filter(Task.owner_id == int(user_id))
-
             log.info(
                 f"Filtering tasks with parameters: user_id={user_id}, task_status={task_status}, category={category}, due_date={due_date}, skip={skip}, limit={limit}"
             )
 
-            if task_status is not None:
-                task_status_bool = task_status.lower() == "true"
-                base_query = base_query.filter(Task.status == task_status_bool)
-                log.info(f"Applied task_status filter: {task_status_bool}")
-
-            if category:
-                category_upper = category.strip().upper()
-                if category_upper:
-                    try:
-                        category_enum = Category[category_upper]
-                        base_query = base_query.filter(Task.category == category_enum)
-                        log.info(f"Applied category filter: {category_enum}")
-                    except KeyError:
-                        log.error(f"Invalid category value: {category}")
-                        raise HTTPException(
-                            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
-                            detail=f"Invalid category value: {category}",
-                        )
-
-            if due_date is not None and due_date.strip():
-                parsed_due_date = datetime.fromisoformat(due_date)
-                base_query = base_query.filter(Task.due_date <= parsed_due_date)
-                log.info(f"Applied due_date filter: {parsed_due_date}")
-
-            total = await db.scalar(
-                select(func.count()).select_from(base_query.subquery())
+            params = self._filter_params(
+                user_id=user_id,
+                admin=admin,
+                task_status=task_status,
+                category=category,
+                due_date=due_date,
             )
-            log.info(f"Total count: {total}")
 
-            paginated_query = base_query.order_by(Task.id).offset(skip).limit(limit)
-            log.info(f"Pagination: offset={skip}, limit={limit}")
+            def criteria(model):
+                where = []
+                if "owner_id" in params:
+                    where.append(model.owner_id == bindparam("owner_id"))
+                where.extend(self._filter_conditions(params, model).values())
+                return where
 
-            result = await db.execute(paginated_query)
-            rows = result.fetchall()
-            tasks = [row[0] for row in rows]
+            statements = self._page_statements(
+                "task.filter",
+                self._filter_key(params),
+                fields,
+                criteria,
+                order_by=lambda model: model.id,
+                include_archived=include_archived,
+            )
+            log.info(f"Pagination: offset={skip}, limit={limit}")
+            tasks, total = await self._fetch_page(
+                db, statements, params, skip, limit, fields
+            )
+            log.info(f"Total count: {total}")
 
             log.info(f"Filtered {len(tasks)} tasks")
             return tasks, total
@@ -213,5 +733,116 @@ class CRUDTask(CRUDBase[Task, TaskCreate, TaskUpdate]):
             log.error(f"Failed to filter tasks: {e}")
             raise e
 
+    def _faceted_filter_statement(
+        self,
+        key: Tuple,
+        fields: Sequence[str],
+        params: Dict[str, Any],
+        include_archived: bool,
+    ):
+        """One statement returning a filter page and the facet counts around it.
+
+        The facet counts sit on every row, with the page LEFT JOINed to
+        them so they come back even when the page is empty. Each facet
+        is counted with every filter applied except its own, so selecting
+        a status still shows how many tasks the other status has.
+        """
+
+        def build():
+            parts = []
+            for model in (Task, TaskArchive) if include_archived else (Task,):
+                part = select(*(getattr(model, field) for field in TASK_FIELDS))
+                if "owner_id" in params:
+                    part = part.where(model.owner_id == bindparam("owner_id"))
+                parts.append(part)
+            scoped = (union_all(*parts) if include_archived else parts[0]).subquery("scoped")
+            c = scoped.c
+            conditions = self._filter_conditions(params, c)
+
+            def matching(excluding=None):
+                return and_(
+                    true(), *(condition for name, condition in conditions.items() if name != excluding)
+                )
+
+            counts = [func.count().filter(matching()).label("facet_total")]
+            for facet, values in TASK_FACETS.items():
+                counts.extend(
+                    func.count().filter(and_(matching(facet), condition(c))).label(f"facet_{facet}_{value}")
+                    for value, condition in values.items()
+                )
+            counts.append(
+                func.count()
+                .filter(matching(), c.status.isnot(True), c.due_date < func.localtimestamp())
+                .label("facet_overdue")
+            )
+            facets = select(*counts).subquery("facets")
+
+            columns = [c[field] for field in fields]
+            if "id" not in fields:
+                columns.append(c.id)
+            page = (
+                select(*columns)
+                .where(matching())
+                .order_by(c.id)
+                .offset(bindparam("skip"))
+                .limit(bindparam("limit"))
+                .subquery("page")
+            )
+            return (
+                select(facets, *(page.c[field] for field in fields), page.c.id.label("page_id"))
+                .select_from(facets.outerjoin(page, true()))
+                .order_by(page.c.id)
+                .execution_options(**{STATEMENT_NAME: "task.filter.facets"})
+            )
+
+        return statement_registry.get(
+            "task.filter.facets", (key, tuple(fields), include_archived), build
+        )
+
+    async def filter_tasks_with_facets(
+        self,
+        db: AsyncSession,
+        *,
+        user_id: int,
+        task_status: Optional[str] = None,
+        category: Optional[str] = None,
+        due_date: Optional[str] = None,
+        admin: bool,
+        skip: int = 0,
+        limit: int = 8,
+        fields: Optional[Sequence[str]] = None,
+        include_archived: bool = False,
+    ) -> Tuple[List[Dict[str, Any]], int, Dict[str, Any]]:
+        """``filter_tasks`` plus status, category and overdue counts, in one round trip.
+
+        Rows come back as column dicts (``fields``, or every task field).
+        """
+        fields = fields or TASK_FIELDS
+        params = self._filter_params(
+            user_id=user_id,
+            admin=admin,
+            task_status=task_status,
+            category=category,
+            due_date=due_date,
+        )
+        statement = self._faceted_filter_statement(
+            self._filter_key(params), fields, params, include_archived
+        )
+        result = await db.execute(statement, {**params, "skip": skip, "limit": limit})
+        rows = result.mappings().fetchall()
+
+        first = rows[0]
+        facets: Dict[str, Any] = {
+            facet: {value: first[f"facet_{facet}_{value}"] for value in values}
+            for facet, values in TASK_FACETS.items()
+        }
+        facets["overdue"] = first["facet_overdue"]
+        tasks = [
+            {field: row[field] for field in fields}
+            for row in rows
+            if row["page_id"] is not None
+        ]
+        return tasks, first["facet_total"], facets
+
 
 task_crud = CRUDTask(Task)
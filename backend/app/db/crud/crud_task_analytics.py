@@ -0,0 +1,143 @@
+from datetime import timedelta
+from typing import Any, Dict, List, Optional, Sequence
+
+from sqlalchemy import (
+    Date,
+    Interval,
+    and_,
+    bindparam,
+    case,
+    cast,
+    extract,
+    func,
+    literal,
+    or_,
+    select,
+    union_all,
+)
+from sqlalchemy.dialects.postgresql import array
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.statements import STATEMENT_NAME, statement_registry
+from app.model.base_model import Task, TaskArchive
+
+PERCENTILES = (0.5, 0.75, 0.9, 0.99)
+
+_COLUMNS = ("created_at", "completed_at", "status", "category")
+
+
+def _window():
+    """Live and archived tasks as one relation, plus the window predicates over it."""
+    rows = union_all(
+        *(
+            select(*(table.c[name] for name in _COLUMNS))
+            for table in (Task.__table__, TaskArchive.__table__)
+        )
+    ).subquery("all_tasks")
+    since = func.localtimestamp() - bindparam("window", type_=Interval)
+    created = rows.c.created_at >= since
+    completed = and_(rows.c.status == True, rows.c.completed_at >= since)
+    return rows, created, completed
+
+
+def _summary_statement():
+    rows, created, completed = _window()
+    # NULL outside the window, and for rows completed "before" they were
+    # created; percentile_cont and avg skip NULLs.
+    lead_time = case(
+        (
+            and_(completed, rows.c.completed_at >= rows.c.created_at),
+            extract("epoch", rows.c.completed_at - rows.c.created_at),
+        )
+    )
+    return (
+        select(
+            rows.c.category,
+            func.grouping(rows.c.category).label("overall"),
+            func.count().filter(created).label("created"),
+            func.count().filter(completed).label("completed"),
+            func.percentile_cont(array(PERCENTILES))
+            .within_group(lead_time)
+            .label("percentiles"),
+            func.avg(lead_time).label("mean"),
+        )
+        .where(or_(created, completed))
+        # ROLLUP adds the all-categories row to the per-category ones.
+        .group_by(func.rollup(rows.c.category))
+        .execution_options(**{STATEMENT_NAME: "task_analytics.summary"})
+    )
+
+
+def _daily_statement():
+    rows, created, completed = _window()
+    events = union_all(
+        select(
+            cast(rows.c.created_at, Date).label("day"),
+            literal(1).label("created"),
+            literal(0).label("completed"),
+        ).where(created),
+        select(cast(rows.c.completed_at, Date), literal(0), literal(1)).where(completed),
+    ).subquery("events")
+    return (
+        select(events.c.day, func.sum(events.c.created), func.sum(events.c.completed))
+        .group_by(events.c.day)
+        .order_by(events.c.day)
+        .execution_options(**{STATEMENT_NAME: "task_analytics.daily"})
+    )
+
+
+def _lead_times(percentiles: Optional[Sequence[float]], mean: Optional[Any]) -> Optional[Dict[str, float]]:
+    if percentiles is None:
+        return None
+    values = {f"p{round(q * 100)}": float(value) for q, value in zip(PERCENTILES, percentiles)}
+    values["mean"] = float(mean)
+    return values
+
+
+class CRUDTaskAnalytics:
+    async def summary(self, db: AsyncSession, *, days: int) -> Dict[str, Any]:
+        """Throughput and lead times over the last ``days`` days, live and archived tasks.
+
+        Everything is aggregated by Postgres, two statements in all; only
+        one row per category and per day comes back.
+        """
+        params = {"window": timedelta(days=days)}
+        summary = statement_registry.get("task_analytics.summary", (), _summary_statement)
+        daily = statement_registry.get("task_analytics.daily", (), _daily_statement)
+
+        categories: List[Dict[str, Any]] = []
+        overall: Dict[str, Any] = {"created": 0, "completed": 0, "lead_time_seconds": None}
+        for row in await db.execute(summary, params):
+            counts = {
+                "created": row.created,
+                "completed": row.completed,
+                "lead_time_seconds": _lead_times(row.percentiles, row.mean),
+            }
+            if row.overall:
+                overall = counts
+            else:
+                categories.append({"category": row.category.value, **counts})
+
+        today = (await db.scalar(select(func.localtimestamp()))).date()
+        by_day = {row[0]: row for row in await db.execute(daily, params)}
+        series = []
+        for offset in range(days, -1, -1):
+            day = today - timedelta(days=offset)
+            row = by_day.get(day)
+            series.append(
+                {
+                    "date": day,
+                    "created": int(row[1]) if row else 0,
+                    "completed": int(row[2]) if row else 0,
+                }
+            )
+
+        return {
+            "days": days,
+            **overall,
+            "daily": series,
+            "categories": categories,
+        }
+
+
+task_analytics_crud = CRUDTaskAnalytics()
@@ -0,0 +1,88 @@
+from typing import Dict, Optional
+
+from sqlalchemy import bindparam, func, select, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.statements import STATEMENT_NAME, statement_registry
+from app.db.task_stats import LOCK_SQL, STAT_COLUMNS, reconcile_sql
+from app.model.base_model import Task, TaskWrites, User, UserTaskStats
+
+STAT_FIELDS = tuple(getattr(UserTaskStats, name) for name in STAT_COLUMNS)
+COUNT_COLUMNS = (*STAT_COLUMNS, "overdue")
+
+
+def _overdue(*criteria):
+    # Matches ix_tasks_owner_id_due_date_open, so the count reads the index only.
+    return (
+        select(func.count())
+        .select_from(Task)
+        .where(*criteria, Task.status.isnot(True), Task.due_date < func.localtimestamp())
+        .scalar_subquery()
+    )
+
+
+class CRUDTaskStats:
+    async def get(self, db: AsyncSession, *, owner_id: int) -> Dict[str, int]:
+        """One owner's counts: a primary key lookup plus an index count of overdue
+        tasks. Zeros for an owner without tasks."""
+        statement = statement_registry.get(
+            "task_stats.owner",
+            (),
+            lambda: select(*STAT_FIELDS, _overdue(Task.owner_id == bindparam("owner_id")))
+            .where(UserTaskStats.owner_id == bindparam("owner_id"))
+            .execution_options(**{STATEMENT_NAME: "task_stats.owner"}),
+        )
+        row = (await db.execute(statement, {"owner_id": owner_id})).first()
+        return dict(zip(COUNT_COLUMNS, row or (0,) * len(COUNT_COLUMNS)))
+
+    async def get_totals(self, db: AsyncSession) -> Dict[str, int]:
+        """Counts over every owner: one aggregate over a row per user, not over
+        tasks, except overdue, counted from the open tasks index."""
+        statement = statement_registry.get(
+            "task_stats.totals",
+            (),
+            lambda: select(
+                *(func.coalesce(func.sum(field), 0) for field in STAT_FIELDS), _overdue()
+            )
+            .execution_options(**{STATEMENT_NAME: "task_stats.totals"}),
+        )
+        row = (await db.execute(statement)).one()
+        return dict(zip(COUNT_COLUMNS, (int(value) for value in row)))
+
+    async def write_version(self, db: AsyncSession, *, owner_id: Optional[int]) -> int:
+        """Version of an owner's tasks, or of all tasks for None, shared by every worker.
+
+        Moves with each committed write; see ``app.db.task_stats``. An owner
+        lookup is a primary key read, the table-wide one sums the few
+        ``task_writes`` rows, however many users there are.
+        """
+        if owner_id is None:
+            statement = statement_registry.get(
+                "task_stats.writes_total",
+                (),
+                lambda: select(func.coalesce(func.sum(TaskWrites.writes), 0))
+                .execution_options(**{STATEMENT_NAME: "task_stats.writes_total"}),
+            )
+            return int(await db.scalar(statement))
+        statement = statement_registry.get(
+            "task_stats.writes",
+            (),
+            lambda: select(UserTaskStats.writes)
+            .where(UserTaskStats.owner_id == bindparam("owner_id"))
+            .execution_options(**{STATEMENT_NAME: "task_stats.writes"}),
+        )
+        return await db.scalar(statement, {"owner_id": owner_id}) or 0
+
+    async def max_owner_id(self, db: AsyncSession) -> int:
+        return await db.scalar(select(func.max(User.id))) or 0
+
+    async def reconcile(self, db: AsyncSession, *, first: int, last: int) -> int:
+        """Recount owners ``first`` to ``last``; returns how many rows were corrected."""
+        bounds = {"first": first, "last": last}
+        await db.execute(text(LOCK_SQL), bounds)
+        result = await db.execute(text(reconcile_sql()), bounds)
+        await db.commit()
+        return result.rowcount
+
+
+task_stats_crud = CRUDTaskStats()
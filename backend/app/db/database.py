@@ -1,9 +1,18 @@
 import os
+import time
+from contextlib import asynccontextmanager
+from functools import partial
+from typing import AsyncContextManager, AsyncIterator, Callable, List, Optional
 
-from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
-from sqlalchemy.orm import declarative_base, sessionmaker
+from fastapi import Request
+from sqlalchemy import event, exc
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, create_async_engine
+from sqlalchemy.orm import Session, declarative_base, sessionmaker
 
 from app.core.config import settings
+from app.db.pool import InstrumentedAsyncQueuePool
+from app.db.routing import LAST_WRITE_COOKIE, ReplicaRouter, parse_last_write
+from app.db.statements import instrument_compiled_cache, statement_registry
 
 DB_URL = os.environ.get("DB_URL")
 
@@ -14,16 +23,70 @@ else:
     URL_DATABASE = f"postgresql+asyncpg://{settings.DB_USER}:{settings.DB_PASSWORD}@{settings.DB_HOST_LOCAL}:5432/{settings.DB_DATABASE}"
 
 
-engine = create_async_engine(
-    URL_DATABASE,
-    echo=False,
-    future=True,
-    pool_size=20,
+engine_options = settings.engine_options()
+
+
+def _create_engine(url: str) -> AsyncEngine:
+    new_engine = create_async_engine(
+        url,
+        echo=engine_options["echo"],
+        future=True,
+        poolclass=InstrumentedAsyncQueuePool,
+        pool_size=engine_options["pool_size"],
+        max_overflow=engine_options["max_overflow"],
+        pool_timeout=engine_options["pool_timeout"],
+        pool_recycle=engine_options["pool_recycle"],
+        pool_pre_ping=engine_options["pool_pre_ping"],
+        connect_args={
+            "prepared_statement_cache_size": engine_options["prepared_statement_cache_size"],
+        },
+    )
+    new_engine.pool.slow_checkout_ms = engine_options["slow_checkout_ms"]
+    instrument_compiled_cache(new_engine.sync_engine)
+    return new_engine
+
+
+engine = _create_engine(URL_DATABASE)
+
+replica_engines: List[AsyncEngine] = [
+    _create_engine(url) for url in settings.replica_urls()
+]
+
+replica_router = ReplicaRouter(
+    len(replica_engines),
+    sticky_seconds=settings.DB_REPLICA_STICKY_SECONDS,
+    retry_seconds=settings.DB_REPLICA_RETRY_SECONDS,
 )
 
 
+def _reset_pools_after_fork() -> None:
+    # Connections must never be shared across processes; give each forked
+    # worker empty pools while keeping the parent's engines intact.
+    for forked_engine in (engine, *replica_engines):
+        forked_engine.sync_engine.dispose(close=False)
+
+
+os.register_at_fork(after_in_child=_reset_pools_after_fork)
+
+
+class TrackedSession(Session):
+    """Session that keeps its caller on the primary for a while after a commit."""
+
+
+@event.listens_for(TrackedSession, "after_commit")
+def _mark_sticky_after_commit(session: Session) -> None:
+    # Picked up by ReadYourWritesMiddleware, which hands it to the client.
+    request_state = session.info.get("request_state")
+    if request_state is not None:
+        request_state.last_write = time.time()
+
+
 SessionLocal = sessionmaker(
-    bind=engine, class_=AsyncSession, expire_on_commit=False, autocommit=False
+    bind=engine,
+    class_=AsyncSession,
+    sync_session_class=TrackedSession,
+    expire_on_commit=False,
+    autocommit=False,
 )
 
 
@@ -35,6 +98,76 @@ async def create_all_tables():
         await conn.run_sync(Base.metadata.create_all)
 
 
-async def get_db() -> AsyncSession:
+async def get_db(request: Request) -> AsyncSession:
     async with SessionLocal() as session:
+        session.info["request_state"] = request.state
+        yield session
+
+
+async def _open_replica_session(index: int) -> Optional[AsyncSession]:
+    session = SessionLocal(bind=replica_engines[index])
+    try:
+        await session.connection()
+    except (exc.DBAPIError, exc.TimeoutError, OSError) as e:
+        await session.close()
+        replica_router.mark_failed(index, e)
+        return None
+    return session
+
+
+@asynccontextmanager
+async def read_session(request: Request) -> AsyncIterator[AsyncSession]:
+    """Session for read-only work, served by a replica when one is usable."""
+    last_write = parse_last_write(request.cookies.get(LAST_WRITE_COOKIE))
+    session = None
+    index = replica_router.choose(last_write)
+    while index is not None and session is None:
+        session = await _open_replica_session(index)
+        if session is None:
+            index = replica_router.choose(last_write)
+
+    if session is None:
+        session = SessionLocal()
+    session.info["request_state"] = request.state
+    async with session:
         yield session
+
+
+async def get_read_db(request: Request) -> AsyncSession:
+    """Session for read-only endpoints, served by a replica when one is usable."""
+    async with read_session(request) as session:
+        yield session
+
+
+ReadSessions = Callable[[], AsyncContextManager[AsyncSession]]
+
+
+def get_read_sessions(request: Request) -> ReadSessions:
+    """Like ``get_read_db``, but the session is only opened when called.
+
+    For reads that may be answered by another request's query: a caller
+    that waits for it never checks out a connection.
+    """
+    return partial(read_session, request)
+
+
+def pool_status() -> dict:
+    return {"profile": settings.DB_ENGINE_PROFILE, **engine.pool.snapshot()}
+
+
+def replica_status() -> dict:
+    return {
+        **replica_router.snapshot(),
+        "pools": [replica.pool.snapshot() for replica in replica_engines],
+    }
+
+
+def statement_status() -> dict:
+    compiled_cache = engine.sync_engine._compiled_cache
+    return {
+        **statement_registry.snapshot(),
+        "compiled_cache": {
+            "entries": len(compiled_cache) if compiled_cache is not None else 0,
+            "capacity": compiled_cache.capacity if compiled_cache is not None else 0,
+        },
+    }
@@ -0,0 +1,105 @@
+"""Driver-level read path for the hottest task queries.
+
+Runs hand-written SQL as prepared asyncpg statements on the connection the
+session already holds (same pool), and decodes records straight into the
+response dicts, skipping statement compilation, ORM row processing and the
+identity map. ``CRUDTask`` remains the reference implementation; results
+must be identical, see ``tests/test_integration/test_fast_read_equivalence.py``.
+Enabled with ``DB_FAST_READ_PATH``.
+"""
+
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.crud.crud_task import parse_task_filters
+
+# Same keys and order as TaskInDB; the enum is decoded to its value in SQL.
+TASK_COLUMNS = (
+    "title, description, status, due_date, lower(category::text) AS category, "
+    "completed_at, id, delete_request, owner_id, version"
+)
+
+
+async def _driver_connection(db: AsyncSession):
+    conn = await db.connection()
+    raw = await conn.get_raw_connection()
+    return raw.driver_connection
+
+
+def _where(conditions: List[str]) -> str:
+    return f" WHERE {' AND '.join(conditions)}" if conditions else ""
+
+
+async def _page(
+    db: AsyncSession,
+    conditions: List[str],
+    args: List[Any],
+    order: str,
+    skip: int,
+    limit: int,
+) -> Tuple[List[Dict[str, Any]], int]:
+    driver = await _driver_connection(db)
+    where = _where(conditions)
+    count_sql = f"SELECT count(*) FROM tasks{where}"
+    page_sql = (
+        f"SELECT {TASK_COLUMNS} FROM tasks{where} ORDER BY id {order} "
+        f"LIMIT ${len(args) + 1} OFFSET ${len(args) + 2}"
+    )
+    # asyncpg prepares both once per connection and keeps them in its own
+    # statement cache. If the schema changes under one, the error aborts the
+    # session's transaction, so it is raised rather than retried here; the
+    # stale statement is dropped and the next request prepares it again.
+    total = await driver.fetchval(count_sql, *args)
+    records = await driver.fetch(page_sql, *args, limit, skip)
+    return [dict(record) for record in records], total
+
+
+async def owner_page(
+    db: AsyncSession,
+    *,
+    user_id: Optional[int],
+    query: Optional[str],
+    skip: int = 0,
+    limit: int = 100,
+) -> Tuple[List[Dict[str, Any]], int]:
+    """Equivalent of ``CRUDTask.get_multi_with_query``."""
+    conditions, args = [], []
+    if user_id is not None:
+        args.append(user_id)
+        conditions.append(f"owner_id = ${len(args)}")
+    if query:
+        args.append(f"%{query}%")
+        conditions.append(f"title ILIKE ${len(args)}")
+    return await _page(db, conditions, args, "DESC", skip, limit)
+
+
+async def filtered_page(
+    db: AsyncSession,
+    *,
+    user_id: int,
+    admin: bool,
+    task_status: Optional[str] = None,
+    category: Optional[str] = None,
+    due_date: Optional[str] = None,
+    skip: int = 0,
+    limit: int = 8,
+) -> Tuple[List[Dict[str, Any]], int]:
+    """Equivalent of ``CRUDTask.filter_tasks``."""
+    task_status_bool, category_enum, parsed_due_date = parse_task_filters(
+        task_status, category, due_date
+    )
+    conditions, args = [], []
+    if not admin:
+        args.append(int(user_id))
+        conditions.append(f"owner_id = ${len(args)}")
+    if task_status_bool is not None:
+        # Same conditions as the status facets: a NULL status is open.
+        conditions.append("status IS TRUE" if task_status_bool else "status IS NOT TRUE")
+    if category_enum is not None:
+        args.append(category_enum.name)
+        conditions.append(f"category = ${len(args)}")
+    if parsed_due_date is not None:
+        args.append(parsed_due_date)
+        conditions.append(f"due_date <= ${len(args)}")
+    return await _page(db, conditions, args, "ASC", skip, limit)
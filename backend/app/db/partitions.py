@@ -0,0 +1,192 @@
+"""Declarative partitioning of ``tasks``, shared by the migration and the maintenance worker.
+
+``TASK_PARTITIONING`` picks the layout: ``range`` splits tasks into monthly
+partitions on ``created_at``, ``hash`` spreads them over a fixed number of
+partitions on ``owner_id``, ``none`` keeps the plain table.
+"""
+
+import json
+from contextlib import contextmanager
+from datetime import date, datetime
+from typing import Any, Iterator, List, Optional, Sequence, Tuple
+
+from sqlalchemy import event, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+NONE = "none"
+RANGE = "range"
+HASH = "hash"
+
+PARTITION_KEYS = {RANGE: "created_at", HASH: "owner_id"}
+
+# Created after the rows are copied in, which is much faster than
+# maintaining them during the load.
+TASK_INDEXES = (
+    "CREATE INDEX IF NOT EXISTS ix_tasks_id ON tasks (id)",
+    "CREATE INDEX IF NOT EXISTS ix_tasks_title ON tasks (title)",
+    "CREATE INDEX IF NOT EXISTS ix_tasks_owner_id_updated_at ON tasks (owner_id, updated_at)",
+    "CREATE INDEX IF NOT EXISTS ix_tasks_updated_at ON tasks (updated_at)",
+    "CREATE INDEX IF NOT EXISTS ix_tasks_completed_at_done ON tasks (completed_at) WHERE status",
+    "CREATE INDEX IF NOT EXISTS ix_tasks_owner_id_due_date_open ON tasks (owner_id, due_date) "
+    "WHERE status IS NOT TRUE",
+    'CREATE INDEX IF NOT EXISTS ix_tasks_owner_id_title_prefix ON tasks (owner_id, (lower(title) COLLATE "C"), id)',
+    'CREATE INDEX IF NOT EXISTS ix_tasks_title_prefix ON tasks ((lower(title) COLLATE "C"), id)',
+)
+
+_STRATEGIES = {"r": RANGE, "h": HASH}
+
+
+def month_start(value: date) -> date:
+    return date(value.year, value.month, 1)
+
+
+def add_months(month: date, count: int) -> date:
+    index = month.year * 12 + month.month - 1 + count
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def months(first: date, last: date) -> Iterator[date]:
+    month = month_start(first)
+    while month <= last:
+        yield month
+        month = add_months(month, 1)
+
+
+def range_partition_name(month: date) -> str:
+    return f"tasks_{month:%Y_%m}"
+
+
+def range_partition_ddl(month: date) -> str:
+    return (
+        f"CREATE TABLE IF NOT EXISTS {range_partition_name(month)} PARTITION OF tasks "
+        f"FOR VALUES FROM ('{month.isoformat()}') TO ('{add_months(month, 1).isoformat()}')"
+    )
+
+
+def hash_partition_ddl(modulus: int, remainder: int) -> str:
+    return (
+        f"CREATE TABLE IF NOT EXISTS tasks_h{remainder:02d} PARTITION OF tasks "
+        f"FOR VALUES WITH (MODULUS {modulus}, REMAINDER {remainder})"
+    )
+
+
+def create_tasks_ddl(
+    strategy: str,
+    source: str,
+    *,
+    first_month: Optional[date] = None,
+    last_month: Optional[date] = None,
+    modulus: int = 16,
+) -> List[str]:
+    """Statements creating an empty ``tasks`` shaped like ``source`` and its partitions."""
+    if strategy == NONE:
+        return [f"CREATE TABLE tasks (LIKE {source} INCLUDING DEFAULTS)"]
+    statements = [
+        f"CREATE TABLE tasks (LIKE {source} INCLUDING DEFAULTS) "
+        f"PARTITION BY {strategy.upper()} ({PARTITION_KEYS[strategy]})"
+    ]
+    if strategy == RANGE:
+        statements.extend(range_partition_ddl(month) for month in months(first_month, last_month))
+        # Catches rows outside every monthly partition instead of failing the insert.
+        statements.append("CREATE TABLE IF NOT EXISTS tasks_default PARTITION OF tasks DEFAULT")
+    else:
+        statements.extend(hash_partition_ddl(modulus, remainder) for remainder in range(modulus))
+    return statements
+
+
+def replace_tasks_ddl(strategy: str, source: str) -> List[str]:
+    """Statements moving the rows of ``source`` into the new ``tasks`` and dropping it."""
+    key = ("id",) if strategy == NONE else ("id", PARTITION_KEYS[strategy])
+    return [
+        f"INSERT INTO tasks SELECT * FROM {source}",
+        # The id sequence belongs to the old table and would be dropped with it.
+        "ALTER SEQUENCE tasks_id_seq OWNED BY tasks.id",
+        f"DROP TABLE {source}",
+        f"ALTER TABLE tasks ADD CONSTRAINT tasks_pkey PRIMARY KEY ({', '.join(key)})",
+        "ALTER TABLE tasks ADD CONSTRAINT tasks_owner_id_fkey "
+        "FOREIGN KEY (owner_id) REFERENCES users (id)",
+        *TASK_INDEXES,
+    ]
+
+
+async def task_partitioning(db: AsyncSession) -> str:
+    strategy = await db.scalar(
+        text("SELECT partstrat::text FROM pg_partitioned_table WHERE partrelid = to_regclass('tasks')")
+    )
+    return _STRATEGIES.get(strategy, NONE)
+
+
+async def task_partitions(db: AsyncSession) -> List[str]:
+    result = await db.scalars(
+        text(
+            "SELECT c.relname FROM pg_inherits i JOIN pg_class c ON c.oid = i.inhrelid "
+            "WHERE i.inhparent = to_regclass('tasks') ORDER BY c.relname"
+        )
+    )
+    return list(result)
+
+
+async def ensure_task_partitions(db: AsyncSession, months_ahead: int) -> List[str]:
+    """Create the monthly partitions up to ``months_ahead`` from now; returns the new ones."""
+    if await task_partitioning(db) != RANGE:
+        return []
+    existing = set(await task_partitions(db))
+    today: datetime = await db.scalar(text("SELECT localtimestamp"))
+    this_month = month_start(today.date())
+    created = []
+    for month in months(this_month, add_months(this_month, months_ahead)):
+        if range_partition_name(month) not in existing:
+            await db.execute(text(range_partition_ddl(month)))
+            created.append(range_partition_name(month))
+    await db.commit()
+    return created
+
+
+def _relations(plan: Any) -> Iterator[str]:
+    if isinstance(plan, dict):
+        if "Relation Name" in plan:
+            yield plan["Relation Name"]
+        for value in plan.values():
+            yield from _relations(value)
+    elif isinstance(plan, list):
+        for value in plan:
+            yield from _relations(value)
+
+
+async def scanned_partitions(
+    db: AsyncSession, statement: str, parameters: Sequence[Any] = ()
+) -> List[str]:
+    """Partitions of ``tasks`` the planner keeps for ``statement`` run with ``parameters``.
+
+    ``statement`` is driver-level SQL as captured from ``before_cursor_execute``;
+    with the values supplied the plan shows plan-time pruning. Generic plans
+    of prepared statements prune the same partitions at executor start-up.
+    """
+    partitions = set(await task_partitions(db))
+    connection = await db.connection()
+    result = await connection.exec_driver_sql(
+        f"EXPLAIN (FORMAT JSON) {statement}", tuple(parameters)
+    )
+    plan = result.scalar()
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return sorted({name for name in _relations(plan) if name in partitions})
+
+
+@contextmanager
+def recording_statements(
+    db: AsyncSession, kinds: Tuple[str, ...] = ("SELECT",)
+) -> Iterator[List[Tuple[str, Sequence[Any]]]]:
+    """Collect the driver-level statements of ``kinds`` that ``db`` runs inside the block."""
+    recorded: List[Tuple[str, Sequence[Any]]] = []
+    sync_engine = db.bind.sync_engine
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith(kinds):
+            recorded.append((statement, parameters))
+
+    event.listen(sync_engine, "before_cursor_execute", record)
+    try:
+        yield recorded
+    finally:
+        event.remove(sync_engine, "before_cursor_execute", record)
@@ -0,0 +1,100 @@
+"""Plan shapes of captured statements, for catching query-plan regressions.
+
+``explain_shape`` runs a statement recorded by ``recording_statements`` under
+``EXPLAIN (ANALYZE, BUFFERS)`` and reduces the plan to what a change should
+not silently make worse: which relations are read by sequential scans and
+how many shared buffers the statement touches. The plan nodes and the row
+estimate against the actual row count are kept alongside, for review.
+"""
+
+import json
+from dataclasses import asdict, dataclass, field
+from typing import Any, Dict, Iterator, List, Sequence
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+# Statements worth a plan; transaction control and the like are left out.
+PLANNED_STATEMENTS = ("SELECT", "WITH", "INSERT", "UPDATE", "DELETE")
+
+
+@dataclass
+class PlanShape:
+    nodes: List[str] = field(default_factory=list)
+    seq_scans: List[str] = field(default_factory=list)
+    estimated_rows: int = 0
+    actual_rows: int = 0
+    buffers: int = 0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+def _nodes(plan: Dict[str, Any]) -> Iterator[Dict[str, Any]]:
+    yield plan
+    for child in plan.get("Plans", ()):
+        yield from _nodes(child)
+
+
+def _label(node: Dict[str, Any]) -> str:
+    label = node["Node Type"]
+    if "Index Name" in node:
+        label += f" using {node['Index Name']}"
+    if "Relation Name" in node:
+        label += f" on {node['Relation Name']}"
+    return label
+
+
+def plan_shape(explained: Any) -> PlanShape:
+    """Shape of one ``EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON)`` result."""
+    if isinstance(explained, str):
+        explained = json.loads(explained)
+    root = explained[0]["Plan"]
+    nodes = list(_nodes(root))
+    return PlanShape(
+        nodes=[_label(node) for node in nodes],
+        seq_scans=sorted(
+            {node["Relation Name"] for node in nodes if node["Node Type"] == "Seq Scan"}
+        ),
+        estimated_rows=int(root["Plan Rows"]),
+        actual_rows=int(root["Actual Rows"]),
+        # Counts of a node include its children's.
+        buffers=int(root.get("Shared Hit Blocks", 0)) + int(root.get("Shared Read Blocks", 0)),
+    )
+
+
+async def explain_shape(
+    db: AsyncSession, statement: str, parameters: Sequence[Any] = ()
+) -> PlanShape:
+    """Run ``statement`` under EXPLAIN ANALYZE and return its shape.
+
+    The statement really runs, writes included; callers replaying writes
+    do so in a transaction they roll back.
+    """
+    connection = await db.connection()
+    result = await connection.exec_driver_sql(
+        f"EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) {statement}", tuple(parameters)
+    )
+    return plan_shape(result.scalar())
+
+
+def plan_regressions(
+    expected: Dict[str, Any],
+    actual: PlanShape,
+    *,
+    buffer_factor: float = 2.0,
+    buffer_slack: int = 50,
+) -> List[str]:
+    """Ways ``actual`` is worse than the recorded ``expected`` shape.
+
+    New sequential scans always count. Buffers count once they exceed
+    ``buffer_factor`` times the recorded figure plus ``buffer_slack``, which
+    absorbs the small differences between runs on the same data.
+    """
+    problems = []
+    new_scans = sorted(set(actual.seq_scans) - set(expected["seq_scans"]))
+    if new_scans:
+        problems.append(f"sequential scan of {', '.join(new_scans)}")
+    allowed = expected["buffers"] * buffer_factor + buffer_slack
+    if actual.buffers > allowed:
+        problems.append(f"{actual.buffers} shared buffers, recorded {expected['buffers']}")
+    return problems
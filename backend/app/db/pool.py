@@ -0,0 +1,98 @@
+from dataclasses import asdict, dataclass
+from time import perf_counter
+from typing import Any, Dict
+
+from sqlalchemy import exc
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+from logger import log
+
+
+@dataclass
+class PoolStats:
+    checkouts: int = 0
+    checkins: int = 0
+    connects: int = 0
+    timeouts: int = 0
+    slow_checkouts: int = 0
+    overflow_checkouts: int = 0
+    peak_checked_out: int = 0
+    peak_overflow: int = 0
+    wait_total_ms: float = 0.0
+    wait_max_ms: float = 0.0
+
+    def snapshot(self) -> Dict[str, Any]:
+        data = asdict(self)
+        data["wait_avg_ms"] = (
+            round(self.wait_total_ms / self.checkouts, 3) if self.checkouts else 0.0
+        )
+        return data
+
+
+class InstrumentedAsyncQueuePool(AsyncAdaptedQueuePool):
+    """Queue pool that records how long callers wait to get a connection.
+
+    Wait time covers everything ``connect()`` does: queue wait, overflow
+    connection setup and the pre-ping, which is what a request experiences.
+    """
+
+    def __init__(self, *args, slow_checkout_ms: float = 100.0, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.stats = PoolStats()
+        self.slow_checkout_ms = slow_checkout_ms
+
+    def recreate(self):
+        pool = super().recreate()
+        pool.slow_checkout_ms = self.slow_checkout_ms
+        return pool
+
+    def connect(self):
+        start = perf_counter()
+        try:
+            connection = super().connect()
+        except exc.TimeoutError:
+            self.stats.timeouts += 1
+            log.warning(f"Pool checkout timed out: {self.status()}")
+            raise
+        finally:
+            self._record_wait((perf_counter() - start) * 1000)
+        self._record_checkout()
+        return connection
+
+    def _create_connection(self):
+        self.stats.connects += 1
+        return super()._create_connection()
+
+    def _do_return_conn(self, record):
+        self.stats.checkins += 1
+        super()._do_return_conn(record)
+
+    def _record_wait(self, waited_ms: float) -> None:
+        stats = self.stats
+        stats.wait_total_ms += waited_ms
+        stats.wait_max_ms = max(stats.wait_max_ms, waited_ms)
+        if waited_ms >= self.slow_checkout_ms:
+            stats.slow_checkouts += 1
+            log.warning(f"Slow pool checkout: waited {waited_ms:.1f}ms, {self.status()}")
+
+    def _record_checkout(self) -> None:
+        stats = self.stats
+        stats.checkouts += 1
+        stats.peak_checked_out = max(stats.peak_checked_out, self.checkedout())
+        overflow = self.overflow()
+        if overflow > 0:
+            stats.overflow_checkouts += 1
+            if overflow > stats.peak_overflow:
+                stats.peak_overflow = overflow
+                log.info(f"Pool overflow reached new peak: {self.status()}")
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "size": self.size(),
+            "checked_out": self.checkedout(),
+            "checked_in": self.checkedin(),
+            "overflow": self.overflow(),
+            "max_overflow": self._max_overflow,
+            "timeout": self.timeout(),
+            **self.stats.snapshot(),
+        }
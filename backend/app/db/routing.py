@@ -0,0 +1,83 @@
+from itertools import count
+from time import monotonic, time
+from typing import List, Optional
+
+from logger import log
+
+# Set on responses to requests that committed a write, read by get_read_db.
+LAST_WRITE_COOKIE = "last_write"
+
+
+def parse_last_write(value: Optional[str]) -> Optional[float]:
+    if not value:
+        return None
+    try:
+        return float(value)
+    except ValueError:
+        return None
+
+
+class ReplicaRouter:
+    """Chooses which replica serves a read.
+
+    Replicas are used round-robin. A replica that fails to hand out a
+    connection is skipped for ``retry_seconds``; when every replica is
+    skipped the caller falls back to the primary. Callers that committed a
+    write within ``sticky_seconds`` are kept on the primary so they read
+    their own writes despite replication lag. When that write happened is
+    carried by the client (``LAST_WRITE_COOKIE``), so it holds whichever
+    worker served the write.
+    """
+
+    def __init__(
+        self,
+        replica_count: int,
+        *,
+        sticky_seconds: float = 5.0,
+        retry_seconds: float = 30.0,
+    ):
+        self.replica_count = replica_count
+        self.sticky_seconds = sticky_seconds
+        self.retry_seconds = retry_seconds
+        self._next = count()
+        self._unhealthy_until: List[float] = [0.0] * replica_count
+        self.stats = {"replica_reads": 0, "primary_reads": 0, "sticky_reads": 0, "failures": 0}
+
+    def is_sticky(self, last_write: Optional[float]) -> bool:
+        # Wall clock time, since the write may have been served by another
+        # process or host.
+        return last_write is not None and time() - last_write < self.sticky_seconds
+
+    def choose(self, last_write: Optional[float] = None) -> Optional[int]:
+        """Return a replica index, or ``None`` when the primary should serve."""
+        if not self.replica_count:
+            self.stats["primary_reads"] += 1
+            return None
+        if self.is_sticky(last_write):
+            self.stats["sticky_reads"] += 1
+            return None
+        now = monotonic()
+        for _ in range(self.replica_count):
+            index = next(self._next) % self.replica_count
+            if self._unhealthy_until[index] <= now:
+                self.stats["replica_reads"] += 1
+                return index
+        self.stats["primary_reads"] += 1
+        return None
+
+    def mark_failed(self, index: int, error: Exception) -> None:
+        self.stats["failures"] += 1
+        self._unhealthy_until[index] = monotonic() + self.retry_seconds
+        log.warning(
+            f"Read replica {index} unavailable, retrying in {self.retry_seconds}s: {error}"
+        )
+
+    def snapshot(self) -> dict:
+        now = monotonic()
+        return {
+            "replicas": [
+                {"index": index, "healthy": until <= now}
+                for index, until in enumerate(self._unhealthy_until)
+            ],
+            **self.stats,
+        }
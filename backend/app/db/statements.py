@@ -0,0 +1,108 @@
+from collections import OrderedDict, defaultdict
+from dataclasses import asdict, dataclass
+from typing import Any, Callable, Dict, Hashable, Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.engine.interfaces import CacheStats
+
+from logger import log
+
+# Execution option naming a registered shape, so compiled-cache outcomes can
+# be reported per query.
+STATEMENT_NAME = "statement_name"
+
+
+@dataclass
+class ShapeStats:
+    built: int = 0
+    reused: int = 0
+    compiled_hits: int = 0
+    compiled_misses: int = 0
+
+
+class StatementRegistry:
+    """Builds each statement shape once and hands the same object back afterwards.
+
+    A shape is a query name plus a key describing which filters are active and
+    which columns are projected; the filter values themselves are bound
+    parameters supplied at execution time. Reusing the statement object skips
+    construction and cache-key generation (the key is memoized on the object),
+    and keeps the SQL text stable so the compiled cache and asyncpg's prepared
+    statement cache hit on every call.
+    """
+
+    def __init__(self, max_shapes: int = 512):
+        self.max_shapes = max_shapes
+        self._shapes: "OrderedDict[Hashable, Any]" = OrderedDict()
+        self._stats: Dict[str, ShapeStats] = defaultdict(ShapeStats)
+        self.evicted = 0
+
+    def get(self, name: str, key: Hashable, build: Callable[[], Any]) -> Any:
+        shape = (name, key)
+        statement = self._shapes.get(shape)
+        if statement is not None:
+            self._shapes.move_to_end(shape)
+            self._stats[name].reused += 1
+            return statement
+
+        statement = self._shapes[shape] = build()
+        self._stats[name].built += 1
+        # Keys come partly from user input (sparse fieldsets); the least
+        # recently used shapes make room, so hot ones stay cached.
+        while len(self._shapes) > self.max_shapes:
+            self._shapes.popitem(last=False)
+            self.evicted += 1
+        return statement
+
+    def record_compiled(self, name: str, hit: bool) -> None:
+        stats = self._stats[name]
+        if hit:
+            stats.compiled_hits += 1
+        else:
+            stats.compiled_misses += 1
+
+    def clear(self) -> None:
+        self._shapes.clear()
+        self._stats.clear()
+        self.evicted = 0
+
+    def snapshot(self) -> Dict[str, Any]:
+        queries = {}
+        for name, stats in sorted(self._stats.items()):
+            data = asdict(stats)
+            calls = stats.built + stats.reused
+            compiled = stats.compiled_hits + stats.compiled_misses
+            data["reuse_rate"] = round(stats.reused / calls, 4) if calls else 0.0
+            data["compiled_hit_rate"] = (
+                round(stats.compiled_hits / compiled, 4) if compiled else 0.0
+            )
+            queries[name] = data
+        return {
+            "shapes": len(self._shapes),
+            "max_shapes": self.max_shapes,
+            "evicted": self.evicted,
+            "queries": queries,
+        }
+
+
+statement_registry = StatementRegistry()
+
+
+def instrument_compiled_cache(
+    sync_engine: Engine, registry: Optional[StatementRegistry] = None
+) -> None:
+    """Count compiled-cache hits and misses for registered statements on ``sync_engine``."""
+    registry = registry or statement_registry
+
+    @event.listens_for(sync_engine, "before_cursor_execute")
+    def _record(conn, cursor, statement, parameters, context, executemany):
+        if context is None or context.compiled is None:
+            return
+        name = context.execution_options.get(STATEMENT_NAME)
+        if name is None:
+            return
+        hit = context.cache_hit == CacheStats.CACHE_HIT
+        registry.record_compiled(name, hit)
+        if not hit:
+            log.debug(f"Compiled cache miss for statement {name}")
@@ -0,0 +1,173 @@
+"""Per-owner task counts in ``user_task_stats``, kept current by triggers.
+
+Statement-level triggers on ``tasks`` and ``tasks_archive`` fold the
+statement's transition tables into one delta per owner and add it to the
+owner's row, in the writing transaction. Every write path is covered,
+including bulk statements and the archiver, and a statement touching
+thousands of tasks costs one upsert per owner rather than one per row.
+
+The same upsert counts the statement in the row's ``writes``, the version
+every worker keys its cached reads of the owner's tasks by. Each statement
+also counts itself in one of the ``WRITE_SLOTS`` rows of ``task_writes``,
+picked by the writer's backend pid so concurrent writers rarely wait on
+the same row; their sum is the version of the whole table, read without
+touching a row per user. Both move with each commit that changed a task,
+whatever order the writers committed in.
+
+Overdue tasks are not counted here: a task becomes overdue when its due
+date passes, without any write for a trigger to see. ``CRUDTaskStats``
+counts them at read time instead, from the partial index on open tasks'
+``(owner_id, due_date)``.
+"""
+
+from typing import Dict, List
+
+# Column of user_task_stats -> which tasks it counts.
+TASK_METRICS: Dict[str, str] = {
+    "total": "true",
+    "done": "status",
+    "low": "category = 'LOW'",
+    "medium": "category = 'MEDIUM'",
+    "high": "category = 'HIGH'",
+    "delete_requested": "delete_request",
+}
+ARCHIVE_METRICS: Dict[str, str] = {"archived": "true"}
+
+STAT_COLUMNS = (*TASK_METRICS, *ARCHIVE_METRICS)
+
+# Rows of task_writes; changing it takes a re-run of create_stats_ddl().
+WRITE_SLOTS = 16
+
+_BUMP_TABLE = (
+    "INSERT INTO task_writes AS w (slot, writes) "
+    f"SELECT pg_backend_pid() % {WRITE_SLOTS}, 1{{where}} "
+    "ON CONFLICT (slot) DO UPDATE SET writes = w.writes + 1;"
+)
+
+_TRIGGER_EVENTS = {
+    "tasks": (
+        ("insert", "INSERT", "NEW TABLE AS new_rows"),
+        ("update", "UPDATE", "OLD TABLE AS old_rows NEW TABLE AS new_rows"),
+        ("delete", "DELETE", "OLD TABLE AS old_rows"),
+    ),
+    "tasks_archive": (
+        ("insert", "INSERT", "NEW TABLE AS new_rows"),
+        ("delete", "DELETE", "OLD TABLE AS old_rows"),
+    ),
+}
+
+_NEW_ROWS = "SELECT *, 1 AS sign FROM new_rows"
+_OLD_ROWS = "SELECT *, -1 AS sign FROM old_rows"
+
+
+def _apply_delta(source: str, metrics: Dict[str, str]) -> str:
+    columns = ", ".join(metrics)
+    deltas = ", ".join(
+        f"sum(CASE WHEN {condition} THEN sign ELSE 0 END) AS {name}"
+        for name, condition in metrics.items()
+    )
+    updates = ", ".join(f"{name} = s.{name} + excluded.{name}" for name in metrics)
+    # The table-wide slot is taken before any owner row, and owners are
+    # locked in id order, so concurrent multi-owner statements cannot
+    # deadlock. An update that leaves every count alone (a title edit)
+    # still writes the rows, to count the write.
+    bump = _BUMP_TABLE.format(where=f" WHERE EXISTS ({source})")
+    return (
+        f"{bump} "
+        f"INSERT INTO user_task_stats AS s (owner_id, {columns}, writes) "
+        f"SELECT owner_id, {deltas}, 1 FROM ({source}) changes "
+        f"WHERE owner_id IS NOT NULL GROUP BY owner_id ORDER BY owner_id "
+        f"ON CONFLICT (owner_id) DO UPDATE SET {updates}, writes = s.writes + 1;"
+    )
+
+
+def _function_ddl(table: str, metrics: Dict[str, str]) -> str:
+    branches = [
+        f"IF TG_OP = 'INSERT' THEN {_apply_delta(_NEW_ROWS, metrics)}",
+        f"ELSIF TG_OP = 'DELETE' THEN {_apply_delta(_OLD_ROWS, metrics)}",
+    ]
+    if table == "tasks":
+        branches.append(
+            f"ELSE {_apply_delta(f'{_NEW_ROWS} UNION ALL {_OLD_ROWS}', metrics)}"
+        )
+    return (
+        f"CREATE OR REPLACE FUNCTION {table}_stats_delta() RETURNS trigger "
+        f"LANGUAGE plpgsql AS $$ BEGIN {' '.join(branches)} END IF; RETURN NULL; END $$"
+    )
+
+
+def create_stats_ddl() -> List[str]:
+    """Functions and triggers maintaining ``user_task_stats``; safe to re-run."""
+    statements = [
+        _function_ddl("tasks", TASK_METRICS),
+        _function_ddl("tasks_archive", ARCHIVE_METRICS),
+    ]
+    for table, events in _TRIGGER_EVENTS.items():
+        statements.extend(
+            f"CREATE OR REPLACE TRIGGER {table}_stats_{suffix} AFTER {event} ON {table} "
+            f"REFERENCING {transitions} FOR EACH STATEMENT "
+            f"EXECUTE FUNCTION {table}_stats_delta()"
+            for suffix, event, transitions in events
+        )
+    # TRUNCATE has no transition table; the counts it clears are known.
+    statements.append(
+        "CREATE OR REPLACE FUNCTION tasks_stats_truncate() RETURNS trigger "
+        "LANGUAGE plpgsql AS $$ BEGIN UPDATE user_task_stats SET "
+        + ", ".join(f"{name} = 0" for name in TASK_METRICS)
+        + f", writes = writes + 1; {_BUMP_TABLE.format(where='')} RETURN NULL; END $$"
+    )
+    statements.append(
+        "CREATE OR REPLACE TRIGGER tasks_stats_truncate AFTER TRUNCATE ON tasks "
+        "FOR EACH STATEMENT EXECUTE FUNCTION tasks_stats_truncate()"
+    )
+    return statements
+
+
+def drop_stats_ddl() -> List[str]:
+    statements = [
+        f"DROP TRIGGER IF EXISTS {table}_stats_{suffix} ON {table}"
+        for table, events in _TRIGGER_EVENTS.items()
+        for suffix, _, _ in events
+    ]
+    statements.append("DROP TRIGGER IF EXISTS tasks_stats_truncate ON tasks")
+    statements.extend(
+        f"DROP FUNCTION IF EXISTS {name}()"
+        for name in ("tasks_stats_delta", "tasks_archive_stats_delta", "tasks_stats_truncate")
+    )
+    return statements
+
+
+LOCK_SQL = (
+    "SELECT owner_id FROM user_task_stats WHERE owner_id BETWEEN :first AND :last "
+    "ORDER BY owner_id FOR UPDATE"
+)
+
+
+def reconcile_sql() -> str:
+    """Recount owners ``:first`` to ``:last`` and overwrite the rows that drifted.
+
+    Run after ``LOCK_SQL`` in the same transaction: holding the rows keeps
+    trigger deltas out until the recount, which takes a fresh snapshot once
+    the lock is granted, has seen every committed write. The row count of
+    the result is the number of owners that were corrected or added.
+    """
+    counts = ", ".join(
+        f"count(*) FILTER (WHERE {condition}) AS {name}"
+        for name, condition in TASK_METRICS.items()
+    )
+    values = ", ".join(f"coalesce(t.{name}, 0)" for name in TASK_METRICS)
+    columns = ", ".join(STAT_COLUMNS)
+    updates = ", ".join(f"{name} = excluded.{name}" for name in STAT_COLUMNS)
+    current = ", ".join(f"s.{name}" for name in STAT_COLUMNS)
+    recounted = ", ".join(f"excluded.{name}" for name in STAT_COLUMNS)
+    return (
+        f"INSERT INTO user_task_stats AS s (owner_id, {columns}) "
+        f"SELECT u.id, {values}, coalesce(a.archived, 0) FROM users u "
+        f"LEFT JOIN (SELECT owner_id, {counts} FROM tasks "
+        f"WHERE owner_id BETWEEN :first AND :last GROUP BY owner_id) t ON t.owner_id = u.id "
+        f"LEFT JOIN (SELECT owner_id, count(*) AS archived FROM tasks_archive "
+        f"WHERE owner_id BETWEEN :first AND :last GROUP BY owner_id) a ON a.owner_id = u.id "
+        f"WHERE u.id BETWEEN :first AND :last ORDER BY u.id "
+        f"ON CONFLICT (owner_id) DO UPDATE SET {updates} "
+        f"WHERE ({current}) IS DISTINCT FROM ({recounted})"
+    )
@@ -1,19 +1,25 @@
 from enum import Enum as PyEnum
 
 from sqlalchemy import (
+    DDL,
     TIMESTAMP,
+    BigInteger,
     Boolean,
     Column,
     DateTime,
     Enum,
     ForeignKey,
+    Index,
     Integer,
+    SmallInteger,
     String,
+    event,
     func,
 )
 from sqlalchemy.orm import relationship
 
 from app.db.database import Base
+from app.db.task_stats import create_stats_ddl
 
 
 class Category(PyEnum):
@@ -54,5 +60,138 @@ class Task(Base):
     created_at = Column(TIMESTAMP, default=func.now(), nullable=False)
     category = Column(Enum(Category), default=Category.LOW, nullable=False)
     completed_at = Column(TIMESTAMP, nullable=True)
+    updated_at = Column(
+        DateTime(timezone=True),
+        server_default=func.now(),
+        onupdate=func.now(),
+        nullable=False,
+    )
+    # Bumped by every write; exposed as the task's ETag.
+    version = Column(Integer, default=1, server_default="1", nullable=False)
 
     owner = relationship("User", back_populates="tasks")
+
+    __mapper_args__ = {"version_id_col": version}
+    __table_args__ = (
+        Index("ix_tasks_owner_id_updated_at", "owner_id", "updated_at"),
+        Index("ix_tasks_updated_at", "updated_at"),
+        # Finds archiving candidates without scanning open tasks.
+        Index("ix_tasks_completed_at_done", completed_at, postgresql_where=status == True),
+        # Counts an owner's overdue tasks for /task/stats.
+        Index(
+            "ix_tasks_owner_id_due_date_open",
+            owner_id,
+            due_date,
+            postgresql_where=status.isnot(True),
+        ),
+        # Title prefix ranges in byte order (like text_pattern_ops), read in
+        # index order by /task/suggest.
+        Index(
+            "ix_tasks_owner_id_title_prefix", owner_id, func.lower(title).collate("C"), id
+        ).ddl_if(dialect="postgresql"),
+        Index("ix_tasks_title_prefix", func.lower(title).collate("C"), id).ddl_if(
+            dialect="postgresql"
+        ),
+    )
+
+
+class TaskArchive(Base):
+    """Completed tasks moved out of ``tasks`` by the archiver, same columns
+    plus when they were moved. Only read when a request asks for them."""
+
+    __tablename__ = "tasks_archive"
+
+    id = Column(Integer, primary_key=True)
+    title = Column(String)
+    description = Column(String)
+    status = Column(Boolean)
+    due_date = Column(DateTime)
+    delete_request = Column(Boolean)
+    reminder_sent = Column(Boolean)
+    owner_id = Column(Integer, ForeignKey("users.id"))
+    created_at = Column(TIMESTAMP, nullable=False)
+    category = Column(Enum(Category), nullable=False)
+    completed_at = Column(TIMESTAMP, nullable=True)
+    updated_at = Column(DateTime(timezone=True), nullable=False)
+    version = Column(Integer, nullable=False)
+    archived_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+
+    __table_args__ = (Index("ix_tasks_archive_owner_id_id", "owner_id", "id"),)
+
+
+class TaskTombstone(Base):
+    """Records that a task left an owner's list: hard deleted, moved to
+    another owner, or archived. Lets /task/changes report deletions."""
+
+    __tablename__ = "task_tombstones"
+
+    task_id = Column(Integer, primary_key=True)
+    owner_id = Column(Integer, primary_key=True)
+    deleted_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+
+    __table_args__ = (
+        Index("ix_task_tombstones_owner_id_deleted_at", "owner_id", "deleted_at"),
+        Index("ix_task_tombstones_deleted_at", "deleted_at"),
+    )
+
+
+class UserTaskStats(Base):
+    """Task counts of one owner, maintained by triggers on ``tasks`` and
+    ``tasks_archive`` (see ``app.db.task_stats``). Counts cover live tasks;
+    ``archived`` counts the owner's archived ones. Overdue tasks are counted
+    when read, since due dates pass without a write."""
+
+    __tablename__ = "user_task_stats"
+
+    owner_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+    total = Column(Integer, default=0, server_default="0", nullable=False)
+    done = Column(Integer, default=0, server_default="0", nullable=False)
+    low = Column(Integer, default=0, server_default="0", nullable=False)
+    medium = Column(Integer, default=0, server_default="0", nullable=False)
+    high = Column(Integer, default=0, server_default="0", nullable=False)
+    delete_requested = Column(Integer, default=0, server_default="0", nullable=False)
+    archived = Column(Integer, default=0, server_default="0", nullable=False)
+    # Statements that changed the owner's tasks; the version of their cached reads.
+    writes = Column(BigInteger, default=0, server_default="0", nullable=False)
+
+
+# The triggers need tasks, tasks_archive and user_task_stats, so they are
+# installed once the whole schema exists.
+for statement in create_stats_ddl():
+    event.listen(
+        Base.metadata, "after_create", DDL(statement).execute_if(dialect="postgresql")
+    )
+
+
+class TaskWrites(Base):
+    """Table-wide task write counter, striped over ``WRITE_SLOTS`` rows by the
+    stats triggers; the sum of ``writes`` is the version of all tasks."""
+
+    __tablename__ = "task_writes"
+
+    slot = Column(SmallInteger, primary_key=True, autoincrement=False)
+    writes = Column(BigInteger, nullable=False, default=0)
+
+
+class RevokedToken(Base):
+    """Denylist entry: a single token (``jti:<jti>``) or every token of a user
+    issued before ``revoked_at`` (``user:<id>``). Rows are useless once
+    ``expires_at`` passes, since the tokens they cover have expired too."""
+
+    __tablename__ = "revoked_tokens"
+
+    key = Column(String, primary_key=True)
+    user_id = Column(Integer, index=True)
+    revoked_at = Column(DateTime(timezone=True), nullable=False, index=True)
+    expires_at = Column(DateTime(timezone=True), nullable=False, index=True)
+
+
+class ClusterSetting(Base):
+    """A value every node must agree on, set by whichever node starts first
+    (e.g. ``bcrypt_rounds``, the calibrated password hashing cost)."""
+
+    __tablename__ = "cluster_settings"
+
+    name = Column(String, primary_key=True)
+    value = Column(Integer, nullable=False)
+    updated_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now())
@@ -1,5 +1,5 @@
-from datetime import datetime
-from typing import List, Optional
+from datetime import date, datetime
+from typing import Dict, List, Optional
 
 from pydantic import BaseModel
 
@@ -28,6 +28,17 @@ class TaskInDB(TaskBase):
     delete_request: Optional[bool]
     owner_id: Optional[int]
     status: Optional[bool]
+    version: Optional[int] = None
+
+
+TASK_FIELDS = tuple(TaskInDB.model_fields)
+
+
+class TaskFacets(BaseModel):
+    # Each facet is counted with every other filter applied but not its own.
+    status: Dict[str, int]
+    category: Dict[str, int]
+    overdue: int
 
 
 class TaskList(BaseModel):
@@ -35,6 +46,49 @@ class TaskList(BaseModel):
     total: int
     skip: int
     limit: int
+    facets: Optional[TaskFacets] = None
+
+
+class TaskChanges(BaseModel):
+    changed: List[TaskInDB]
+    deleted: List[int]
+    next: str
+    has_more: bool
+
+
+class TaskStats(BaseModel):
+    total: int
+    done: int
+    open: int
+    low: int
+    medium: int
+    high: int
+    overdue: int
+    delete_requested: int
+    archived: int
+
+
+class DailyTaskCounts(BaseModel):
+    date: date
+    created: int
+    completed: int
+
+
+class CategoryAnalytics(BaseModel):
+    category: Category
+    created: int
+    completed: int
+    lead_time_seconds: Optional[Dict[str, float]]
+
+
+class TaskAnalytics(BaseModel):
+    days: int
+    created: int
+    completed: int
+    # p50/p75/p90/p99 and mean of completed_at - created_at; None without completions.
+    lead_time_seconds: Optional[Dict[str, float]]
+    daily: List[DailyTaskCounts]
+    categories: List[CategoryAnalytics]
 
 
 class Message(BaseModel):
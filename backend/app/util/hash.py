@@ -1,9 +1,82 @@
+import time
+from typing import Optional, Tuple
+
 import bcrypt
 
+# Cost factor for new hashes; set once at startup by calibrate_rounds().
+DEFAULT_ROUNDS = 12
+_rounds = DEFAULT_ROUNDS
+_calibrated = False
+# The cluster-wide cost stored hashes are moved to, once it is known.
+_target: Optional[int] = None
+
+
+def current_rounds() -> int:
+    return _rounds
+
+
+def is_calibrated() -> bool:
+    return _calibrated
+
+
+def set_rounds(rounds: int) -> None:
+    global _rounds, _calibrated
+    _rounds = rounds
+    _calibrated = True
+
+
+def set_target_rounds(rounds: int) -> None:
+    """Adopt the cost every node agreed on, for new hashes and for rehashing."""
+    global _target
+    set_rounds(rounds)
+    _target = rounds
+
+
+def measure_hash_ms(rounds: int, samples: int = 3) -> float:
+    """Fastest of ``samples`` hashes at ``rounds``, in milliseconds."""
+    best = float("inf")
+    for _ in range(samples):
+        start = time.perf_counter()
+        bcrypt.hashpw(b"calibration", bcrypt.gensalt(rounds=rounds))
+        best = min(best, (time.perf_counter() - start) * 1000)
+    return best
+
+
+def calibrate_rounds(
+    target_ms: float, min_rounds: int = 10, max_rounds: int = 14, measure=measure_hash_ms
+) -> Tuple[int, float]:
+    """Pick the highest cost whose hash time stays within ``target_ms``.
+
+    Each extra round doubles the work, so only ``min_rounds`` is measured and
+    the rest is extrapolated; ``min_rounds`` is used even if it is over budget.
+    Returns the cost and its estimated hash time in milliseconds.
+    """
+    elapsed = measure(min_rounds)
+    rounds = min_rounds
+    while rounds < max_rounds and elapsed * 2 <= target_ms:
+        elapsed *= 2
+        rounds += 1
+    set_rounds(rounds)
+    return rounds, elapsed
+
+
+def hash_rounds(hashed_password: str) -> Optional[int]:
+    # Modular crypt format: $2b$<cost>$<salt+hash>
+    try:
+        return int(hashed_password.split("$")[2])
+    except (IndexError, ValueError):
+        return None
+
+
+def needs_rehash(hashed_password: str) -> bool:
+    # Up or down, but only toward the shared target: a cost measured on one
+    # node alone would have nodes rewriting the same hashes back and forth.
+    return _target is not None and hash_rounds(hashed_password) != _target
+
 
 def async_hash_password(password: str) -> str:
     pwd_bytes = password.encode("utf-8")
-    salt = bcrypt.gensalt()
+    salt = bcrypt.gensalt(rounds=_rounds)
     hashed_password = bcrypt.hashpw(password=pwd_bytes, salt=salt)
     return hashed_password.decode("utf-8")
 
@@ -0,0 +1,269 @@
+"""Bulk-generate synthetic users and tasks for benchmarking.
+
+Going through ``create_user`` and ``create_task`` costs a bcrypt hash and a
+verification email per user and one round trip per task, which is far too
+slow to build a realistic dataset. This tool hashes the shared password once
+and streams generated rows into Postgres with ``COPY``.
+
+    python -m app.util.seed --users 10000 --tasks 2000000 --seed 42
+
+Runs are deterministic for a given ``--seed`` and ``--anchor``.
+"""
+
+import argparse
+import asyncio
+import random
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from itertools import accumulate
+from typing import Iterator, List, Optional, Sequence, Tuple
+
+from app.db.database import engine
+from app.model.base_model import Category
+from app.util.hash import async_hash_password
+from logger import log
+
+USER_COLUMNS = (
+    "id",
+    "username",
+    "email",
+    "password",
+    "role",
+    "first_name",
+    "last_name",
+    "contact_number",
+    "gender",
+    "is_active",
+    "created_at",
+)
+
+TASK_COLUMNS = (
+    "title",
+    "description",
+    "status",
+    "due_date",
+    "delete_request",
+    "reminder_sent",
+    "owner_id",
+    "created_at",
+    "category",
+    "completed_at",
+    "updated_at",
+)
+
+FIRST_NAMES = ("Ada", "Alan", "Grace", "Linus", "Barbara", "Ken", "Margaret", "Dennis")
+LAST_NAMES = ("Lovelace", "Turing", "Hopper", "Torvalds", "Liskov", "Thompson", "Hamilton", "Ritchie")
+VERBS = ("Write", "Review", "Fix", "Plan", "Call", "Refactor", "Deploy", "Email", "Update", "Test")
+NOUNS = ("report", "invoice", "meeting notes", "backlog", "release", "budget", "slides", "roadmap", "contract", "dashboard")
+WORDS = ("please", "check", "the", "latest", "draft", "before", "friday", "and", "share", "feedback", "with", "team")
+
+
+@dataclass
+class SeedOptions:
+    users: int = 1000
+    tasks: int = 100000
+    seed: int = 42
+    anchor: datetime = datetime(2024, 6, 1)
+    password: str = "password"
+    password_hash: Optional[str] = None
+    prefix: str = "seed"
+    admin_ratio: float = 0.01
+    owner_skew: float = 1.1
+    category_weights: Tuple[float, ...] = (0.6, 0.3, 0.1)
+    completed_ratio: float = 0.4
+    delete_request_ratio: float = 0.02
+    no_due_date_ratio: float = 0.1
+    due_past_days: int = 60
+    due_future_days: int = 30
+    history_days: int = 365
+    description_words: int = 20
+    batch_size: int = 50000
+    categories: List[str] = field(default_factory=lambda: [c.name for c in Category])
+
+
+def owner_cum_weights(count: int, skew: float) -> List[float]:
+    """Zipf-like cumulative weights; ``skew=0`` gives a uniform distribution."""
+    return list(accumulate(1.0 / (rank ** skew) for rank in range(1, count + 1)))
+
+
+def generate_users(
+    options: SeedOptions, first_id: int, password_hash: str
+) -> Iterator[tuple]:
+    rng = random.Random(f"{options.seed}:users")
+    for offset in range(options.users):
+        user_id = first_id + offset
+        username = f"{options.prefix}_user_{user_id}"
+        created_at = options.anchor - timedelta(
+            seconds=rng.randint(0, options.history_days * 86400)
+        )
+        yield (
+            user_id,
+            username,
+            f"{username}@example.com",
+            password_hash,
+            "admin" if rng.random() < options.admin_ratio else "user",
+            rng.choice(FIRST_NAMES),
+            rng.choice(LAST_NAMES),
+            f"01{rng.randint(100000000, 999999999)}",
+            rng.choice(("male", "female")),
+            True,
+            created_at,
+        )
+
+
+def generate_task_batches(
+    options: SeedOptions, owner_ids: Sequence[int]
+) -> Iterator[List[tuple]]:
+    rng = random.Random(f"{options.seed}:tasks")
+    cum_weights = owner_cum_weights(len(owner_ids), options.owner_skew)
+    category_cum_weights = list(accumulate(options.category_weights))
+    history_seconds = options.history_days * 86400
+    due_span_seconds = (options.due_past_days + options.due_future_days) * 86400
+
+    remaining = options.tasks
+    while remaining > 0:
+        size = min(options.batch_size, remaining)
+        owners = rng.choices(owner_ids, cum_weights=cum_weights, k=size)
+        categories = rng.choices(
+            options.categories, cum_weights=category_cum_weights, k=size
+        )
+        batch = []
+        for owner_id, category in zip(owners, categories):
+            created_at = options.anchor - timedelta(
+                seconds=rng.randint(0, history_seconds)
+            )
+            due_date = None
+            if rng.random() >= options.no_due_date_ratio:
+                due_date = (
+                    options.anchor
+                    - timedelta(days=options.due_past_days)
+                    + timedelta(seconds=rng.randint(0, due_span_seconds))
+                )
+            completed = rng.random() < options.completed_ratio
+            completed_at = None
+            if completed:
+                completed_at = created_at + timedelta(
+                    seconds=rng.randint(0, int((options.anchor - created_at).total_seconds()))
+                )
+            batch.append(
+                (
+                    f"{rng.choice(VERBS)} {rng.choice(NOUNS)}",
+                    " ".join(
+                        rng.choices(WORDS, k=rng.randint(1, 2 * options.description_words))
+                    ),
+                    completed,
+                    due_date,
+                    rng.random() < options.delete_request_ratio,
+                    False,
+                    owner_id,
+                    created_at,
+                    category,
+                    completed_at,
+                    (completed_at or created_at).replace(tzinfo=timezone.utc),
+                )
+            )
+        remaining -= size
+        yield batch
+
+
+async def copy_dataset(driver, options: SeedOptions, truncate: bool = False) -> None:
+    """COPY a generated dataset over an asyncpg connection in one transaction."""
+    password_hash = options.password_hash or async_hash_password(options.password)
+
+    async with driver.transaction():
+        if truncate:
+            log.info("Truncating tasks and users")
+            await driver.execute("TRUNCATE tasks, users RESTART IDENTITY CASCADE")
+
+        first_id = await driver.fetchval("SELECT COALESCE(MAX(id), 0) + 1 FROM users")
+        users = list(generate_users(options, first_id, password_hash))
+        await driver.copy_records_to_table(
+            "users", records=users, columns=USER_COLUMNS
+        )
+        await driver.execute(
+            "SELECT setval(pg_get_serial_sequence('users', 'id'), (SELECT MAX(id) FROM users))"
+        )
+        log.info(f"Seeded {len(users)} users starting at id {first_id}")
+
+        owner_ids = [user[0] for user in users]
+        copied = 0
+        for batch in generate_task_batches(options, owner_ids):
+            await driver.copy_records_to_table(
+                "tasks", records=batch, columns=TASK_COLUMNS
+            )
+            copied += len(batch)
+            log.info(f"Seeded {copied}/{options.tasks} tasks")
+
+    await driver.execute("ANALYZE users")
+    await driver.execute("ANALYZE tasks")
+
+
+async def seed(options: SeedOptions, truncate: bool = False) -> None:
+    async with engine.connect() as conn:
+        raw = await conn.get_raw_connection()
+        await copy_dataset(raw.driver_connection, options, truncate=truncate)
+
+
+def parse_args(argv: Optional[Sequence[str]] = None) -> Tuple[SeedOptions, bool]:
+    defaults = SeedOptions()
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--users", type=int, default=defaults.users)
+    parser.add_argument("--tasks", type=int, default=defaults.tasks)
+    parser.add_argument("--seed", type=int, default=defaults.seed)
+    parser.add_argument(
+        "--anchor",
+        type=datetime.fromisoformat,
+        default=defaults.anchor,
+        help="Reference 'now' used for every generated timestamp",
+    )
+    parser.add_argument("--password", default=defaults.password)
+    parser.add_argument(
+        "--password-hash", help="Pre-computed bcrypt hash; skips hashing entirely"
+    )
+    parser.add_argument("--prefix", default=defaults.prefix)
+    parser.add_argument("--admin-ratio", type=float, default=defaults.admin_ratio)
+    parser.add_argument(
+        "--owner-skew",
+        type=float,
+        default=defaults.owner_skew,
+        help="Zipf exponent for tasks per owner, 0 for uniform",
+    )
+    parser.add_argument(
+        "--category-weights",
+        type=lambda value: tuple(float(w) for w in value.split(",")),
+        default=defaults.category_weights,
+        help="Comma separated weights for low,medium,high",
+    )
+    parser.add_argument("--completed-ratio", type=float, default=defaults.completed_ratio)
+    parser.add_argument(
+        "--delete-request-ratio", type=float, default=defaults.delete_request_ratio
+    )
+    parser.add_argument(
+        "--no-due-date-ratio", type=float, default=defaults.no_due_date_ratio
+    )
+    parser.add_argument("--due-past-days", type=int, default=defaults.due_past_days)
+    parser.add_argument("--due-future-days", type=int, default=defaults.due_future_days)
+    parser.add_argument("--history-days", type=int, default=defaults.history_days)
+    parser.add_argument(
+        "--description-words", type=int, default=defaults.description_words
+    )
+    parser.add_argument("--batch-size", type=int, default=defaults.batch_size)
+    parser.add_argument(
+        "--truncate", action="store_true", help="Empty users and tasks first"
+    )
+    args = vars(parser.parse_args(argv))
+    truncate = args.pop("truncate")
+
+    if len(args["category_weights"]) != len(Category):
+        parser.error(f"--category-weights needs {len(Category)} values")
+
+    return SeedOptions(**args), truncate
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    options, truncate = parse_args(argv)
+    asyncio.run(seed(options, truncate=truncate))
+
+
+if __name__ == "__main__":
+    main()
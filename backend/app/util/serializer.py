@@ -0,0 +1,136 @@
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+
+import msgpack
+import orjson
+from fastapi.responses import ORJSONResponse, Response
+from pydantic import TypeAdapter
+
+from app.model.base_model import Category, Task
+from app.schema.task_schema import TASK_FIELDS, TaskInDB
+
+ORJSON_OPTIONS = orjson.OPT_UTC_Z
+
+# Task list media types offered through content negotiation.
+TASK_LIST_JSON = "application/json"
+TASK_LIST_COLUMNAR = "application/vnd.todo.columnar+json"
+TASK_LIST_MSGPACK = "application/msgpack"
+
+_DATETIME_FIELDS = ("due_date", "completed_at")
+
+# Compact formats send categories as their index in CATEGORY_NAMES.
+CATEGORY_NAMES = [category.value for category in Category]
+_CATEGORY_CODES: Dict[Any, int] = {
+    **{category: code for code, category in enumerate(Category)},
+    **{name: code for code, name in enumerate(CATEGORY_NAMES)},
+}
+
+_task_adapter = TypeAdapter(TaskInDB)
+
+
+class FastJSONResponse(ORJSONResponse):
+    """App-wide default response class; matches pydantic's JSON output for UTC datetimes."""
+
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content, option=ORJSON_OPTIONS)
+
+
+def task_payload(task: Any) -> Dict[str, Any]:
+    # Rows loaded from the database already satisfy TaskInDB, so they are
+    # read straight off the instance instead of being validated again. Loaded
+    # column values live in the instance __dict__, which skips the much slower
+    # instrumented attribute access; anything unloaded goes through getattr.
+    if isinstance(task, Task):
+        loaded = task.__dict__
+        try:
+            return {name: loaded[name] for name in TASK_FIELDS}
+        except KeyError:
+            return {name: getattr(task, name) for name in TASK_FIELDS}
+    return _task_adapter.dump_python(_task_adapter.validate_python(task, from_attributes=True))
+
+
+def task_payloads(tasks: Iterable[Any], fields: Optional[Sequence[str]] = None) -> List[Dict[str, Any]]:
+    # Projected rows are plain column dicts already limited to ``fields``.
+    return list(tasks) if fields else [task_payload(task) for task in tasks]
+
+
+def serialize_task_list(
+    tasks: Iterable[Any],
+    total: int,
+    skip: int,
+    limit: int,
+    fields: Optional[Sequence[str]] = None,
+    facets: Optional[Dict[str, Any]] = None,
+) -> bytes:
+    content = {
+        "tasks": task_payloads(tasks, fields),
+        "total": int(total),
+        "skip": skip,
+        "limit": limit,
+    }
+    if facets is not None:
+        content["facets"] = facets
+    return orjson.dumps(content, option=ORJSON_OPTIONS)
+
+
+def columnar_task_list(
+    tasks: Iterable[Any],
+    total: int,
+    skip: int,
+    limit: int,
+    fields: Optional[Sequence[str]] = None,
+    facets: Optional[Dict[str, Any]] = None,
+) -> Dict[str, Any]:
+    """A task list as one array per field instead of one object per task."""
+    payloads = task_payloads(tasks, fields)
+    columns = {name: [task[name] for task in payloads] for name in fields or TASK_FIELDS}
+    if "category" in columns:
+        columns["category"] = [
+            None if category is None else _CATEGORY_CODES[category]
+            for category in columns["category"]
+        ]
+    content = {
+        "columns": columns,
+        "categories": CATEGORY_NAMES,
+        "total": int(total),
+        "skip": skip,
+        "limit": limit,
+    }
+    if facets is not None:
+        content["facets"] = facets
+    return content
+
+
+def encode_columnar(content: Dict[str, Any], media_type: str) -> bytes:
+    if media_type != TASK_LIST_MSGPACK:
+        return orjson.dumps(content, option=ORJSON_OPTIONS)
+    # Stored datetimes are naive UTC. msgpack only packs aware ones as
+    # timestamps, and does that in C, which beats a per-value default hook.
+    columns = content["columns"]
+    for name in _DATETIME_FIELDS:
+        if name in columns:
+            columns[name] = [
+                value.replace(tzinfo=timezone.utc)
+                if value is not None and value.tzinfo is None
+                else value
+                for value in columns[name]
+            ]
+    return msgpack.packb(content, datetime=True)
+
+
+def task_list_response(
+    tasks: Iterable[Any],
+    total: int,
+    skip: int,
+    limit: int,
+    fields: Optional[Sequence[str]] = None,
+    facets: Optional[Dict[str, Any]] = None,
+    media_type: str = TASK_LIST_JSON,
+) -> Response:
+    if media_type == TASK_LIST_JSON:
+        content = serialize_task_list(tasks, total, skip, limit, fields, facets)
+    else:
+        content = encode_columnar(
+            columnar_task_list(tasks, total, skip, limit, fields, facets), media_type
+        )
+    return Response(content=content, media_type=media_type, headers={"Vary": "Accept"})
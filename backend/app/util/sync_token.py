@@ -0,0 +1,51 @@
+import base64
+from dataclasses import dataclass
+from datetime import datetime, timezone
+
+
+@dataclass(frozen=True)
+class SyncToken:
+    """Opaque watermark for /task/changes: the (timestamp, id) keyset position
+    reached in the changed-task and tombstone streams."""
+
+    changed_at: datetime
+    changed_id: int
+    deleted_at: datetime
+    deleted_id: int
+
+    @classmethod
+    def at(cls, horizon: datetime) -> "SyncToken":
+        return cls(horizon, 0, horizon, 0)
+
+    def encode(self) -> str:
+        raw = ".".join(
+            str(part)
+            for part in (
+                _micros(self.changed_at),
+                self.changed_id,
+                _micros(self.deleted_at),
+                self.deleted_id,
+            )
+        )
+        return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+    @classmethod
+    def decode(cls, token: str) -> "SyncToken":
+        """Raises ``ValueError`` for anything that is not a token we issued."""
+        try:
+            raw = base64.urlsafe_b64decode(token + "=" * (-len(token) % 4)).decode()
+            changed_at, changed_id, deleted_at, deleted_id = (int(part) for part in raw.split("."))
+        except (ValueError, UnicodeDecodeError) as e:
+            raise ValueError(f"Invalid sync token: {token}") from e
+        return cls(_from_micros(changed_at), changed_id, _from_micros(deleted_at), deleted_id)
+
+
+def _micros(value: datetime) -> int:
+    delta = value - datetime(1970, 1, 1, tzinfo=timezone.utc)
+    return (delta.days * 86400 + delta.seconds) * 1_000_000 + delta.microseconds
+
+
+def _from_micros(value: int) -> datetime:
+    return datetime.fromtimestamp(value // 1_000_000, timezone.utc).replace(
+        microsecond=value % 1_000_000
+    )
@@ -0,0 +1,58 @@
+"""Compare the ORM task list read with the asyncpg fast path, end to end
+(query plus JSON body), against the configured database.
+
+    python -m benchmarks.bench_fast_read [user_id]
+"""
+
+import asyncio
+import sys
+import time
+
+from app.db import fast_read
+from app.db.crud.crud_task import task_crud
+from app.db.database import SessionLocal, engine
+from app.schema.task_schema import TASK_FIELDS
+from app.util.serializer import serialize_task_list
+
+LIMITS = (8, 100, 1000)
+
+
+async def orm_path(db, user_id, limit) -> bytes:
+    tasks, total = await task_crud.get_multi_with_query(
+        db, user_id=user_id, query=None, skip=0, limit=limit
+    )
+    return serialize_task_list(tasks, total, 0, limit)
+
+
+async def fast_path(db, user_id, limit) -> bytes:
+    rows, total = await fast_read.owner_page(
+        db, user_id=user_id, query=None, skip=0, limit=limit
+    )
+    return serialize_task_list(rows, total, 0, limit, TASK_FIELDS)
+
+
+async def best_of(path, user_id, limit, number: int, repeat: int = 5) -> float:
+    timings = []
+    async with SessionLocal() as db:
+        await path(db, user_id, limit)
+        for _ in range(repeat):
+            start = time.perf_counter()
+            for _ in range(number):
+                await path(db, user_id, limit)
+                db.expunge_all()
+            timings.append((time.perf_counter() - start) / number)
+    return min(timings)
+
+
+async def main(user_id) -> None:
+    print(f"{'limit':>6} {'orm (us)':>10} {'fast (us)':>10} {'speedup':>8}")
+    for limit in LIMITS:
+        number = max(10, 2000 // limit)
+        orm = await best_of(orm_path, user_id, limit, number)
+        fast = await best_of(fast_path, user_id, limit, number)
+        print(f"{limit:>6} {orm * 1e6:>10.1f} {fast * 1e6:>10.1f} {orm / fast:>7.1f}x")
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main(int(sys.argv[1]) if len(sys.argv) > 1 else None))
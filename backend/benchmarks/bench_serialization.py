@@ -0,0 +1,69 @@
+"""Compare FastAPI's default TaskList serialization with the orjson fast path.
+
+    python -m benchmarks.bench_serialization
+"""
+
+import asyncio
+import timeit
+from datetime import datetime, timedelta
+
+from fastapi.responses import JSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_response_field
+
+from app.model.base_model import Category, Task
+from app.schema.task_schema import TaskList
+from app.util.serializer import serialize_task_list
+
+LIMITS = (8, 100, 1000)
+
+response_field = create_response_field(name="Response_read_tasks", type_=TaskList)
+
+
+def make_tasks(count: int):
+    now = datetime(2024, 6, 1)
+    return [
+        Task(
+            id=i,
+            title=f"Task {i}",
+            description="Lorem ipsum dolor sit amet " * 4,
+            status=bool(i % 2),
+            due_date=now + timedelta(days=i % 30),
+            delete_request=False,
+            owner_id=i % 50,
+            category=list(Category)[i % 3],
+            completed_at=now if i % 2 else None,
+        )
+        for i in range(count)
+    ]
+
+
+def default_path(tasks, loop) -> bytes:
+    content = loop.run_until_complete(
+        serialize_response(
+            field=response_field,
+            response_content={"tasks": tasks, "total": 10000, "skip": 0, "limit": len(tasks)},
+            is_coroutine=True,
+        )
+    )
+    return JSONResponse(content).body
+
+
+def fast_path(tasks) -> bytes:
+    return serialize_task_list(tasks, 10000, 0, len(tasks))
+
+
+def main() -> None:
+    loop = asyncio.new_event_loop()
+    print(f"{'limit':>6} {'default (us)':>14} {'orjson (us)':>13} {'speedup':>8}")
+    for limit in LIMITS:
+        tasks = make_tasks(limit)
+        number = max(10, 20000 // limit)
+        default = min(timeit.repeat(lambda: default_path(tasks, loop), number=number, repeat=5)) / number
+        fast = min(timeit.repeat(lambda: fast_path(tasks), number=number, repeat=5)) / number
+        print(f"{limit:>6} {default * 1e6:>14.1f} {fast * 1e6:>13.1f} {default / fast:>7.1f}x")
+    loop.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+"""Show how many tasks partitions each CRUDTask read touches on the
+configured database, after the partitioning migration has run.
+
+    python -m benchmarks.check_partition_pruning [user_id]
+"""
+
+import asyncio
+import sys
+from datetime import datetime, timedelta, timezone
+
+from app.db.crud.crud_task import task_crud
+from app.db.database import SessionLocal, engine
+from app.db.partitions import (
+    recording_statements,
+    scanned_partitions,
+    task_partitioning,
+    task_partitions,
+)
+from app.util.sync_token import SyncToken
+
+
+def cases(user_id: int):
+    since = SyncToken.at(datetime.now(timezone.utc) - timedelta(days=1))
+    return {
+        "get_by_owner": lambda db: task_crud.get_by_owner(db, owner_id=user_id),
+        "list (owner)": lambda db: task_crud.get_multi_with_query(
+            db, user_id=user_id, query=None
+        ),
+        "list (admin)": lambda db: task_crud.get_multi_with_query(
+            db, user_id=None, query=None
+        ),
+        "search (owner)": lambda db: task_crud.search(
+            db, query="re", user_id=user_id, admin=False
+        ),
+        "filter (owner)": lambda db: task_crud.filter_tasks(
+            db, user_id=str(user_id), user_role="user", task_status="true", admin=False
+        ),
+        "delete requests": lambda db: task_crud.get_delete_requested_tasks(db),
+        "search delete requests": lambda db: task_crud.search_delete_requests(
+            db, query="re", user_id=user_id, admin=True
+        ),
+        "changes (owner)": lambda db: task_crud.get_changes(
+            db, user_id=user_id, since=since, limit=100, lag=timedelta(seconds=5)
+        ),
+        "version lookup": lambda db: task_crud.get_version(db, id=1),
+    }
+
+
+async def main(user_id: int) -> None:
+    async with SessionLocal() as db:
+        strategy = await task_partitioning(db)
+        total = len(await task_partitions(db))
+        print(f"tasks partitioning: {strategy}, {total} partitions")
+        for name, run in cases(user_id).items():
+            with recording_statements(db) as recorded:
+                await run(db)
+            for statement, parameters in recorded:
+                if "FROM tasks" not in statement:
+                    continue
+                scanned = await scanned_partitions(db, statement, parameters)
+                print(f"{name:<24} {len(scanned):>4}/{total}  {statement[:60]!r}")
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main(int(sys.argv[1]) if len(sys.argv) > 1 else 1))
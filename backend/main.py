@@ -1,10 +1,16 @@
 from dotenv import load_dotenv
-from fastapi import FastAPI
+from fastapi import FastAPI, status
+from fastapi.responses import JSONResponse
 from loguru import logger
 
 from app.api.v1.routes import routers as v1_routers
-from app.core.config import LogExceptionsMiddleware, cors_middleware
-from app.db.database import create_all_tables
+from app.core.config import (
+    LogExceptionsMiddleware,
+    ReadYourWritesMiddleware,
+    cors_middleware,
+)
+from app.core.startup import lifespan, readiness
+from app.util.serializer import FastJSONResponse
 
 logger.add(
     "caselog.log",
@@ -16,9 +22,10 @@ logger.add(
 
 load_dotenv()
 
-app = FastAPI()
+app = FastAPI(lifespan=lifespan, default_response_class=FastJSONResponse)
 
 app.add_middleware(cors_middleware)
+app.add_middleware(ReadYourWritesMiddleware)
 app.add_middleware(LogExceptionsMiddleware)
 
 
@@ -28,9 +35,14 @@ def root():
     return "To-Do is working"
 
 
-class Startup:
-    async def on_startup(self):
-        await create_all_tables
+@app.get("/ready")
+def ready():
+    if not readiness.ready:
+        return JSONResponse(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            content={"status": "starting", "detail": readiness.detail},
+        )
+    return {"status": "ready"}
 
 
 app.include_router(v1_routers, prefix="/api/v1")
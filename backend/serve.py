@@ -0,0 +1,221 @@
+"""Server entry point.
+
+``prod`` is a pre-fork launcher: the master imports the app, calibrates
+bcrypt, loads the templates and builds the hot statements once, freezes the
+heap with ``gc.freeze()`` so forked workers share it copy-on-write, binds
+the listening socket and forks ``SERVER_WORKERS`` uvicorn workers running
+uvloop and httptools. Connections are not shared: each worker opens and
+warms its own pools in its lifespan. A worker that dies is restarted, after
+a growing delay if it died shortly after starting. SIGTERM/SIGINT are
+forwarded to the workers, which stop accepting connections and drain
+in-flight requests for up to ``SERVER_GRACEFUL_TIMEOUT`` seconds.
+
+``dev`` runs a single auto-reloading uvicorn process.
+
+    python serve.py --profile prod --workers 4
+"""
+
+import argparse
+import asyncio
+import gc
+import os
+import signal
+import socket
+import sys
+import time
+from typing import Dict, Optional, Sequence
+
+import uvicorn
+
+from app.core.config import settings
+from logger import log
+
+FORWARDED_SIGNALS = (signal.SIGTERM, signal.SIGINT)
+
+# A worker exiting sooner than this after it started is restarted after a
+# delay doubling from RESPAWN_BACKOFF_MIN up to RESPAWN_BACKOFF_MAX.
+MIN_WORKER_UPTIME = 10.0
+RESPAWN_BACKOFF_MIN = 1.0
+RESPAWN_BACKOFF_MAX = 30.0
+
+
+def run_dev(host: str, port: int) -> None:
+    uvicorn.run("main:app", host=host, port=port, reload=True)
+
+
+def bind_socket(host: str, port: int) -> socket.socket:
+    sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.bind((host, port))
+    sock.listen(2048)
+    sock.set_inheritable(True)
+    return sock
+
+
+def run_worker(app, sock: socket.socket, graceful_timeout: int) -> None:
+    for sig in FORWARDED_SIGNALS:
+        signal.signal(sig, signal.SIG_DFL)
+
+    config = uvicorn.Config(
+        app,
+        loop="uvloop",
+        http="httptools",
+        lifespan="on",
+        timeout_graceful_shutdown=graceful_timeout,
+        proxy_headers=True,
+    )
+    server = uvicorn.Server(config)
+    server.run(sockets=[sock])
+    if not server.started:
+        raise RuntimeError("server did not start")
+
+
+class Master:
+    def __init__(self, app, sock: socket.socket, workers: int, graceful_timeout: int):
+        self.app = app
+        self.sock = sock
+        self.workers = workers
+        self.graceful_timeout = graceful_timeout
+        self.children: Dict[int, int] = {}
+        self.started_at: Dict[int, float] = {}
+        # Slot -> when to start its worker again, and the delay used last time.
+        self.respawn_at: Dict[int, float] = {}
+        self.backoff: Dict[int, float] = {}
+        self.stopping = False
+
+    def spawn(self, slot: int) -> None:
+        pid = os.fork()
+        if pid == 0:
+            code = 1
+            try:
+                run_worker(self.app, self.sock, self.graceful_timeout)
+                code = 0
+            except SystemExit as e:
+                code = e.code if isinstance(e.code, int) else 1
+            except BaseException as e:
+                log.error(f"Worker {slot} failed: {e}")
+            finally:
+                os._exit(code)
+        self.children[pid] = slot
+        self.started_at[pid] = time.monotonic()
+        log.info(f"Started worker {slot} with pid {pid}")
+
+    def handle_signal(self, sig: int, frame) -> None:
+        if self.stopping:
+            return
+        self.stopping = True
+        log.info(f"Received {signal.Signals(sig).name}, draining {len(self.children)} workers")
+        for pid in list(self.children):
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+
+    def reap(self, pid: int, status: int) -> None:
+        slot = self.children.pop(pid)
+        uptime = time.monotonic() - self.started_at.pop(pid)
+        if self.stopping:
+            return
+        if uptime < MIN_WORKER_UPTIME:
+            # Most likely failed during startup and would again right away.
+            delay = min(self.backoff.get(slot, RESPAWN_BACKOFF_MIN / 2) * 2, RESPAWN_BACKOFF_MAX)
+            self.backoff[slot] = delay
+        else:
+            delay = 0.0
+            self.backoff.pop(slot, None)
+        log.error(
+            f"Worker {slot} (pid {pid}) exited with code {os.waitstatus_to_exitcode(status)} "
+            f"after {uptime:.1f}s, restarting in {delay:.1f}s"
+        )
+        self.respawn_at[slot] = time.monotonic() + delay
+
+    def run(self) -> None:
+        for sig in FORWARDED_SIGNALS:
+            signal.signal(sig, self.handle_signal)
+
+        for slot in range(self.workers):
+            self.spawn(slot)
+
+        deadline: Optional[float] = None
+        while self.children or (self.respawn_at and not self.stopping):
+            now = time.monotonic()
+            if self.stopping and deadline is None:
+                deadline = now + self.graceful_timeout + 5
+            if deadline is not None and now > deadline:
+                log.warning("Workers did not drain in time, killing them")
+                for pid in list(self.children):
+                    try:
+                        os.kill(pid, signal.SIGKILL)
+                    except ProcessLookupError:
+                        pass
+                deadline = float("inf")
+
+            if not self.stopping:
+                for slot, at in list(self.respawn_at.items()):
+                    if at <= now:
+                        del self.respawn_at[slot]
+                        self.spawn(slot)
+
+            try:
+                pid, status = os.waitpid(-1, os.WNOHANG)
+            except ChildProcessError:
+                # Every worker is waiting to be restarted.
+                pid = 0
+            if pid == 0:
+                time.sleep(0.2)
+                continue
+            self.reap(pid, status)
+
+        self.sock.close()
+        log.info("All workers stopped")
+
+
+def run_prod(host: str, port: int, workers: int, graceful_timeout: int) -> None:
+    # Import and build everything once in the master so workers inherit it.
+    from main import app
+    from app.core.startup import calibrate_password_hashing, preload_templates, warm_statements
+
+    # Calibrate once on an idle machine; workers inherit the cost factor.
+    calibrate_password_hashing()
+    preload_templates()
+    # Builds and compiles the hot statements; the connection it used is
+    # closed, since each worker opens its own pools after the fork.
+    try:
+        asyncio.run(warm_statements())
+    except Exception as e:
+        log.warning(f"Could not warm statements before forking, workers will: {e}")
+
+    sock = bind_socket(host, port)
+
+    # Only now, with the warmed templates, statements and caches on the
+    # heap, so workers share them copy-on-write.
+    gc.collect()
+    gc.freeze()
+
+    Master(app, sock, workers, graceful_timeout).run()
+
+
+def parse_args(argv: Optional[Sequence[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Run the To-Do API server")
+    parser.add_argument("--profile", choices=["dev", "prod"], default=settings.SERVER_PROFILE)
+    parser.add_argument("--host", default=settings.SERVER_HOST)
+    parser.add_argument("--port", type=int, default=settings.SERVER_PORT)
+    parser.add_argument(
+        "--workers", type=int, default=settings.SERVER_WORKERS or os.cpu_count() or 1
+    )
+    parser.add_argument(
+        "--graceful-timeout", type=int, default=settings.SERVER_GRACEFUL_TIMEOUT
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    args = parse_args(argv)
+    if args.profile == "dev":
+        run_dev(args.host, args.port)
+    else:
+        run_prod(args.host, args.port, args.workers, args.graceful_timeout)
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,106 @@
+"""The asyncpg fast read path must return exactly what CRUDTask returns."""
+
+import json
+
+import pytest
+import pytest_asyncio
+from sqlalchemy import update
+
+from app.db import fast_read
+from app.db.crud.crud_task import task_crud
+from app.model.base_model import Task
+from app.schema.task_schema import TASK_FIELDS
+from app.util.seed import SeedOptions
+from app.util.serializer import serialize_task_list
+
+pytestmark = pytest.mark.postgres
+
+SEED = SeedOptions(users=20, tasks=3000, seed=3, password_hash="x")
+
+OWNER_CASES = [
+    {"user_id": 1, "query": None, "skip": 0, "limit": 8},
+    {"user_id": 2, "query": "report", "skip": 0, "limit": 100},
+    {"user_id": 3, "query": "RE", "skip": 5, "limit": 1000},
+    {"user_id": None, "query": None, "skip": 16, "limit": 8},
+    {"user_id": None, "query": "nothing-matches", "skip": 0, "limit": 8},
+    {"user_id": 1, "query": None, "skip": 100000, "limit": 8},
+]
+
+FILTER_CASES = [
+    {"user_id": "1", "admin": False},
+    {"user_id": "1", "admin": False, "task_status": "true"},
+    {"user_id": "2", "admin": False, "task_status": "false", "category": "high"},
+    {"user_id": "3", "admin": False, "due_date": "2024-05-01T00:00:00"},
+    {"user_id": "1", "admin": True, "category": "medium", "skip": 8, "limit": 100},
+    {
+        "user_id": "1",
+        "admin": True,
+        "task_status": "true",
+        "category": "low",
+        "due_date": "2024-06-15",
+        "limit": 1000,
+    },
+]
+
+@pytest_asyncio.fixture
+async def session(seeded_session):
+    # Nothing here commits, so the seed is shared by the whole module.
+    return await seeded_session(SEED, writes=False)
+
+
+def as_json(tasks, total, fields=None):
+    return json.loads(serialize_task_list(tasks, total, 0, 0, fields))
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("case", OWNER_CASES)
+async def test_owner_page_matches_orm(session, case):
+    expected = await task_crud.get_multi_with_query(session, **case)
+    actual = await fast_read.owner_page(session, **case)
+
+    assert as_json(*actual, TASK_FIELDS) == as_json(*expected)
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("case", FILTER_CASES)
+async def test_filtered_page_matches_orm(session, case):
+    expected = await task_crud.filter_tasks(session, user_role="user", **case)
+    actual = await fast_read.filtered_page(session, **case)
+
+    assert as_json(*actual, TASK_FIELDS) == as_json(*expected)
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("case", FILTER_CASES)
+async def test_faceted_filter_matches_filter_tasks(session, case):
+    expected = await task_crud.filter_tasks(
+        session, user_role="user", fields=TASK_FIELDS, **case
+    )
+    tasks, total, facets = await task_crud.filter_tasks_with_facets(session, **case)
+
+    assert (tasks, total) == expected
+    for value, count in facets["status"].items():
+        _, facet_total = await task_crud.filter_tasks(
+            session, user_role="user", **{**case, "task_status": str(value == "done")}
+        )
+        assert count == facet_total
+    for value, count in facets["category"].items():
+        _, facet_total = await task_crud.filter_tasks(
+            session, user_role="user", **{**case, "category": value}
+        )
+        assert count == facet_total
+
+
+@pytest.mark.asyncio
+async def test_null_status_is_open_in_filters_and_facets(session):
+    # Left uncommitted, so the fixture's rollback restores the seed.
+    await session.execute(update(Task).where(Task.owner_id == 1).values(status=None))
+    case = {"user_id": "1", "admin": False, "task_status": "false"}
+
+    _, total = await task_crud.filter_tasks(session, user_role="user", **case)
+    _, fast_total = await fast_read.filtered_page(session, **case)
+    _, _, facets = await task_crud.filter_tasks_with_facets(session, **case)
+
+    assert total > 0
+    assert total == fast_total == facets["status"]["open"]
+    assert facets["status"]["done"] == 0
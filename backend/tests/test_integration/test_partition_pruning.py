@@ -0,0 +1,120 @@
+"""CRUDTask reads must prune a partitioned tasks table where their filters allow.
+
+Builds the partitioned table in a scratch schema, the public tables are left alone.
+"""
+
+from datetime import date, datetime
+
+import pytest
+import pytest_asyncio
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.crud.crud_task import task_crud
+from app.db.partitions import (
+    HASH,
+    RANGE,
+    add_months,
+    create_tasks_ddl,
+    ensure_task_partitions,
+    month_start,
+    range_partition_name,
+    recording_statements,
+    scanned_partitions,
+    task_partitioning,
+    task_partitions,
+)
+from app.model.base_model import Base
+
+pytestmark = pytest.mark.postgres
+
+SCHEMA = "pruning_check"
+
+
+async def partitioned_engine(postgres_engine, strategy, **options):
+    async with postgres_engine().begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+        await conn.execute(text(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE"))
+        await conn.execute(text(f"CREATE SCHEMA {SCHEMA}"))
+        await conn.execute(text(f"SET LOCAL search_path TO {SCHEMA}, public"))
+        for statement in create_tasks_ddl(strategy, "public.tasks", **options):
+            await conn.execute(text(statement))
+    return postgres_engine(f"{SCHEMA}, public")
+
+
+@pytest_asyncio.fixture
+async def hash_session(postgres_engine):
+    engine = await partitioned_engine(postgres_engine, HASH, modulus=8)
+    async with AsyncSession(engine) as db:
+        yield db
+
+
+@pytest_asyncio.fixture
+async def range_session(postgres_engine):
+    engine = await partitioned_engine(
+        postgres_engine, RANGE, first_month=date(2024, 1, 1), last_month=date(2024, 2, 1)
+    )
+    async with AsyncSession(engine) as db:
+        yield db
+
+
+async def partitions_read(db, run):
+    with recording_statements(db) as recorded:
+        await run(db)
+    return [
+        await scanned_partitions(db, statement, parameters)
+        for statement, parameters in recorded
+        if "FROM tasks" in statement
+    ]
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "run",
+    [
+        lambda db: task_crud.get_by_owner(db, owner_id=3),
+        lambda db: task_crud.get_multi_with_query(db, user_id=3, query="re"),
+        lambda db: task_crud.search(db, query="re", user_id=3, admin=False),
+        lambda db: task_crud.filter_tasks(
+            db, user_id="3", user_role="user", category="high", admin=False
+        ),
+    ],
+)
+async def test_owner_reads_prune_hash_partitions(hash_session, run):
+    assert await task_partitioning(hash_session) == HASH
+
+    scanned = await partitions_read(hash_session, run)
+
+    assert scanned
+    assert all(len(partitions) == 1 for partitions in scanned)
+
+
+@pytest.mark.asyncio
+async def test_admin_reads_scan_every_hash_partition(hash_session):
+    scanned = await partitions_read(
+        hash_session, lambda db: task_crud.get_multi_with_query(db, user_id=None, query=None)
+    )
+
+    assert all(len(partitions) == 8 for partitions in scanned)
+
+
+@pytest.mark.asyncio
+async def test_range_partitions_are_created_ahead(range_session):
+    created = await ensure_task_partitions(range_session, months_ahead=2)
+
+    this_month = month_start(datetime.now().date())
+    expected = [range_partition_name(add_months(this_month, n)) for n in range(3)]
+    assert created == expected
+    assert set(expected) <= set(await task_partitions(range_session))
+    assert await ensure_task_partitions(range_session, months_ahead=2) == []
+
+
+@pytest.mark.asyncio
+async def test_created_at_bounds_prune_range_partitions(range_session):
+    scanned = await scanned_partitions(
+        range_session,
+        "SELECT count(*) FROM tasks WHERE created_at >= $1 AND created_at < $2",
+        (datetime(2024, 1, 5), datetime(2024, 1, 20)),
+    )
+
+    assert scanned == [range_partition_name(date(2024, 1, 1))]
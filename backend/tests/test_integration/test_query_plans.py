@@ -0,0 +1,243 @@
+"""CRUDTask and CRUDUser queries must not regress to sequential scans or many more buffers.
+
+Every case runs a CRUD method against a disposable Postgres database, on
+tables created from the models in a scratch schema and seeded there,
+captures the statements it sends, replays each under EXPLAIN (ANALYZE,
+BUFFERS) and compares the plan with the shape recorded in query_plans.json.
+Writes run inside transactions that are rolled back.
+
+After an intended plan change, re-record the shapes and review the diff:
+
+    UPDATE_QUERY_PLANS=1 TEST_DATABASE_URL=... pytest tests/test_integration/test_query_plans.py
+"""
+
+import json
+import os
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+import pytest
+import pytest_asyncio
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.crud.crud_auth import user_crud
+from app.db.crud.crud_task import task_crud
+from app.db.partitions import recording_statements
+from app.db.plans import PLANNED_STATEMENTS, explain_shape, plan_regressions
+from app.schema.auth_schema import UserCreate
+from app.schema.task_schema import TaskCreate
+from app.util.seed import SeedOptions
+from app.util.sync_token import SyncToken
+
+UPDATE_QUERY_PLANS = bool(os.getenv("UPDATE_QUERY_PLANS"))
+
+pytestmark = pytest.mark.postgres
+
+PLANS_FILE = Path(__file__).with_name("query_plans.json")
+
+# Big enough for the planner to prefer indexes where they exist, small
+# enough for ANALYZE to read every row, which keeps the plans repeatable.
+SEED = SeedOptions(users=2000, tasks=30000, seed=17, password_hash="x")
+
+OWNER = 7
+TASK = 1234
+SINCE = SyncToken.at(datetime(2024, 5, 25, tzinfo=timezone.utc))
+
+
+async def _update_task(db):
+    task = await task_crud.get_by_id(db, id=TASK)
+    return await task_crud.update(db, db_obj=task, obj_in={"title": "Renamed"})
+
+
+async def _update_user(db):
+    user = await user_crud.get(db, OWNER)
+    return await user_crud.update(db, db_obj=user, obj_in={"first_name": "Renamed"})
+
+
+FILTERS = {"task_status": "false", "category": "high", "due_date": None}
+
+CASES = {
+    "task.get": lambda db: task_crud.get(db, TASK),
+    "task.get_by_id": lambda db: task_crud.get_by_id(db, id=TASK),
+    "task.get_fields_by_id": lambda db: task_crud.get_fields_by_id(
+        db, id=TASK, fields=("id", "title")
+    ),
+    "task.get_version": lambda db: task_crud.get_version(db, id=TASK),
+    "task.get_archived_by_id": lambda db: task_crud.get_archived_by_id(db, id=TASK),
+    "task.get_by_owner": lambda db: task_crud.get_by_owner(db, owner_id=OWNER),
+    "task.get_multi": lambda db: task_crud.get_multi(db, skip=100, limit=100),
+    "task.list.owner": lambda db: task_crud.get_multi_with_query(
+        db, user_id=OWNER, query=None
+    ),
+    "task.list.owner_title": lambda db: task_crud.get_multi_with_query(
+        db, user_id=OWNER, query="report"
+    ),
+    "task.list.admin": lambda db: task_crud.get_multi_with_query(
+        db, user_id=None, query=None, skip=100, limit=8
+    ),
+    "task.list.owner_archived": lambda db: task_crud.get_multi_with_query(
+        db, user_id=OWNER, query=None, include_archived=True
+    ),
+    "task.changes.owner": lambda db: task_crud.get_changes(
+        db, user_id=OWNER, since=SINCE, limit=100, lag=timedelta(0)
+    ),
+    "task.changes.admin": lambda db: task_crud.get_changes(
+        db, user_id=None, since=SINCE, limit=100, lag=timedelta(0)
+    ),
+    "task.suggest.owner": lambda db: task_crud.suggest_titles(
+        db, user_id=OWNER, prefix="fi", limit=10
+    ),
+    "task.suggest.admin": lambda db: task_crud.suggest_titles(
+        db, user_id=None, prefix="fi", limit=10
+    ),
+    "task.delete_requests": lambda db: task_crud.get_delete_requested_tasks(db, limit=8),
+    "task.search.owner": lambda db: task_crud.search(db, "report", OWNER, False, 0, 8),
+    "task.search.admin": lambda db: task_crud.search(db, "report", OWNER, True, 0, 8),
+    "task.search_delete_requests.owner": lambda db: task_crud.search_delete_requests(
+        db, "seed", OWNER, False, 0, 8
+    ),
+    "task.search_delete_requests.admin": lambda db: task_crud.search_delete_requests(
+        db, "seed", OWNER, True, 0, 8
+    ),
+    "task.filter.owner": lambda db: task_crud.filter_tasks(
+        db, user_id=OWNER, user_role="user", admin=False, **FILTERS
+    ),
+    "task.filter.admin": lambda db: task_crud.filter_tasks(
+        db, user_id=OWNER, user_role="admin", admin=True, **FILTERS
+    ),
+    "task.filter_facets.owner": lambda db: task_crud.filter_tasks_with_facets(
+        db, user_id=OWNER, admin=False, **FILTERS
+    ),
+    "task.filter_facets.admin": lambda db: task_crud.filter_tasks_with_facets(
+        db, user_id=OWNER, admin=True, **FILTERS
+    ),
+    "task.create": lambda db: task_crud.create(
+        db,
+        obj_in=TaskCreate(
+            title="Plan check",
+            description="",
+            status=False,
+            due_date=datetime(2024, 7, 1),
+            category="low",
+            completed_at=None,
+            owner_id=OWNER,
+        ),
+    ),
+    "task.update": _update_task,
+    "task.update_if_match": lambda db: task_crud.update_if_match(
+        db, id=TASK, versions=(1,), values={"status": True}, owner_id=None
+    ),
+    "task.remove": lambda db: task_crud.remove(db, id=TASK),
+    "task.purge_tombstones": lambda db: task_crud.purge_tombstones(
+        db, older_than=timedelta(days=30)
+    ),
+    "task.archive_completed": lambda db: task_crud.archive_completed(
+        db, older_than=timedelta(days=30), batch_size=100
+    ),
+    "user.get": lambda db: user_crud.get(db, OWNER),
+    "user.get_multi": lambda db: user_crud.get_multi(db, skip=0, limit=100),
+    "user.get_by_email": lambda db: user_crud.get_by_email(
+        db, email=f"seed_user_{OWNER}@example.com"
+    ),
+    "user.get_by_username": lambda db: user_crud.get_by_username(
+        db, username=f"seed_user_{OWNER}"
+    ),
+    "user.create": lambda db: user_crud.create(
+        db,
+        obj_in=UserCreate(
+            username="plan_check",
+            email="plan_check@example.com",
+            first_name="Plan",
+            last_name="Check",
+            contact_number="0100000000",
+            gender="male",
+            password="password",
+            role="user",
+        ),
+    ),
+    "user.update": _update_user,
+    "user.replace_password_hash": lambda db: user_crud.replace_password_hash(
+        db, user_id=OWNER, old_hash="x", new_hash="y"
+    ),
+}
+
+SCHEMA = "plan_check"
+
+_seeded = False
+
+
+@pytest_asyncio.fixture
+async def engine(postgres_engine, seed_tables):
+    """Engine on a scratch schema built from the models, so the plans see today's indexes."""
+    global _seeded
+    if not _seeded:
+        async with postgres_engine().begin() as conn:
+            await conn.execute(text(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE"))
+            await conn.execute(text(f"CREATE SCHEMA {SCHEMA}"))
+    engine = postgres_engine(SCHEMA)
+    if not _seeded:
+        await seed_tables(engine, SEED)
+        async with engine.begin() as conn:
+            # Tombstones of the last two weeks, none old enough to purge.
+            await conn.execute(
+                text(
+                    "INSERT INTO task_tombstones (task_id, owner_id, deleted_at) "
+                    "SELECT :first + g, g % :users + 1, now() - g * interval '1 minute' "
+                    "FROM generate_series(0, 19999) g"
+                ),
+                {"users": SEED.users, "first": SEED.tasks + 1},
+            )
+        # Index-only scans depend on the visibility map, which a fresh COPY lacks.
+        async with engine.connect() as conn:
+            conn = await conn.execution_options(isolation_level="AUTOCOMMIT")
+            await conn.execute(text("VACUUM ANALYZE"))
+        _seeded = True
+    return engine
+
+
+async def plan_shapes(engine, run):
+    """Shapes of the statements ``run`` sends, each replayed on the seeded data."""
+    async with engine.connect() as conn:
+        # The session's commits only release savepoints; nothing outlives the case.
+        transaction = await conn.begin()
+        db = AsyncSession(bind=conn, join_transaction_mode="create_savepoint")
+        with recording_statements(db, PLANNED_STATEMENTS) as recorded:
+            await run(db)
+        await db.close()
+        await transaction.rollback()
+
+        transaction = await conn.begin()
+        db = AsyncSession(bind=conn)
+        shapes = [await explain_shape(db, statement, params) for statement, params in recorded]
+        await db.close()
+        await transaction.rollback()
+    return shapes
+
+
+def recorded_plans():
+    return json.loads(PLANS_FILE.read_text()) if PLANS_FILE.exists() else {}
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("name", sorted(CASES))
+async def test_query_plan(engine, name):
+    shapes = await plan_shapes(engine, CASES[name])
+
+    if UPDATE_QUERY_PLANS:
+        plans = recorded_plans()
+        plans[name] = [shape.to_dict() for shape in shapes]
+        PLANS_FILE.write_text(json.dumps(dict(sorted(plans.items())), indent=2) + "\n")
+        return
+
+    expected = recorded_plans().get(name)
+    assert expected is not None, f"No recorded plan for {name}; run with UPDATE_QUERY_PLANS=1"
+    assert len(shapes) == len(expected), (
+        f"{name} sent {len(shapes)} statements, recorded {len(expected)}"
+    )
+    problems = [
+        f"statement {index}: {problem}"
+        for index, (recorded, shape) in enumerate(zip(expected, shapes))
+        for problem in plan_regressions(recorded, shape)
+    ]
+    assert not problems, f"{name}: " + "; ".join(problems)
@@ -1,9 +1,11 @@
 from datetime import datetime, timezone
 from unittest.mock import MagicMock, patch
 from fastapi.testclient import TestClient
+import msgpack
 import pytest
 from sqlalchemy.ext.asyncio import AsyncSession
 from fastapi import status
+from app.core.cache import analytics_cache, search_cache, suggest_cache, task_versions
 from app.core.security import create_access_token
 from app.model.base_model import Task, User
 from app.schema.auth_schema import TokenData
@@ -275,53 +277,38 @@ async def test_update_task_success(get_db):
     mock_token_data = TokenData(id="1", role="admin")
     token = create_access_token(token_data)
 
-    mock_task = TaskInDB(
-        id=task_id,
-        title="a testing task",
-        description="testing the update method",
-        status=False,
-        delete_request=False,
-        reminder_sent=False,
-        owner_id=owner_id,
-        category="low",
-        due_date=datetime.now(timezone.utc),
-        created_at=datetime.now(timezone.utc),
-    )
-
-    async def mock_get_by_id(db, id=task_id):
-        return mock_task
-
-    async def mock_update_task(db, db_obj, obj_in):
-        updated_task_data = {
-            "title": obj_in.get("title"),
-            "description": obj_in.get("description"),
-            "due_date": obj_in.get("due_date"),
-            "category": obj_in.get("category"),
-            "owner_id": obj_in.get("owner_id"),
-            "status": db_obj.status,
-            "id": db_obj.id,
-            "delete_request": db_obj.delete_request,
-        }
-        updated_task = TaskInDB(**updated_task_data)
-        return updated_task
+    async def mock_update_if_match(db, id, versions, values, owner_id=None):
+        assert versions == (3,)
+        updated_task = TaskInDB(
+            **values,
+            status=False,
+            id=id,
+            delete_request=False,
+            version=4,
+        )
+        return updated_task, values["owner_id"]
 
     client.cookies["token"] = token
 
-    with patch("app.db.crud.crud_task.task_crud.get_by_id", new=mock_get_by_id):
-        with patch("app.core.security.get_token_data", return_value=mock_token_data):
-            with patch("app.db.crud.crud_task.task_crud.update", new=mock_update_task):
-                response = client.put(
-                    f"/api/v1/task/tasks/{task_id}",
-                    data={
-                        "owner_id": owner_id,
-                        "title": "Updated Task Title",
-                        "description": "Updated description",
-                        "category": "high",
-                        "due_date": "2024-06-20T10:00:00Z",
-                    },
-                )
+    with patch("app.core.security.get_token_data", return_value=mock_token_data):
+        with patch(
+            "app.db.crud.crud_task.task_crud.update_if_match", new=mock_update_if_match
+        ):
+            response = client.put(
+                f"/api/v1/task/tasks/{task_id}",
+                data={
+                    "owner_id": owner_id,
+                    "title": "Updated Task Title",
+                    "description": "Updated description",
+                    "category": "high",
+                    "due_date": "2024-06-20T10:00:00Z",
+                },
+                headers={"If-Match": '"3"'},
+            )
 
     assert response.status_code == status.HTTP_200_OK
+    assert response.headers["ETag"] == '"4"'
+    assert response.json()["version"] == 4
 
 
 @pytest.mark.asyncio
@@ -330,95 +317,118 @@ async def test_update_task_unauthorized(get_db):
     owner_id = 1
     mock_token_data = None
 
-    mock_task = TaskInDB(
-        id=task_id,
-        title="a testing task",
-        description="testing the update method",
-        status=False,
-        delete_request=False,
-        reminder_sent=False,
-        owner_id=owner_id,
-        category="low",
-        due_date=datetime.now(timezone.utc),
-        created_at=datetime.now(timezone.utc),
-    )
-
-    async def mock_get_by_id(db, id=task_id):
-        return mock_task
-
-    async def mock_update_task(db, db_obj, obj_in):
-        updated_task_data = {
-            "title": obj_in.get("title"),
-            "description": obj_in.get("description"),
-            "due_date": obj_in.get("due_date"),
-            "category": obj_in.get("category"),
-            "owner_id": obj_in.get("owner_id"),
-            "status": db_obj.status,
-            "id": db_obj.id,
-            "delete_request": db_obj.delete_request,
-        }
-        updated_task = TaskInDB(**updated_task_data)
-        return updated_task
+    async def mock_update_if_match(db, id, versions, values, owner_id=None):
+        raise AssertionError("update must not run without a token")
 
     client.cookies["token"] = None
 
-    with patch("app.db.crud.crud_task.task_crud.get_by_id", new=mock_get_by_id):
-        with patch("app.core.security.get_token_data", return_value=mock_token_data):
-            with patch("app.db.crud.crud_task.task_crud.update", new=mock_update_task):
-                response = client.put(
-                    f"/api/v1/task/tasks/{task_id}",
-                    data={
-                        "owner_id": owner_id,
-                        "title": "Updated Task Title",
-                        "description": "Updated description",
-                        "category": "high",
-                        "due_date": "2024-06-20T10:00:00Z",
-                    },
-                )
+    with patch("app.core.security.get_token_data", return_value=mock_token_data):
+        with patch(
+            "app.db.crud.crud_task.task_crud.update_if_match", new=mock_update_if_match
+        ):
+            response = client.put(
+                f"/api/v1/task/tasks/{task_id}",
+                data={
+                    "owner_id": owner_id,
+                    "title": "Updated Task Title",
+                    "description": "Updated description",
+                    "category": "high",
+                    "due_date": "2024-06-20T10:00:00Z",
+                },
+                headers={"If-Match": '"1"'},
+            )
     assert response.status_code == status.HTTP_401_UNAUTHORIZED
 
 
 @pytest.mark.asyncio
-async def test_update_task_error(get_db):
+async def test_update_task_not_found(get_db):
     task_id = "1"
     owner_id = 1
     token_data = {"id": "1", "role": "admin"}
     mock_token_data = TokenData(id="1", role="admin")
     token = create_access_token(token_data)
 
-    async def mock_get_by_id(db, id=task_id):
+    async def mock_update_if_match(db, id, versions, values, owner_id=None):
+        return None, None
+
+    async def mock_get_version(db, id):
         return None
 
-    async def mock_update_task(db, db_obj, obj_in):
-        updated_task_data = {
-            "title": obj_in.get("title"),
-            "description": obj_in.get("description"),
-            "due_date": obj_in.get("due_date"),
-            "category": obj_in.get("category"),
-            "owner_id": obj_in.get("owner_id"),
-            "status": db_obj.status,
-            "id": db_obj.id,
-            "delete_request": db_obj.delete_request,
-        }
-        updated_task = TaskInDB(**updated_task_data)
-        return updated_task
+    client.cookies["token"] = token
+
+    with patch("app.core.security.get_token_data", return_value=mock_token_data):
+        with patch(
+            "app.db.crud.crud_task.task_crud.update_if_match", new=mock_update_if_match
+        ), patch("app.db.crud.crud_task.task_crud.get_version", new=mock_get_version):
+            response = client.put(
+                f"/api/v1/task/tasks/{task_id}",
+                data={
+                    "owner_id": owner_id,
+                    "title": "Updated Task Title",
+                    "description": "Updated description",
+                    "category": "high",
+                    "due_date": "2024-06-20T10:00:00Z",
+                },
+                headers={"If-Match": '"1"'},
+            )
+    assert response.status_code == status.HTTP_404_NOT_FOUND
+
+
+@pytest.mark.asyncio
+async def test_update_task_version_conflict(get_db):
+    task_id = "1"
+    owner_id = 1
+    token_data = {"id": "1", "role": "user"}
+    mock_token_data = TokenData(id="1", role="user")
+    token = create_access_token(token_data)
+
+    async def mock_update_if_match(db, id, versions, values, owner_id=None):
+        return None, None
+
+    async def mock_get_version(db, id):
+        return owner_id, 5
 
     client.cookies["token"] = token
 
-    with patch("app.db.crud.crud_task.task_crud.get_by_id", new=mock_get_by_id):
-        with patch("app.core.security.get_token_data", return_value=mock_token_data):
-            with patch("app.db.crud.crud_task.task_crud.update", new=mock_update_task):
-                response = client.put(
-                    f"/api/v1/task/tasks/{task_id}",
-                    data={
-                        "owner_id": owner_id,
-                        "title": "Updated Task Title",
-                        "description": "Updated description",
-                        "category": "high",
-                        "due_date": "2024-06-20T10:00:00Z",
-                    },
-                )
-    assert response.status_code == status.HTTP_500_INTERNAL_SERVER_ERROR
+    with patch("app.core.security.get_token_data", return_value=mock_token_data):
+        with patch(
+            "app.db.crud.crud_task.task_crud.update_if_match", new=mock_update_if_match
+        ), patch("app.db.crud.crud_task.task_crud.get_version", new=mock_get_version):
+            response = client.put(
+                f"/api/v1/task/tasks/{task_id}",
+                data={
+                    "owner_id": owner_id,
+                    "title": "Updated Task Title",
+                    "description": "Updated description",
+                    "category": "high",
+                    "due_date": "2024-06-20T10:00:00Z",
+                },
+                headers={"If-Match": '"4"'},
+            )
+    assert response.status_code == status.HTTP_412_PRECONDITION_FAILED
+    assert response.headers["ETag"] == '"5"'
+
+
+@pytest.mark.asyncio
+async def test_update_task_requires_if_match(get_db):
+    token_data = {"id": "1", "role": "admin"}
+    mock_token_data = TokenData(id="1", role="admin")
+    token = create_access_token(token_data)
+
+    client.cookies["token"] = token
+
+    with patch("app.core.security.get_token_data", return_value=mock_token_data):
+        response = client.put(
+            "/api/v1/task/tasks/1",
+            data={
+                "owner_id": 1,
+                "title": "Updated Task Title",
+                "description": "Updated description",
+                "category": "high",
+                "due_date": "2024-06-20T10:00:00Z",
+            },
+        )
+    assert response.status_code == status.HTTP_428_PRECONDITION_REQUIRED
 
 
 @pytest.mark.asyncio
@@ -430,95 +440,58 @@ async def test_update_task_status_success(get_db):
     mock_token_data = TokenData(id="1", role="admin")
     token = create_access_token(token_data)
 
-    mock_task = TaskInDB(
-        id=task_id,
-        title="a testing task",
-        description="testing the update method",
-        status=False,
-        delete_request=False,
-        reminder_sent=False,
-        owner_id=owner_id,
-        category="low",
-        due_date=datetime.now(timezone.utc),
-        created_at=datetime.now(timezone.utc),
-    )
-
-    async def mock_get_by_id(db, id=task_id):
-        return mock_task
-
-    async def mock_update_task_status(db, db_obj, obj_in):
-        updated_task_data = {
-            "title": db_obj.title,
-            "description": db_obj.description,
-            "due_date": db_obj.due_date,
-            "category": db_obj.category,
-            "owner_id": db_obj.owner_id,
-            "status": obj_in.get("status"),
-            "id": db_obj.id,
-            "delete_request": db_obj.delete_request,
-        }
-        updated_task = TaskInDB(**updated_task_data)
-        return updated_task
+    async def mock_update_if_match(db, id, versions, values, owner_id=None):
+        updated_task = TaskInDB(
+            id=id,
+            title="a testing task",
+            description="testing the update method",
+            status=values["status"],
+            delete_request=False,
+            owner_id=1,
+            category="low",
+            version=2,
+        )
+        return updated_task, 1
 
     client.cookies["token"] = token
 
-    with patch("app.db.crud.crud_task.task_crud.get_by_id", new=mock_get_by_id):
-        with patch("app.core.security.get_token_data", return_value=mock_token_data):
-            with patch(
-                "app.db.crud.crud_task.task_crud.update", new=mock_update_task_status
-            ):
-                response = client.put(
-                    f"/api/v1/task/change-status/{task_id}",
-                    data={"status": status_value},
-                )
+    with patch("app.core.security.get_token_data", return_value=mock_token_data):
+        with patch(
+            "app.db.crud.crud_task.task_crud.update_if_match", new=mock_update_if_match
+        ):
+            response = client.put(
+                f"/api/v1/task/change-status/{task_id}",
+                data={"status": status_value},
+                headers={"If-Match": "*"},
+            )
 
     assert response.status_code == status.HTTP_200_OK
+    assert response.json()["status"] is True
+    assert response.headers["ETag"] == '"2"'
 
 
 @pytest.mark.asyncio
 async def test_update_task_status_error(get_db):
     task_id = "1"
     status_value = "True"
-    owner_id = 1
     token_data = {"id": "1", "role": "admin"}
     mock_token_data = TokenData(id="1", role="admin")
     token = create_access_token(token_data)
 
-    mock_task = TaskInDB(
-        id=task_id,
-        title="a testing task",
-        description="testing the update method",
-        status=False,
-        delete_request=False,
-        reminder_sent=False,
-        owner_id=owner_id,
-        category="low",
-        due_date=datetime.now(timezone.utc),
-        created_at=datetime.now(timezone.utc),
-    )
-
-    async def mock_get_by_id(db, id=task_id):
-        return mock_task
-
-    async def mock_update_task_status(db, db_obj, obj_in):
-        updated_task_data = {
-            "status": db_obj.status,
-            "id": db_obj.id,
-        }
-        updated_task = TaskInDB(**updated_task_data)
-        return updated_task
+    async def mock_update_if_match(db, id, versions, values, owner_id=None):
+        raise Exception("Database error")
 
     client.cookies["token"] = token
 
-    with patch("app.db.crud.crud_task.task_crud.get_by_id", new=mock_get_by_id):
-        with patch("app.core.security.get_token_data", return_value=mock_token_data):
-            with patch(
-                "app.db.crud.crud_task.task_crud.update", new=mock_update_task_status
-            ):
-                response = client.put(
-                    f"/api/v1/task/change-status/{task_id}",
-                    data={"status": status_value},
-                )
+    with patch("app.core.security.get_token_data", return_value=mock_token_data):
+        with patch(
+            "app.db.crud.crud_task.task_crud.update_if_match", new=mock_update_if_match
+        ):
+            response = client.put(
+                f"/api/v1/task/change-status/{task_id}",
+                data={"status": status_value},
+                headers={"If-Match": '"1"'},
+            )
 
     assert response.status_code == status.HTTP_500_INTERNAL_SERVER_ERROR
 
@@ -527,50 +500,22 @@ async def test_update_task_status_error(get_db):
 async def test_update_task_status_unauthorized(get_db):
     task_id = "1"
     status_value = "True"
-    owner_id = 1
     mock_token_data = None
 
-    mock_task = TaskInDB(
-        id=task_id,
-        title="a testing task",
-        description="testing the update method",
-        status=False,
-        delete_request=False,
-        reminder_sent=False,
-        owner_id=owner_id,
-        category="low",
-        due_date=datetime.now(timezone.utc),
-        created_at=datetime.now(timezone.utc),
-    )
-
-    async def mock_get_by_id(db, id=task_id):
-        return mock_task
-
-    async def mock_update_task_status(db, db_obj, obj_in):
-        updated_task_data = {
-            "title": db_obj.title,
-            "description": db_obj.description,
-            "due_date": db_obj.due_date,
-            "category": db_obj.category,
-            "owner_id": db_obj.owner_id,
-            "status": db_obj.status,
-            "id": db_obj.id,
-            "delete_request": db_obj.delete_request,
-        }
-        updated_task = TaskInDB(**updated_task_data)
-        return updated_task
+    async def mock_update_if_match(db, id, versions, values, owner_id=None):
+        raise AssertionError("update must not run without a token")
 
     client.cookies["token"] = None
 
-    with patch("app.db.crud.crud_task.task_crud.get_by_id", new=mock_get_by_id):
-        with patch("app.core.security.get_token_data", return_value=mock_token_data):
-            with patch(
-                "app.db.crud.crud_task.task_crud.update", new=mock_update_task_status
-            ):
-                response = client.put(
-                    f"/api/v1/task/change-status/{task_id}",
-                    data={"status": status_value},
-                )
+    with patch("app.core.security.get_token_data", return_value=mock_token_data):
+        with patch(
+            "app.db.crud.crud_task.task_crud.update_if_match", new=mock_update_if_match
+        ):
+            response = client.put(
+                f"/api/v1/task/change-status/{task_id}",
+                data={"status": status_value},
+                headers={"If-Match": '"1"'},
+            )
 
     assert response.status_code == status.HTTP_401_UNAUTHORIZED
 
@@ -711,3 +656,188 @@ async def test_delete_request_error(get_db):
     assert response.status_code == status.HTTP_500_INTERNAL_SERVER_ERROR
 
 
+
+
+STATS = {
+    "total": 5,
+    "done": 2,
+    "low": 1,
+    "medium": 3,
+    "high": 1,
+    "overdue": 1,
+    "delete_requested": 0,
+    "archived": 4,
+}
+
+
+def test_read_task_stats_admin_totals():
+    client.cookies["token"] = create_access_token({"id": "1", "role": "admin"})
+
+    async def mock_get_totals(db):
+        return dict(STATS)
+
+    with patch(
+        "app.db.crud.crud_task_stats.task_stats_crud.get_totals", new=mock_get_totals
+    ):
+        response = client.get("/api/v1/task/stats")
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json() == {**STATS, "open": 3}
+
+
+def test_read_task_stats_other_user_forbidden():
+    client.cookies["token"] = create_access_token({"id": "2", "role": "user"})
+
+    with patch(
+        "app.core.security.jwt.decode", return_value={"user_id": 2, "role": "user"}
+    ):
+        response = client.get("/api/v1/task/stats", params={"user_id": 3})
+
+    assert response.status_code == status.HTTP_403_FORBIDDEN
+
+
+def test_read_task_analytics_cached():
+    client.cookies["token"] = create_access_token({"id": "1", "role": "admin"})
+    calls = []
+
+    async def mock_summary(db, *, days):
+        calls.append(days)
+        return {
+            "days": days,
+            "created": 3,
+            "completed": 1,
+            "lead_time_seconds": {"p50": 60.0, "p75": 60.0, "p90": 60.0, "p99": 60.0, "mean": 60.0},
+            "daily": [{"date": "2024-06-01", "created": 3, "completed": 1}],
+            "categories": [
+                {"category": "low", "created": 3, "completed": 1, "lead_time_seconds": None}
+            ],
+        }
+
+    analytics_cache.clear()
+    with patch(
+        "app.db.crud.crud_task_analytics.task_analytics_crud.summary", new=mock_summary
+    ):
+        first = client.get("/api/v1/task/analytics", params={"days": 10000})
+        second = client.get("/api/v1/task/analytics", params={"days": 10000})
+
+    assert first.status_code == status.HTTP_200_OK
+    assert second.json() == first.json()
+    assert first.json()["categories"][0]["category"] == "low"
+    assert calls == [365]
+
+
+def test_read_task_analytics_admin_only():
+    client.cookies["token"] = create_access_token({"id": "2", "role": "user"})
+
+    with patch(
+        "app.core.security.jwt.decode", return_value={"user_id": 2, "role": "user"}
+    ):
+        response = client.get("/api/v1/task/analytics")
+
+    assert response.status_code == status.HTTP_403_FORBIDDEN
+
+
+def test_filter_tasks_with_facets():
+    client.cookies["token"] = create_access_token({"id": "1", "role": "admin"})
+    facets = {
+        "status": {"done": 2, "open": 1},
+        "category": {"low": 1, "medium": 0, "high": 2},
+        "overdue": 1,
+    }
+
+    async def mock_filter_tasks_with_facets(db, **kwargs):
+        return [{"id": 1, "title": "Task"}], 3, facets
+
+    with patch(
+        "app.db.crud.crud_task.task_crud.filter_tasks_with_facets",
+        new=mock_filter_tasks_with_facets,
+    ):
+        response = client.get(
+            "/api/v1/task/filter/", params={"facets": "true", "fields": "id,title"}
+        )
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json()["facets"] == facets
+    assert response.json()["tasks"] == [{"id": 1, "title": "Task"}]
+
+
+def test_suggest_task_titles_cached_per_prefix():
+    client.cookies["token"] = create_access_token({"id": "1", "role": "admin"})
+    calls = []
+
+    async def mock_suggest_titles(db, *, user_id, prefix, limit):
+        calls.append(prefix)
+        return ["Fix budget", "Fix report"]
+
+    async def mock_write_version(db, *, owner_id):
+        return 0
+
+    suggest_cache.cache.clear()
+    with patch(
+        "app.db.crud.crud_task.task_crud.suggest_titles", new=mock_suggest_titles
+    ), patch(
+        "app.db.crud.crud_task_stats.task_stats_crud.write_version", new=mock_write_version
+    ):
+        first = client.get("/api/v1/task/suggest", params={"prefix": "fi", "limit": 1})
+        second = client.get("/api/v1/task/suggest", params={"prefix": "fix r"})
+
+    assert first.json() == ["Fix budget"]
+    assert second.json() == ["Fix report"]
+    assert calls == ["fi"]
+
+
+def test_search_tasks_cached_until_a_write():
+    client.cookies["token"] = create_access_token({"id": "1", "role": "admin"})
+    calls = []
+
+    async def mock_search(db, query, user_id, admin, skip, limit, fields=None, include_archived=False):
+        calls.append(query)
+        return [{"id": 1, "title": "Fix report"}], 1
+
+    stored_versions = [0]
+
+    async def mock_write_version(db, *, owner_id):
+        return stored_versions[-1]
+
+    search_cache.cache.clear()
+    with patch("app.db.crud.crud_task.task_crud.search", new=mock_search), patch(
+        "app.db.crud.crud_task_stats.task_stats_crud.write_version", new=mock_write_version
+    ):
+        first = client.get("/api/v1/task/search/", params={"query": "Fix", "fields": "id,title"})
+        second = client.get("/api/v1/task/search/", params={"query": "fix", "fields": "id,title"})
+        task_versions.bump(2)
+        third = client.get("/api/v1/task/search/", params={"query": "fix", "fields": "id,title"})
+        # A write saved by another worker only moves the stored version.
+        stored_versions.append(1)
+        fourth = client.get("/api/v1/task/search/", params={"query": "FIX", "fields": "id,title"})
+
+    assert first.json() == second.json() == third.json() == fourth.json()
+    assert first.json()["tasks"] == [{"id": 1, "title": "Fix report"}]
+    assert calls == ["Fix", "fix", "FIX"]
+
+
+def test_read_tasks_negotiates_msgpack():
+    client.cookies["token"] = create_access_token({"id": "1", "role": "admin"})
+
+    async def mock_get_multi_with_query(db, **kwargs):
+        return [{"id": 1, "category": "high"}, {"id": 2, "category": "low"}], 2
+
+    with patch(
+        "app.db.crud.crud_task.task_crud.get_multi_with_query",
+        new=mock_get_multi_with_query,
+    ):
+        response = client.get(
+            "/api/v1/task/tasks/",
+            params={"fields": "id,category", "skip": 40},
+            headers={"Accept": "application/msgpack"},
+        )
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.headers["content-type"] == "application/msgpack"
+    assert msgpack.unpackb(response.content) == {
+        "columns": {"id": [1, 2], "category": [2, 0]},
+        "categories": ["low", "medium", "high"],
+        "total": 2,
+        "skip": 40,
+        "limit": 8,
+    }
@@ -0,0 +1,88 @@
+"""Archiving must not change what a read with include_archived returns."""
+
+from datetime import timedelta
+
+import pytest
+import pytest_asyncio
+from sqlalchemy import func, select
+
+from app.db.crud.crud_task import task_crud
+from app.model.base_model import Task, TaskArchive, TaskTombstone
+from app.schema.task_schema import TASK_FIELDS
+from app.util.seed import SeedOptions
+
+pytestmark = pytest.mark.postgres
+
+SEED = SeedOptions(users=10, tasks=2000, seed=5, password_hash="x")
+
+
+@pytest_asyncio.fixture
+async def session(seeded_session):
+    return await seeded_session(SEED)
+
+
+async def archive_all(db, batch_size):
+    moved = total = batch_size
+    while moved == batch_size:
+        moved = await task_crud.archive_completed(
+            db, older_than=timedelta(days=1), batch_size=batch_size
+        )
+        total += moved
+    return total - batch_size
+
+
+@pytest.mark.asyncio
+async def test_archiver_moves_only_old_completed_tasks(session):
+    cutoff = func.timezone("utc", func.now()) - timedelta(days=1)
+    done = select(func.count()).select_from(Task).where(
+        Task.status == True, Task.completed_at < cutoff
+    )
+    expected = await session.scalar(done)
+    before = await session.scalar(select(func.count()).select_from(Task))
+
+    moved = await archive_all(session, batch_size=150)
+
+    assert moved == expected > 0
+    assert await session.scalar(done) == 0
+    assert await session.scalar(select(func.count()).select_from(TaskArchive)) == moved
+    assert await session.scalar(select(func.count()).select_from(Task)) == before - moved
+
+
+@pytest.mark.asyncio
+async def test_archived_tasks_are_reported_deleted_by_the_changes_feed(session):
+    moved = await archive_all(session, batch_size=500)
+
+    archived = select(TaskArchive.id, TaskArchive.owner_id)
+    tombstoned = select(TaskTombstone.task_id, TaskTombstone.owner_id)
+    assert moved > 0
+    assert set(await session.execute(archived)) == set(await session.execute(tombstoned))
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "read",
+    [
+        lambda db, **kw: task_crud.get_multi_with_query(
+            db, user_id=2, query=None, skip=3, limit=50, **kw
+        ),
+        lambda db, **kw: task_crud.get_multi_with_query(
+            db, user_id=None, query="re", skip=0, limit=200, **kw
+        ),
+        lambda db, **kw: task_crud.search(
+            db, query="re", user_id=3, admin=False, limit=100, **kw
+        ),
+        lambda db, **kw: task_crud.filter_tasks(
+            db, user_id="4", user_role="user", task_status="true", admin=False, limit=100, **kw
+        ),
+    ],
+)
+async def test_include_archived_reads_match_reads_before_archiving(session, read):
+    before, before_total = await read(session, fields=TASK_FIELDS)
+
+    await archive_all(session, batch_size=500)
+    _, hot_total = await read(session)
+    union, union_total = await read(session, include_archived=True)
+
+    assert union_total == before_total
+    assert union == before
+    assert hot_total <= before_total
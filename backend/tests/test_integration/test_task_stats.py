@@ -0,0 +1,101 @@
+"""user_task_stats must agree with a recount after every kind of task write."""
+
+from datetime import timedelta
+
+import pytest
+import pytest_asyncio
+from sqlalchemy import func, select, update
+
+from app.db.crud.crud_task import task_crud
+from app.db.crud.crud_task_stats import task_stats_crud
+from app.model.base_model import Category, Task, UserTaskStats
+from app.schema.task_schema import TaskCreate
+from app.util.seed import SeedOptions
+
+pytestmark = pytest.mark.postgres
+
+SEED = SeedOptions(users=10, tasks=2000, seed=11, password_hash="x")
+
+
+@pytest_asyncio.fixture
+async def session(seeded_session):
+    return await seeded_session(SEED)
+
+
+async def assert_in_sync(db):
+    corrected = await task_stats_crud.reconcile(db, first=0, last=SEED.users + 1)
+    assert corrected == 0
+
+
+@pytest.mark.asyncio
+async def test_seeded_stats_match_tasks(session):
+    await assert_in_sync(session)
+
+    totals = await task_stats_crud.get_totals(session)
+    assert totals["total"] == SEED.tasks
+    assert totals["done"] == await session.scalar(
+        select(func.count()).select_from(Task).where(Task.status == True)
+    )
+    assert totals["low"] + totals["medium"] + totals["high"] == SEED.tasks
+
+
+@pytest.mark.asyncio
+async def test_writes_keep_stats_in_sync(session):
+    before = await task_stats_crud.get(session, owner_id=2)
+
+    task = await task_crud.create(
+        session,
+        obj_in=TaskCreate(title="stats", owner_id=2, category=Category.HIGH),
+    )
+    task_id = task.id
+    after_create = await task_stats_crud.get(session, owner_id=2)
+    assert after_create["total"] == before["total"] + 1
+    assert after_create["high"] == before["high"] + 1
+
+    await task_crud.update_if_match(
+        session, id=task_id, versions=None, values={"owner_id": 3, "status": True}
+    )
+    await session.commit()
+    await session.execute(
+        update(Task).where(Task.owner_id == 4).values(delete_request=True)
+    )
+    await session.commit()
+    await task_crud.remove(session, id=task_id)
+    assert await task_stats_crud.get(session, owner_id=2) == before
+
+    await task_crud.archive_completed(
+        session, older_than=timedelta(days=1), batch_size=300
+    )
+    archived = await task_stats_crud.get(session, owner_id=2)
+    assert archived["archived"] > 0
+    assert archived["done"] == before["done"] - archived["archived"]
+    await assert_in_sync(session)
+
+
+@pytest.mark.asyncio
+async def test_write_versions_move_with_each_write(session):
+    owner = await task_stats_crud.write_version(session, owner_id=2)
+    other = await task_stats_crud.write_version(session, owner_id=3)
+    table = await task_stats_crud.write_version(session, owner_id=None)
+
+    await session.execute(update(Task).where(Task.owner_id == 2).values(title="renamed"))
+    await session.commit()
+    await session.execute(update(Task).where(Task.id == -1).values(title="nothing"))
+    await session.commit()
+
+    assert await task_stats_crud.write_version(session, owner_id=2) == owner + 1
+    assert await task_stats_crud.write_version(session, owner_id=3) == other
+    assert await task_stats_crud.write_version(session, owner_id=None) == table + 1
+
+
+@pytest.mark.asyncio
+async def test_reconcile_corrects_drift(session):
+    await session.execute(
+        update(UserTaskStats)
+        .where(UserTaskStats.owner_id == 2)
+        .values(total=0, done=999)
+    )
+    await session.commit()
+
+    assert await task_stats_crud.reconcile(session, first=0, last=SEED.users + 1) == 1
+    await assert_in_sync(session)
@@ -0,0 +1,112 @@
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import pytest
+from fastapi import HTTPException
+
+from app.core import admission
+from app.core.admission import HashingGate, TokenBucketTable, hashing_admission
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def make_gate(concurrency=1, max_waiting=1, burst=100.0):
+    clock = FakeClock()
+    return HashingGate(
+        concurrency=concurrency,
+        max_waiting=max_waiting,
+        retry_after=3,
+        per_client=TokenBucketTable(64, rate=1.0, burst=burst, clock=clock),
+        per_username=TokenBucketTable(64, rate=1.0, burst=burst, clock=clock),
+    )
+
+
+def test_bucket_allows_burst_then_reports_wait():
+    clock = FakeClock()
+    table = TokenBucketTable(16, rate=0.5, burst=2, clock=clock)
+
+    assert table.take("a") == 0
+    assert table.take("a") == 0
+    assert table.take("a") == pytest.approx(2.0)
+
+
+def test_bucket_refills_over_time():
+    clock = FakeClock()
+    table = TokenBucketTable(16, rate=1.0, burst=1, clock=clock)
+
+    table.take("a")
+    clock.now = 1.0
+
+    assert table.take("a") == 0
+
+
+def test_bucket_memory_is_fixed():
+    table = TokenBucketTable(8, rate=1.0, burst=1)
+
+    for i in range(1000):
+        table.take(str(i))
+
+    assert len(table._tokens) == 8
+
+
+def test_rate_limit_raises_429_with_retry_after():
+    gate = make_gate(burst=1)
+
+    gate.check_rate("1.2.3.4", "alice")
+    with pytest.raises(HTTPException) as exc:
+        gate.check_rate("1.2.3.4", "alice")
+
+    assert exc.value.status_code == 429
+    assert exc.value.headers["Retry-After"] == "1"
+    assert gate.stats.rate_limited == 1
+
+
+def test_gate_sheds_a_burst_before_it_reaches_hashing():
+    gate = make_gate(concurrency=1, max_waiting=1)
+
+    # Two requests admitted, neither has started hashing yet.
+    gate.admit()
+    gate.admit()
+    with pytest.raises(HTTPException) as exc:
+        gate.admit()
+
+    assert exc.value.status_code == 503
+    assert exc.value.headers["Retry-After"] == "3"
+
+    gate.release()
+    gate.admit()
+    assert gate.snapshot()["admitted"] == 3
+    assert gate.snapshot()["overloaded"] == 1
+    assert gate.pending == 2
+
+
+@pytest.mark.asyncio
+async def test_admission_dependency_releases_its_slot():
+    gate = make_gate(concurrency=1, max_waiting=0)
+    request = SimpleNamespace(client=SimpleNamespace(host="1.2.3.4"))
+
+    with patch.object(admission, "hashing_gate", gate):
+        dependency = hashing_admission()(request)
+        await dependency.__anext__()
+        assert gate.pending == 1
+        with pytest.raises(HTTPException):
+            gate.admit()
+        await dependency.aclose()
+
+    assert gate.pending == 0
+
+
+@pytest.mark.asyncio
+async def test_run_holds_a_slot_only_while_hashing():
+    gate = make_gate(concurrency=1, max_waiting=0)
+
+    assert await gate.run(lambda value: value * 2, 21) == 42
+
+    assert gate.active == 0
+    assert not gate._semaphore.locked()
@@ -0,0 +1,147 @@
+import pytest
+
+from app.core.cache import PrefixCache, SearchCache, TaskVersions, TTLCache, normalize_query
+from app.core.coalesce import SingleFlight
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_entry_expires_after_ttl():
+    clock = FakeClock()
+    cache = TTLCache(ttl=10, clock=clock)
+    cache.put("a", 1)
+
+    clock.now = 9.9
+    assert cache.get("a") == 1
+    clock.now = 10.0
+    assert cache.get("a") is None
+    assert cache.snapshot()["entries"] == 0
+
+
+def test_oldest_entry_evicted_when_full():
+    cache = TTLCache(ttl=10, max_entries=2, clock=FakeClock())
+    cache.put("a", 1)
+    cache.put("b", 2)
+    cache.put("a", 3)
+    cache.put("c", 4)
+
+    assert cache.get("b") is None
+    assert cache.get("a") == 3
+    assert cache.get("c") == 4
+    assert cache.stats.evictions == 1
+
+
+def test_stats_count_hits_and_misses():
+    cache = TTLCache(ttl=10, clock=FakeClock())
+    cache.get("a")
+    cache.put("a", 0)
+    cache.get("a")
+
+    assert (cache.stats.hits, cache.stats.misses) == (1, 1)
+
+
+def test_prefix_cache_narrows_complete_lists():
+    cache = PrefixCache(TTLCache(ttl=10, clock=FakeClock()), complete_below=3)
+    cache.put(1, "Fi", ["Fix budget", "Fix report"])
+
+    assert cache.get(1, "fix r") == ["Fix report"]
+    assert cache.get(2, "fix r") is None
+    assert cache.narrowed == 1
+
+
+def test_prefix_cache_does_not_narrow_truncated_lists():
+    cache = PrefixCache(TTLCache(ttl=10, clock=FakeClock()), complete_below=2)
+    cache.put(1, "fi", ["Fix budget", "Fix report"])
+
+    assert cache.get(1, "fix r") is None
+
+
+def test_task_versions_scope_owner_and_table():
+    versions = TaskVersions()
+    before = versions.of(1), versions.of(2), versions.of(None)
+    versions.bump(1)
+
+    assert versions.of(1) != before[0]
+    assert versions.of(2) == before[1]
+    assert versions.of(None) != before[2]
+
+
+def test_normalize_query_folds_ascii_only():
+    assert normalize_query("Fix Report") == "fix report"
+    assert normalize_query("Ärger") == "Ärger"
+    assert normalize_query(None) == ""
+
+
+def stored(version):
+    async def read_version():
+        return version
+
+    return read_version
+
+
+@pytest.mark.asyncio
+async def test_search_cache_serves_hits_without_loading():
+    cache = SearchCache(TTLCache(ttl=10, clock=FakeClock()), TaskVersions(), SingleFlight())
+    calls = 0
+
+    async def load():
+        nonlocal calls
+        calls += 1
+        return 0, (["page"], 1)
+
+    async def unread_version():
+        raise AssertionError("a miss reads the version in its load")
+
+    await cache.get_or_load("search", "q", 1, unread_version, load)
+
+    assert await cache.get_or_load("search", "q", 1, stored(0), load) == (["page"], 1)
+    assert calls == 1
+
+
+@pytest.mark.asyncio
+async def test_search_cache_misses_after_owner_write():
+    versions = TaskVersions()
+    cache = SearchCache(TTLCache(ttl=10, clock=FakeClock()), versions, SingleFlight())
+    pages = iter([(0, (["old"], 1)), (0, (["new"], 1))])
+
+    async def load():
+        return next(pages)
+
+    await cache.get_or_load("search", "q", 1, stored(0), load)
+    versions.bump(1)
+
+    assert await cache.get_or_load("search", "q", 1, stored(0), load) == (["new"], 1)
+
+
+@pytest.mark.asyncio
+async def test_search_cache_misses_after_a_write_by_another_worker():
+    cache = SearchCache(TTLCache(ttl=10, clock=FakeClock()), TaskVersions(), SingleFlight())
+    pages = iter([(4, (["old"], 1)), (5, (["new"], 1))])
+
+    async def load():
+        return next(pages)
+
+    await cache.get_or_load("search", "q", 1, stored(4), load)
+
+    assert await cache.get_or_load("search", "q", 1, stored(5), load) == (["new"], 1)
+    assert await cache.get_or_load("search", "q", 1, stored(5), load) == (["new"], 1)
+
+
+@pytest.mark.asyncio
+async def test_search_cache_does_not_store_results_raced_by_a_write():
+    versions = TaskVersions()
+    cache = SearchCache(TTLCache(ttl=10, clock=FakeClock()), versions, SingleFlight())
+
+    async def load():
+        versions.bump(1)
+        return 0, (["stale"], 1)
+
+    await cache.get_or_load("search", "q", 1, stored(0), load)
+
+    assert cache.cache.snapshot()["entries"] == 0
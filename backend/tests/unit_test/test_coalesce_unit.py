@@ -0,0 +1,90 @@
+import asyncio
+
+import pytest
+
+from app.core.coalesce import SingleFlight
+
+
+@pytest.mark.asyncio
+async def test_concurrent_identical_loads_run_once():
+    flights = SingleFlight()
+    calls = 0
+
+    async def load():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0)
+        return ["page"], 1
+
+    results = await asyncio.gather(*(flights.run("tasks", "q", load) for _ in range(5)))
+
+    assert results == [(["page"], 1)] * 5
+    assert calls == 1
+    assert flights.snapshot() == {
+        "in_flight": 0,
+        "saved": 4,
+        "endpoints": {"tasks": {"loads": 1, "coalesced": 4, "failures": 0}},
+    }
+
+
+@pytest.mark.asyncio
+async def test_sequential_and_distinct_loads_are_not_shared():
+    flights = SingleFlight()
+    calls = []
+
+    async def load(key):
+        calls.append(key)
+        await asyncio.sleep(0)
+        return key
+
+    await asyncio.gather(flights.run("tasks", 1, lambda: load(1)), flights.run("tasks", 2, lambda: load(2)))
+    await flights.run("tasks", 1, lambda: load(1))
+
+    assert calls == [1, 2, 1]
+
+
+@pytest.mark.asyncio
+async def test_errors_are_shared_and_not_kept():
+    flights = SingleFlight()
+    calls = 0
+
+    async def load():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0)
+        raise RuntimeError("down")
+
+    results = await asyncio.gather(
+        *(flights.run("tasks", "q", load) for _ in range(3)), return_exceptions=True
+    )
+
+    assert calls == 1
+    assert all(isinstance(result, RuntimeError) for result in results)
+    with pytest.raises(RuntimeError):
+        await flights.run("tasks", "q", load)
+    assert calls == 2
+    assert flights.stats["tasks"].failures == 2
+
+
+@pytest.mark.asyncio
+async def test_waiter_retries_when_the_loading_caller_is_cancelled():
+    flights = SingleFlight()
+    started = asyncio.Event()
+    calls = 0
+
+    async def load():
+        nonlocal calls
+        calls += 1
+        if calls == 1:
+            started.set()
+            await asyncio.sleep(10)
+        return "page"
+
+    leader = asyncio.create_task(flights.run("tasks", "q", load))
+    await started.wait()
+    follower = asyncio.create_task(flights.run("tasks", "q", load))
+    await asyncio.sleep(0)
+    leader.cancel()
+
+    assert await follower == "page"
+    assert calls == 2
@@ -1,7 +1,14 @@
 from unittest.mock import Mock, patch
 from fastapi import HTTPException
 import pytest
-from app.core.dependency import admin_role_check, check_user_active
+from app.core.dependency import (
+    admin_role_check,
+    check_user_active,
+    if_match_versions,
+    task_etag,
+    task_fields,
+    task_list_format,
+)
 from app.core.security import get_current_user
 from app.model.base_model import User
 from app.schema.auth_schema import TokenData
@@ -57,3 +64,52 @@ async def test_check_user_active_inactive():
         await check_user_active(user)
     assert exc_info.value.status_code == 403
     assert exc_info.value.detail == "User is not active"
+
+
+def test_task_fields_parses_and_deduplicates():
+    assert task_fields("id, title,id,status") == task_fields("status,title,id")
+    assert sorted(task_fields("id, title,id,status")) == ["id", "status", "title"]
+    assert task_fields(None) is None
+    assert task_fields(" ") is None
+
+
+def test_task_fields_rejects_unknown_fields():
+    with pytest.raises(HTTPException) as exc_info:
+        task_fields("id,password")
+    assert exc_info.value.status_code == 400
+
+
+def test_if_match_parses_strong_etags():
+    assert if_match_versions(task_etag(3)) == (3,)
+    assert if_match_versions('"3", W/"4", "5"') == (3, 5)
+    assert if_match_versions(" * ") is None
+
+
+def test_if_match_is_required():
+    with pytest.raises(HTTPException) as exc_info:
+        if_match_versions(None)
+    assert exc_info.value.status_code == 428
+
+
+def test_if_match_without_usable_etag_fails_precondition():
+    with pytest.raises(HTTPException) as exc_info:
+        if_match_versions('W/"3"')
+    assert exc_info.value.status_code == 412
+
+
+@pytest.mark.parametrize(
+    "accept, expected",
+    [
+        (None, "application/json"),
+        ("application/msgpack", "application/msgpack"),
+        ("application/x-msgpack", "application/msgpack"),
+        ("text/html, application/vnd.todo.columnar+json", "application/vnd.todo.columnar+json"),
+        ("application/json;q=0.5, application/msgpack;q=0.9", "application/msgpack"),
+        ("*/*, application/msgpack", "application/msgpack"),
+        ("application/json, application/msgpack", "application/json"),
+        ("application/msgpack;q=0", "application/json"),
+        ("image/png", "application/json"),
+    ],
+)
+def test_task_list_format_negotiates_accept(accept, expected):
+    assert task_list_format(accept) == expected
@@ -0,0 +1,89 @@
+import asyncio
+
+import pytest
+
+from app.core.events import (
+    HEARTBEAT,
+    RESYNC,
+    TASK_DELETE_REQUESTED,
+    TASK_UPDATED,
+    EventBroker,
+    Subscription,
+)
+
+
+@pytest.mark.asyncio
+async def test_queued_events_are_sent_as_one_chunk():
+    subscription = Subscription(user_id=1, admin=False, max_pending=10)
+
+    subscription.push(b"a")
+    subscription.push(b"b")
+
+    assert await subscription.next_chunk(timeout=1) == b"ab"
+
+
+@pytest.mark.asyncio
+async def test_idle_stream_gets_heartbeat():
+    subscription = Subscription(user_id=1, admin=False, max_pending=10)
+
+    assert await subscription.next_chunk(timeout=0.01) == HEARTBEAT
+
+
+@pytest.mark.asyncio
+async def test_waiting_reader_is_woken_by_push():
+    subscription = Subscription(user_id=1, admin=False, max_pending=10)
+    reader = asyncio.create_task(subscription.next_chunk(timeout=5))
+    await asyncio.sleep(0)
+
+    subscription.push(b"event")
+
+    assert await reader == b"event"
+
+
+@pytest.mark.asyncio
+async def test_slow_reader_is_told_to_resync():
+    subscription = Subscription(user_id=1, admin=False, max_pending=2)
+
+    assert subscription.push(b"1")
+    assert subscription.push(b"2")
+    assert not subscription.push(b"3")
+    assert not subscription.push(b"4")
+
+    assert await subscription.next_chunk(timeout=1) == RESYNC
+    assert subscription.push(b"5")
+    assert await subscription.next_chunk(timeout=1) == b"5"
+
+
+def test_events_reach_owner_and_admins_only_for_delete_requests():
+    broker = EventBroker(max_pending=10)
+    owner = broker.subscribe(1, admin=False)
+    other = broker.subscribe(2, admin=False)
+    admin = broker.subscribe(3, admin=True)
+
+    broker.publish(TASK_UPDATED, {"id": 5}, owner_id=1)
+    broker.publish(TASK_DELETE_REQUESTED, {"id": 5}, owner_id=1, to_admins=True)
+
+    assert len(owner._pending) == 2
+    assert other._pending is None
+    assert len(admin._pending) == 1
+    assert broker.stats.delivered == 3
+
+
+@pytest.mark.asyncio
+async def test_stream_unsubscribes_when_closed():
+    broker = EventBroker(max_pending=10)
+    stream = broker.stream(1, admin=True, heartbeat=0.01)
+
+    assert await stream.__anext__() == b"retry: 3000\n\n"
+    assert broker.snapshot()["streams"] == 1
+
+    await stream.aclose()
+
+    assert broker.snapshot() == {
+        "published": 0,
+        "delivered": 0,
+        "dropped": 0,
+        "users": 0,
+        "streams": 0,
+        "admin_streams": 0,
+    }
@@ -0,0 +1,76 @@
+import pytest
+
+from app.util import hash as hash_module
+from app.util.hash import (
+    async_hash_password,
+    calibrate_rounds,
+    current_rounds,
+    hash_rounds,
+    needs_rehash,
+    set_rounds,
+    verify_password,
+)
+
+
+@pytest.fixture(autouse=True)
+def restore_rounds():
+    state = hash_module._rounds, hash_module._calibrated, hash_module._target
+    yield
+    hash_module._rounds, hash_module._calibrated, hash_module._target = state
+
+
+def test_calibrate_picks_highest_cost_within_budget():
+    # 20ms at cost 10 -> 40ms at 11 -> 80ms at 12 -> 160ms at 13
+    rounds, estimated_ms = calibrate_rounds(
+        100, min_rounds=10, max_rounds=14, measure=lambda r: 20.0
+    )
+
+    assert (rounds, estimated_ms) == (12, 80.0)
+    assert current_rounds() == 12
+
+
+def test_calibrate_respects_bounds():
+    assert calibrate_rounds(10_000, min_rounds=10, max_rounds=13, measure=lambda r: 1.0)[0] == 13
+    assert calibrate_rounds(1, min_rounds=10, max_rounds=13, measure=lambda r: 50.0)[0] == 10
+
+
+def test_new_hashes_use_current_cost():
+    set_target_rounds(4)
+
+    hashed = async_hash_password("secret")
+
+    assert hash_rounds(hashed) == 4
+    assert verify_password("secret", hashed)
+    assert not needs_rehash(hashed)
+
+
+def test_hash_at_lower_cost_needs_rehash():
+    set_target_rounds(4)
+    hashed = async_hash_password("secret")
+
+    set_target_rounds(5)
+
+    assert needs_rehash(hashed)
+
+
+def test_hash_at_higher_cost_needs_rehash():
+    set_target_rounds(5)
+    hashed = async_hash_password("secret")
+
+    set_target_rounds(4)
+
+    assert needs_rehash(hashed)
+
+
+def test_no_rehash_before_the_cluster_cost_is_known():
+    hash_module._target = None
+    set_rounds(4)
+    hashed = async_hash_password("secret")
+
+    set_rounds(5)
+
+    assert not needs_rehash(hashed)
+
+
+def test_hash_rounds_of_malformed_hash():
+    assert hash_rounds("not-a-hash") is None
@@ -0,0 +1,47 @@
+import json
+
+from app.db.plans import PlanShape, plan_regressions, plan_shape
+
+EXPLAINED = [
+    {
+        "Plan": {
+            "Node Type": "Limit",
+            "Plan Rows": 8,
+            "Actual Rows": 8,
+            "Shared Hit Blocks": 10,
+            "Shared Read Blocks": 2,
+            "Plans": [
+                {
+                    "Node Type": "Index Scan",
+                    "Index Name": "ix_tasks_id",
+                    "Relation Name": "tasks",
+                    "Plan Rows": 8,
+                    "Actual Rows": 8,
+                },
+                {"Node Type": "Seq Scan", "Relation Name": "users", "Plan Rows": 1, "Actual Rows": 1},
+            ],
+        }
+    }
+]
+
+
+def test_plan_shape_summarizes_nodes_scans_and_buffers():
+    shape = plan_shape(json.dumps(EXPLAINED))
+
+    assert shape == PlanShape(
+        nodes=["Limit", "Index Scan using ix_tasks_id on tasks", "Seq Scan on users"],
+        seq_scans=["users"],
+        estimated_rows=8,
+        actual_rows=8,
+        buffers=12,
+    )
+
+
+def test_plan_regressions_flag_new_seq_scans_and_buffer_blowups():
+    recorded = PlanShape(seq_scans=["users"], buffers=100).to_dict()
+
+    assert plan_regressions(recorded, PlanShape(seq_scans=["users"], buffers=240)) == []
+    assert plan_regressions(recorded, PlanShape(seq_scans=["tasks", "users"], buffers=251)) == [
+        "sequential scan of tasks",
+        "251 shared buffers, recorded 100",
+    ]
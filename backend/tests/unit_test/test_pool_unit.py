@@ -0,0 +1,40 @@
+import sqlite3
+
+import pytest
+
+from app.core.config import ENGINE_PROFILES, settings
+from app.db.pool import InstrumentedAsyncQueuePool
+
+
+def test_engine_options_uses_profile_with_overrides():
+    profile_settings = settings.model_copy(
+        update={"DB_ENGINE_PROFILE": "benchmark", "DB_POOL_SIZE": 7}
+    )
+
+    options = profile_settings.engine_options()
+
+    assert options["pool_size"] == 7
+    assert options["max_overflow"] == ENGINE_PROFILES["benchmark"]["max_overflow"]
+
+
+def test_engine_options_rejects_unknown_profile():
+    with pytest.raises(ValueError):
+        settings.model_copy(update={"DB_ENGINE_PROFILE": "nope"}).engine_options()
+
+
+def test_pool_records_checkouts_and_overflow():
+    pool = InstrumentedAsyncQueuePool(
+        lambda: sqlite3.connect(":memory:"), pool_size=1, max_overflow=1
+    )
+
+    first = pool.connect()
+    second = pool.connect()
+    first.close()
+    second.close()
+
+    snapshot = pool.snapshot()
+    assert snapshot["checkouts"] == 2
+    assert snapshot["checkins"] == 2
+    assert snapshot["connects"] == 2
+    assert snapshot["peak_overflow"] == 1
+    assert snapshot["overflow_checkouts"] == 1
@@ -0,0 +1,114 @@
+from datetime import datetime, timezone
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from app.core.revocation import BloomFilter, RevocationStore, token_key, user_key
+
+
+def test_bloom_filter_has_no_false_negatives():
+    bloom = BloomFilter(1000, 0.01)
+    keys = [f"jti:{i}" for i in range(1000)]
+    for key in keys:
+        bloom.add(key)
+
+    assert all(key in bloom for key in keys)
+
+
+def test_bloom_filter_false_positive_rate_stays_near_target():
+    bloom = BloomFilter(1000, 0.01)
+    for i in range(1000):
+        bloom.add(f"jti:{i}")
+
+    false_positives = sum(f"other:{i}" in bloom for i in range(10000))
+
+    assert false_positives < 300
+
+
+@pytest.fixture
+def session_local():
+    session = MagicMock()
+    session.__aenter__ = AsyncMock(return_value=session)
+    session.__aexit__ = AsyncMock(return_value=False)
+    with patch("app.core.revocation.SessionLocal", return_value=session) as factory:
+        yield factory
+
+
+@pytest.mark.asyncio
+async def test_unrevoked_token_skips_database(session_local):
+    store = RevocationStore(100, 0.01)
+
+    assert not await store.is_revoked({"jti": "abc", "user_id": 1, "iat": 1.0})
+
+    session_local.assert_not_called()
+    assert store.stats.filter_hits == 0
+
+
+@pytest.mark.asyncio
+async def test_revoked_jti_is_confirmed_in_database(session_local):
+    store = RevocationStore(100, 0.01)
+    store.filter.add(token_key("abc"))
+    row = SimpleNamespace(key=token_key("abc"), revoked_at=datetime.now(timezone.utc))
+
+    with patch(
+        "app.core.revocation.revoked_token_crud.get_active",
+        AsyncMock(return_value=[row]),
+    ):
+        assert await store.is_revoked({"jti": "abc", "user_id": 1, "iat": 1.0})
+
+    assert store.stats.revoked == 1
+
+
+@pytest.mark.asyncio
+async def test_user_revocation_only_covers_older_tokens(session_local):
+    store = RevocationStore(100, 0.01)
+    store.filter.add(user_key(1))
+    revoked_at = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    row = SimpleNamespace(key=user_key(1), revoked_at=revoked_at)
+
+    with patch(
+        "app.core.revocation.revoked_token_crud.get_active",
+        AsyncMock(return_value=[row]),
+    ):
+        older = {"jti": "a", "user_id": 1, "iat": revoked_at.timestamp() - 1}
+        newer = {"jti": "b", "user_id": 1, "iat": revoked_at.timestamp() + 1}
+
+        assert await store.is_revoked(older)
+        assert not await store.is_revoked(newer)
+
+
+@pytest.mark.asyncio
+async def test_user_revocation_is_checked_locally_once_confirmed(session_local):
+    store = RevocationStore(100, 0.01)
+    store.filter.add(user_key(1))
+    revoked_at = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    row = SimpleNamespace(key=user_key(1), revoked_at=revoked_at)
+    get_active = AsyncMock(return_value=[row])
+
+    with patch("app.core.revocation.revoked_token_crud.get_active", get_active):
+        newer = {"jti": "b", "user_id": 1, "iat": revoked_at.timestamp() + 1}
+        older = {"jti": "a", "user_id": 1, "iat": revoked_at.timestamp() - 1}
+
+        assert not await store.is_revoked(newer)
+        assert not await store.is_revoked(newer)
+        assert await store.is_revoked(older)
+
+    get_active.assert_awaited_once()
+    assert store.stats.lookups == 1
+
+
+@pytest.mark.asyncio
+async def test_sync_keeps_user_revocation_times(session_local):
+    store = RevocationStore(100, 0.01)
+    revoked_at = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+    with patch(
+        "app.core.revocation.revoked_token_crud.get_since",
+        AsyncMock(return_value=[(user_key(1), revoked_at), (token_key("abc"), revoked_at)]),
+    ):
+        await store.sync(MagicMock())
+
+    assert not await store.is_revoked({"user_id": 1, "iat": revoked_at.timestamp() + 1})
+    session_local.assert_not_called()
+    assert store.snapshot()["user_entries"] == 1
@@ -0,0 +1,44 @@
+from time import time
+
+from app.db.routing import ReplicaRouter, parse_last_write
+
+
+def test_choose_round_robins_across_replicas():
+    router = ReplicaRouter(2)
+
+    assert [router.choose() for _ in range(4)] == [0, 1, 0, 1]
+
+
+def test_choose_without_replicas_uses_primary():
+    router = ReplicaRouter(0)
+
+    assert router.choose(time()) is None
+
+
+def test_recent_writer_sticks_to_primary():
+    router = ReplicaRouter(1, sticky_seconds=60)
+
+    assert router.choose(time()) is None
+    assert router.choose(None) == 0
+
+
+def test_sticky_window_expires():
+    router = ReplicaRouter(1, sticky_seconds=5)
+
+    assert router.choose(time() - 10) == 0
+
+
+def test_failed_replica_is_skipped_until_retry():
+    router = ReplicaRouter(2, retry_seconds=60)
+
+    router.mark_failed(0, OSError("down"))
+
+    assert [router.choose() for _ in range(3)] == [1, 1, 1]
+    router.mark_failed(1, OSError("down"))
+    assert router.choose() is None
+
+
+def test_parse_last_write_ignores_bad_cookies():
+    assert parse_last_write("1700000000.5") == 1700000000.5
+    assert parse_last_write("soon") is None
+    assert parse_last_write(None) is None
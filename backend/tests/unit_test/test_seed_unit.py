@@ -0,0 +1,62 @@
+from app.util.seed import (
+    SeedOptions,
+    generate_task_batches,
+    generate_users,
+    owner_cum_weights,
+    parse_args,
+)
+
+
+def test_generate_users_is_deterministic():
+    options = SeedOptions(users=5, seed=7)
+
+    first = list(generate_users(options, 1, "hash"))
+    second = list(generate_users(options, 1, "hash"))
+
+    assert first == second
+    assert [user[0] for user in first] == [1, 2, 3, 4, 5]
+    assert all(user[3] == "hash" for user in first)
+
+
+def test_generate_task_batches_respects_batch_size_and_total():
+    options = SeedOptions(tasks=25, batch_size=10)
+
+    batches = list(generate_task_batches(options, [1, 2, 3]))
+
+    assert [len(batch) for batch in batches] == [10, 10, 5]
+
+
+def test_generate_task_batches_distributions():
+    options = SeedOptions(
+        tasks=2000,
+        category_weights=(1.0, 0.0, 0.0),
+        completed_ratio=0.0,
+        delete_request_ratio=1.0,
+        no_due_date_ratio=1.0,
+    )
+
+    tasks = [task for batch in generate_task_batches(options, [1, 2]) for task in batch]
+
+    assert {task[8] for task in tasks} == {"LOW"}
+    assert not any(task[2] for task in tasks)
+    assert all(task[4] for task in tasks)
+    assert all(task[3] is None for task in tasks)
+    assert all(task[9] is None for task in tasks)
+
+
+def test_owner_skew_favours_first_owner():
+    uniform = owner_cum_weights(3, 0)
+    skewed = owner_cum_weights(3, 2)
+
+    assert uniform == [1.0, 2.0, 3.0]
+    assert skewed[0] / skewed[-1] > uniform[0] / uniform[-1]
+
+
+def test_parse_args():
+    options, truncate = parse_args(
+        ["--users", "3", "--category-weights", "1,2,3", "--truncate"]
+    )
+
+    assert options.users == 3
+    assert options.category_weights == (1.0, 2.0, 3.0)
+    assert truncate is True
@@ -0,0 +1,136 @@
+import json
+from datetime import datetime, timezone
+
+import msgpack
+import pytest
+from pydantic import ValidationError
+
+from app.model.base_model import Category, Task
+from app.schema.task_schema import TaskInDB, TaskList
+from app.util.serializer import (
+    TASK_LIST_COLUMNAR,
+    TASK_LIST_MSGPACK,
+    FastJSONResponse,
+    columnar_task_list,
+    serialize_task_list,
+    task_list_response,
+)
+
+
+def make_task(**overrides):
+    values = dict(
+        id=1,
+        title="Task",
+        description="desc",
+        status=True,
+        due_date=datetime(2024, 6, 1, 12, 30, 15, 123456),
+        delete_request=False,
+        owner_id=3,
+        category=Category.HIGH,
+        completed_at=None,
+    )
+    values.update(overrides)
+    return Task(**values)
+
+
+def expected_payload(tasks, total, skip, limit):
+    model = TaskList.model_validate(
+        {"tasks": tasks, "total": total, "skip": skip, "limit": limit},
+        from_attributes=True,
+    )
+    # Facets are only serialized when requested.
+    return json.loads(model.model_dump_json(exclude={"facets"}))
+
+
+def test_serialize_orm_tasks_matches_response_model():
+    tasks = [make_task(), make_task(id=2, due_date=None, category=Category.LOW)]
+
+    payload = json.loads(serialize_task_list(tasks, 2, 0, 8))
+
+    assert payload == expected_payload(tasks, 2, 0, 8)
+
+
+def test_serialize_schema_and_dict_inputs():
+    tasks = [
+        TaskInDB(id=1, title="a", delete_request=None, owner_id=1, status=False),
+        {"id": 2, "title": "b", "delete_request": True, "owner_id": 1, "status": None},
+    ]
+
+    payload = json.loads(serialize_task_list(tasks, 2, 0, 8))
+
+    assert payload == expected_payload(tasks, 2, 0, 8)
+
+
+def test_serialize_rejects_invalid_rows():
+    with pytest.raises(ValidationError):
+        serialize_task_list([{}], 1, 0, 8)
+
+
+def test_fast_json_response_matches_pydantic_for_utc():
+    task = TaskInDB(
+        id=1,
+        title="t",
+        delete_request=None,
+        owner_id=None,
+        status=None,
+        due_date=datetime(2024, 6, 1, tzinfo=timezone.utc),
+    )
+
+    body = FastJSONResponse(content={"due_date": task.due_date}).body
+
+    assert json.loads(body)["due_date"] == json.loads(task.model_dump_json())["due_date"]
+
+
+def test_serialize_projected_rows_keeps_only_requested_fields():
+    rows = [{"id": 1, "title": "a", "category": Category.MEDIUM}]
+
+    payload = json.loads(serialize_task_list(rows, 1, 0, 8, fields=("id", "title", "category")))
+
+    assert payload["tasks"] == [{"id": 1, "title": "a", "category": "medium"}]
+
+
+def test_serialize_includes_facets_only_when_given():
+    facets = {"status": {"done": 1, "open": 0}, "category": {"low": 1}, "overdue": 0}
+
+    with_facets = json.loads(serialize_task_list([], 1, 0, 8, ("id",), facets))
+    without = json.loads(serialize_task_list([], 1, 0, 8, ("id",)))
+
+    assert with_facets["facets"] == facets
+    assert "facets" not in without
+
+
+def test_columnar_task_list_has_one_array_per_field():
+    tasks = [make_task(), make_task(id=2, category=Category.LOW, due_date=None)]
+
+    content = columnar_task_list(tasks, 2, 0, 8)
+    rows = expected_payload(tasks, 2, 0, 8)["tasks"]
+
+    assert content["categories"] == ["low", "medium", "high"]
+    assert content["columns"]["id"] == [1, 2]
+    assert content["columns"]["category"] == [2, 0]
+    assert content["columns"]["due_date"] == [tasks[0].due_date, None]
+    assert list(content["columns"]) == list(rows[0])
+
+
+def test_columnar_task_list_keeps_projection_and_string_categories():
+    rows = [{"id": 1, "category": "medium"}, {"id": 2, "category": None}]
+
+    content = columnar_task_list(rows, 2, 0, 8, fields=("id", "category"))
+
+    assert content["columns"] == {"id": [1, 2], "category": [1, None]}
+
+
+def test_task_list_response_encodes_negotiated_format():
+    tasks = [make_task()]
+
+    columnar = task_list_response(tasks, 1, 0, 8, media_type=TASK_LIST_COLUMNAR)
+    packed = task_list_response(tasks, 1, 0, 8, media_type=TASK_LIST_MSGPACK)
+
+    assert columnar.media_type == TASK_LIST_COLUMNAR
+    assert columnar.headers["vary"] == "Accept"
+    assert json.loads(columnar.body)["columns"]["due_date"] == ["2024-06-01T12:30:15.123456"]
+    unpacked = msgpack.unpackb(packed.body, timestamp=3)
+    assert unpacked["columns"]["due_date"] == [
+        tasks[0].due_date.replace(tzinfo=timezone.utc)
+    ]
+    assert unpacked["columns"]["title"] == ["Task"]
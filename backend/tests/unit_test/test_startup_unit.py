@@ -0,0 +1,39 @@
+import asyncio
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.core import startup
+from main import app
+
+
+def test_ready_reports_starting_until_warm_up_finishes():
+    client = TestClient(app)
+    startup.readiness.mark_failed("warming up")
+
+    response = client.get("/ready")
+    assert response.status_code == 503
+    assert response.json()["status"] == "starting"
+
+    startup.readiness.mark_ready()
+    response = client.get("/ready")
+    assert response.status_code == 200
+    startup.readiness.mark_failed("warming up")
+
+
+@pytest.mark.asyncio
+async def test_registered_workers_start_and_stop():
+    started = asyncio.Event()
+
+    async def worker():
+        started.set()
+        await asyncio.sleep(3600)
+
+    startup.register_worker("test-worker", worker)
+    try:
+        startup.start_workers()
+        await asyncio.wait_for(started.wait(), 1)
+        await startup.stop_workers()
+        assert not startup._running_workers
+    finally:
+        startup._worker_factories.pop("test-worker")
@@ -0,0 +1,59 @@
+from sqlalchemy import bindparam, select
+
+from app.db.statements import StatementRegistry
+from app.model.base_model import Task
+
+
+def build_owner_query():
+    return select(Task).where(Task.owner_id == bindparam("owner_id"))
+
+
+def test_same_shape_returns_same_statement():
+    registry = StatementRegistry()
+
+    first = registry.get("task.list", ("owner_id",), build_owner_query)
+    second = registry.get("task.list", ("owner_id",), build_owner_query)
+
+    assert first is second
+    stats = registry.snapshot()["queries"]["task.list"]
+    assert stats["built"] == 1
+    assert stats["reused"] == 1
+    assert stats["reuse_rate"] == 0.5
+
+
+def test_different_shapes_are_built_separately():
+    registry = StatementRegistry()
+
+    owner = registry.get("task.list", ("owner_id",), build_owner_query)
+    everyone = registry.get("task.list", (), lambda: select(Task))
+
+    assert owner is not everyone
+    assert registry.snapshot()["shapes"] == 2
+
+
+def test_registry_evicts_least_recently_used_shape():
+    registry = StatementRegistry(max_shapes=2)
+
+    hot = registry.get("task.list", ("a",), build_owner_query)
+    registry.get("task.list", ("b",), build_owner_query)
+    registry.get("task.list", ("a",), build_owner_query)
+    registry.get("task.list", ("c",), build_owner_query)
+
+    assert registry.get("task.list", ("a",), build_owner_query) is hot
+    snapshot = registry.snapshot()
+    assert snapshot["shapes"] == 2
+    assert snapshot["evicted"] == 1
+    assert snapshot["queries"]["task.list"]["built"] == 3
+
+
+def test_compiled_hit_rate():
+    registry = StatementRegistry()
+
+    registry.record_compiled("task.filter", hit=False)
+    for _ in range(3):
+        registry.record_compiled("task.filter", hit=True)
+
+    stats = registry.snapshot()["queries"]["task.filter"]
+    assert stats["compiled_hits"] == 3
+    assert stats["compiled_misses"] == 1
+    assert stats["compiled_hit_rate"] == 0.75
@@ -0,0 +1,36 @@
+from datetime import datetime, timezone
+
+import pytest
+
+from app.util.sync_token import SyncToken
+
+
+def test_token_round_trips_to_the_microsecond():
+    token = SyncToken(
+        datetime(2024, 5, 1, 12, 30, 15, 123456, tzinfo=timezone.utc),
+        42,
+        datetime(2024, 5, 2, 8, 0, 0, 1, tzinfo=timezone.utc),
+        7,
+    )
+
+    assert SyncToken.decode(token.encode()) == token
+
+
+def test_token_at_horizon_starts_both_streams_there():
+    horizon = datetime(2024, 5, 1, tzinfo=timezone.utc)
+    token = SyncToken.at(horizon)
+
+    assert token.changed_at == token.deleted_at == horizon
+    assert token.changed_id == token.deleted_id == 0
+
+
+def test_encoded_token_is_url_safe():
+    token = SyncToken.at(datetime(2024, 5, 1, tzinfo=timezone.utc)).encode()
+
+    assert token.replace("-", "").replace("_", "").isalnum()
+
+
+@pytest.mark.parametrize("token", ["", "not-a-token", "MS4yLjM", "w6k"])
+def test_decode_rejects_foreign_tokens(token):
+    with pytest.raises(ValueError):
+        SyncToken.decode(token)
@@ -128,12 +128,17 @@ const Cards = ({ cards, onDelete }) => {
         try {
             const response = await fetch(`/api/v1/task/tasks/${selectedCard.id}`, {
                 method: 'PUT',
+                headers: { 'If-Match': `"${selectedCard.version}"` },
                 body: formData
             });
 
             if (response.ok) {
                 setShowEditModal(false);
                 onDelete();
+            } else if (response.status === 412) {
+                setShowEditModal(false);
+                onDelete();
+                Swal.fire('Task changed', 'This task was modified elsewhere. Please review it and try again.', 'warning');
             } else {
                 console.error('Failed to edit the task:', response.statusText);
             }
@@ -151,12 +156,17 @@ const Cards = ({ cards, onDelete }) => {
         try {
             const response = await fetch(`/api/v1/task/change-status/${selectedCard.id}`, {
                 method: 'PUT',
+                headers: { 'If-Match': `"${selectedCard.version}"` },
                 body: formData
             });
 
             if (response.ok) {
                 setShowModal(false);
                 onDelete();
+            } else if (response.status === 412) {
+                setShowModal(false);
+                onDelete();
+                Swal.fire('Task changed', 'This task was modified elsewhere. Please review it and try again.', 'warning');
             } else {
                 console.error('Failed to edit the task:', response.statusText);
             }